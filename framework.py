@@ -38,3 +38,68 @@ class ShotgunUtilsFramework(sgtk.platform.Framework):
         immediately.
         """
         self.log_debug("%s: Destroying..." % self)
+
+    ##########################################################################################
+    # public methods
+
+    def get_entity_cache_path(self):
+        """
+        Get the path of the SQLite file used by the ``shotgun_model.DiskCache``, inside the
+        framework cache location so it's shared by all the DCC sessions of the site.
+
+        :returns: The SQLite file path
+        """
+        cache_folder = os.path.join(self.cache_location, "shotgun_model")
+        filesystem.ensure_folder_exists(cache_folder)
+        return os.path.join(cache_folder, "entity_cache.sqlite")
+
+    def get_schema_cache_path(self):
+        """
+        Get the path of the JSON file used by the ``shotgun_model.SchemaCache``, inside the framework
+        cache location so the schema is read once by site.
+
+        :returns: The JSON file path
+        """
+        cache_folder = os.path.join(self.cache_location, "shotgun_model")
+        filesystem.ensure_folder_exists(cache_folder)
+        return os.path.join(cache_folder, "schema_cache.json")
+
+    def enable_shotgun_metrics(self):
+        """
+        Record the Shotgun calls made by the ``shotgun_model`` classes and log each one of them as a
+        debug message of this framework.
+
+        :returns: The ``shotgun_model.MetricsRegistry`` recording the calls, its ``summary`` method
+            returns a table with the slowest operations first.
+        """
+        shotgun_model = self.import_module("shotgun_model")
+        registry = shotgun_model.get_metrics() or shotgun_model.enable_metrics()
+        # a bound method is equal to the one of the previous calls, so it's only added once
+        registry.add_hook(self._log_shotgun_call)
+        return registry
+
+    def disable_shotgun_metrics(self):
+        """
+        Stop recording the Shotgun calls made by the ``shotgun_model`` classes.
+        """
+        self.import_module("shotgun_model").disable_metrics()
+
+    ##########################################################################################
+    # private methods
+
+    def _log_shotgun_call(self, event):
+        """
+        Log a Shotgun call recorded by the ``shotgun_model.MetricsRegistry`` as a debug message.
+        """
+        self.log_debug(
+            "Shotgun %s %s: %d rows, %d bytes in %.3fs%s%s"
+            % (
+                event["operation"],
+                event["entity_type"],
+                event["rows"],
+                event["bytes"],
+                event["duration"],
+                " (cached)" if event["cache_hit"] else "",
+                " error: %s" % event["error"] if event["error"] else "",
+            )
+        )
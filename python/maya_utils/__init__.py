@@ -1,3 +1,4 @@
 from .maya_scene import MayaScene
 from .maya_scene import MayaAsset
 from .maya_shader import ShaderIter
+from .node_sync import NodeSync, NodeDiff
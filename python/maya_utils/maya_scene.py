@@ -1,3 +1,12 @@
+import collections
+import contextlib
+
+try:
+    string_types = (basestring,)  # noqa: F821
+except NameError:  # pragma: no cover
+    string_types = (str,)
+
+
 class MayaBaseClass(object):
     CONST = (
         DEFAULT_ASSET_GEO_GROUP,
@@ -5,6 +14,9 @@ class MayaBaseClass(object):
         DEFAULT_CONSULADO_GEO_ATTR,
     ) = ("render_grp", "NO_REF", "cNodeId")
 
+    # the Shotgun entity type of the ``cNodeId`` values, the ``node`` custom entity
+    NODE_ENTITY_TYPE = "CustomEntity05"
+
     def __init__(self):
         try:
             import maya.cmds as cmds
@@ -19,27 +31,298 @@ class MayaBaseClass(object):
         self.mel = mel
         self.pm = pm
 
+    @contextlib.contextmanager
+    def undo_chunk(self, name):
+        """
+        Group the Maya commands run inside the ``with`` block in a single undo step.
+        """
+        self.cmds.undoInfo(openChunk=True, chunkName=name)
+        try:
+            yield
+        finally:
+            self.cmds.undoInfo(closeChunk=True)
 
-class MayaScene(MayaBaseClass):
-    def __init__(self):
+    def nodes_with_attr(self, names, attr):
+        """
+        Find the nodes having an attribute with a single ``ls`` call.
+
+        Args:
+            names(list): The long names of the nodes
+            attr(str): The attribute name
+
+        Returns:
+            (set): The long names of the nodes having the attribute
+        """
+        if not names:
+            return set()
+        plugs = ["{}.{}".format(name, attr) for name in names]
+        return set(self.cmds.ls(plugs, objectsOnly=True, long=True) or [])
+
+    def read_int_attr(self, names, attr):
+        """
+        Read an integer attribute of many nodes, the plugs are read through a single OpenMaya
+        selection list instead of one ``getAttr`` by node.
+
+        Args:
+            names(list): The long names of the nodes
+            attr(str): The attribute name
+
+        Returns:
+            A dict with the node names and the attribute values, ``None`` when a node doesn't have
+            the attribute.
+        """
+        values = dict.fromkeys(names)
+        existing = self.nodes_with_attr(names, attr)
+        names = [name for name in names if name in existing]
+        if not names:
+            return values
+
+        import maya.api.OpenMaya as om
+
+        selection = om.MSelectionList()
+        for name in names:
+            selection.add("{}.{}".format(name, attr))
+        for index, name in enumerate(names):
+            values[name] = selection.getPlug(index).asInt()
+        return values
+
+    def write_int_attr(self, values, attr):
+        """
+        Write an integer attribute of many nodes in a single undo step, the attribute is added to all
+        the nodes missing it with a single ``addAttr`` call.
+
+        Args:
+            values(dict): The node long names and their values, a ``None`` value only adds the attribute.
+            attr(str): The attribute name
+
+        Returns:
+            (list): The long names of the nodes where the attribute was added
+        """
+        names = list(values)
+        existing = self.nodes_with_attr(names, attr)
+        missing = [name for name in names if name not in existing]
+        if not missing and all(v is None for v in values.values()):
+            return []
+
+        with self.undo_chunk("write {}".format(attr)):
+            if missing:
+                self.cmds.addAttr(*missing, longName=attr, attributeType="long")
+            for name, value in values.items():
+                if value is not None:
+                    self.cmds.setAttr("{}.{}".format(name, attr), value)
+        return missing
+
+
+class _NodeIdsMixin(object):
+    """
+    The bulk ``cNodeId`` operations of the classes with ``geometry_names``, linking the geometries to
+    the ``node`` Shotgun entities.
+    """
+
+    def read_node_ids(self):
+        """
+        Returns:
+            A dict with the geometry long names and their ``cNodeId`` values, ``None`` when a geometry
+            doesn't have the attribute.
+        """
+        return self.read_int_attr(self.geometry_names, self.DEFAULT_CONSULADO_GEO_ATTR)
+
+    def node_id_map(self):
+        """
+        Returns:
+            A dict with the ``node`` entity ids and the long names of their geometries, the geometries
+            without an id are skipped. When geometries share an id, like duplicated ones, the first one
+            is kept.
+        """
+        result = {}
+        for name, node_id in self.read_node_ids().items():
+            if node_id and node_id not in result:
+                result[node_id] = name
+        return result
+
+    def node_filter(self):
+        """
+        Returns:
+            The Shotgun filter of the ``node`` entities of the geometries.
+            For example::
+                nodes = EntityIter(MayaScene.NODE_ENTITY_TYPE, ["code"], context, sg)
+                nodes.load(scene.node_filter())
+        """
+        return [["id", "in", sorted(self.node_id_map())]]
+
+    def link_nodes(self, nodes):
+        """
+        Match the geometries with their ``node`` entities.
+
+        Args:
+            nodes: The ``node`` entities, like an ``EntityIter`` or a list of Shotgun dicts.
+
+        Returns:
+            A dict with the geometry long names and their entities, the geometries without an entity
+            are skipped.
+        """
+        by_id = dict(
+            (node["id"] if isinstance(node, dict) else node.id, node) for node in nodes
+        )
+        return dict(
+            (name, by_id[node_id])
+            for node_id, name in self.node_id_map().items()
+            if node_id in by_id
+        )
+
+    def create_sg_attr(self):
+        """
+        Add the ``cNodeId`` attribute to the geometries missing it, in a single undo step.
+
+        Returns:
+            (list): The long names of the geometries where the attribute was added
+        """
+        return self.write_int_attr(
+            dict.fromkeys(self.geometry_names), self.DEFAULT_CONSULADO_GEO_ATTR
+        )
+
+    def write_node_ids(self, node_ids):
+        """
+        Write the ``cNodeId`` of many geometries in a single undo step, adding the missing attributes.
+
+        Args:
+            node_ids(dict): The geometry long names or PyNodes, and their ``node`` entity ids or
+                entities.
+
+        Returns:
+            (list): The long names of the geometries where the attribute was added
+        """
+        values = {}
+        for geo, node in node_ids.items():
+            name = geo if isinstance(geo, string_types) else geo.fullPath()
+            if node is not None and not isinstance(node, int):
+                node = node["id"] if isinstance(node, dict) else node.id
+            values[name] = node
+        return self.write_int_attr(values, self.DEFAULT_CONSULADO_GEO_ATTR)
+
+
+class MayaScene(_NodeIdsMixin, MayaBaseClass):
+    """
+    The assets of the current Maya scene, one ``MayaAsset`` by namespace with geometries inside a
+    ``render_grp``.
+
+    The ``cmds`` backend scans the scene with a single ``maya.cmds.ls`` call returning long names,
+    and the PyNodes are only built when they're requested. The ``pymel`` backend wraps every mesh
+    in a PyNode while scanning.
+
+    A ``lazy`` scene is scanned the first time its assets are requested, then it registers Maya
+    callbacks and only scans again the namespaces where meshes were added or removed, or where a
+    reference was loaded or unloaded. The callbacks are removed by ``unwatch``, or when leaving the
+    ``with`` block.
+
+    For example::
+        scene = MayaScene()
+        for asset in scene:
+            print(asset.namespace, asset.geometry_names)
+
+        with MayaScene(lazy=True) as scene:
+            cmds.file(path, reference=True, namespace="chair")
+            chair = scene.find_asset("chair")
+    """
+
+    SCAN_BACKENDS = (CMDS_BACKEND, PYMEL_BACKEND) = ("cmds", "pymel")
+
+    def __init__(self, backend=CMDS_BACKEND, lazy=False):
+        """
+        Args:
+            backend(str): The scan backend, one of ``SCAN_BACKENDS``
+            lazy(bool): Scan the scene on the first request and keep it updated with callbacks
+        """
         super(MayaScene, self).__init__()
+        if backend not in self.SCAN_BACKENDS:
+            raise ValueError(
+                "Unknown scan backend {!r}, expected one of {}".format(
+                    backend, self.SCAN_BACKENDS
+                )
+            )
+
+        self.backend = backend
+        self.lazy = lazy
         self.cmds.namespace(setNamespace=":")
-        self.no_intermediate_mesh_shapes = self.pm.ls(type="mesh", noIntermediate=True)
         self.scene_namespaces = (
             lambda: self.pm.namespaceInfo(listOnlyNamespaces=True, recurse=True) or []
         )
-        self._assets = []
+        self._mesh_shapes = None
+        self._assets = None
+        self._namespaces = None
+        self._dirty_namespaces = set()
+        self._references_changed = False
+        self._callback_ids = []
+        self._om = None
 
-        self.load_assets()
+        if not lazy:
+            self.load_assets()
 
     def __iter__(self):
-        for asset in self._assets:
-            if asset is None:
-                continue
+        for asset in self._get_assets().values():
             yield asset
 
     def __len__(self):
-        return len([i for i in self._assets if i is not None])
+        return len(self._get_assets())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.unwatch()
+
+    def _get_assets(self):
+        """
+        Returns:
+            The ``OrderedDict`` of the assets by namespace, scanning the scene or the changed
+            namespaces first when needed.
+        """
+        if self._assets is None:
+            self.load_assets()
+            if self.lazy:
+                self.watch()
+        elif self._dirty_namespaces or self._references_changed:
+            self._update()
+        return self._assets
+
+    def _ls_meshes(self, pattern=None):
+        args = (pattern,) if pattern else ()
+        if self.backend == self.PYMEL_BACKEND:
+            return self.pm.ls(*args, type="mesh", noIntermediate=True)
+        return self.cmds.ls(*args, type="mesh", noIntermediate=True, long=True) or []
+
+    @property
+    def no_intermediate_mesh_shapes(self):
+        """
+        Returns:
+            The PyNodes of the mesh shapes, built on the first access with the ``cmds`` backend.
+        """
+        if self._mesh_shapes is None:
+            self._mesh_shapes = self._ls_meshes()
+        if self._mesh_shapes and isinstance(self._mesh_shapes[0], string_types):
+            self._mesh_shapes = [self.pm.PyNode(m) for m in self._mesh_shapes]
+        return self._mesh_shapes
+
+    @property
+    def geometry_names(self):
+        """
+        Returns:
+            The long names of the geometries of all assets
+        """
+        return [name for asset in self for name in asset.geometry_names]
+
+    @property
+    def mesh_shape_names(self):
+        """
+        Returns:
+            The long names of the mesh shapes
+        """
+        if self._mesh_shapes is None:
+            self._mesh_shapes = self._ls_meshes()
+        return [
+            m if isinstance(m, string_types) else m.fullPath()
+            for m in self._mesh_shapes
+        ]
 
     def non_default_cameras(self):
         # Get all cameras first
@@ -57,46 +340,201 @@ class MayaScene(MayaBaseClass):
         for camera in map(lambda x: x.parent(0), non_default_cameras):
             yield camera
 
+    @staticmethod
+    def _split_path(full_path):
+        """
+        Split the long name of a shape into its namespace and the names of its parents.
+
+        For example::
+            >>> MayaScene._split_path("|chair:root|chair:render_grp|chair:seat|chair:seatShape")
+            ('chair', ['root', 'render_grp', 'seat'])
+        """
+        parts = full_path.strip("|").split("|")
+        name = parts[-1]
+        namespace = name.rsplit(":", 1)[0] if ":" in name else ""
+        return namespace, [p.rsplit(":", 1)[-1] for p in parts[:-1]]
+
+    def _bucket_geometries(self, meshes=None):
+        """
+        Group the geometries inside a ``render_grp`` by the exact namespace of their shape, scanning
+        the meshes once.
+
+        Args:
+            meshes(list): The PyNodes or long names of the mesh shapes, defaults to the scene ones.
+
+        Returns:
+            A dict with the namespaces, ``""`` for the meshes without one, and the geometry lists.
+        """
+        if meshes is None:
+            if self._mesh_shapes is None:
+                self._mesh_shapes = self._ls_meshes()
+            meshes = self._mesh_shapes
+
+        buckets = {}
+        for mesh in meshes:
+            is_name = isinstance(mesh, string_types)
+            full_path = mesh if is_name else mesh.fullPath()
+            namespace, parents = self._split_path(full_path)
+            if self.DEFAULT_ASSET_GEO_GROUP not in parents:
+                continue
+            # the transform long name is the shape one without its last part
+            geo = full_path.rsplit("|", 1)[0] if is_name else mesh.getTransform()
+            buckets.setdefault(namespace, []).append(geo)
+        return buckets
+
     def find_asset(self, namespace=None):
-        if namespace:
-            geometry_list = [
-                m.getTransform()
-                for m in self.no_intermediate_mesh_shapes
-                if namespace in m.namespace()
-                and self.DEFAULT_ASSET_GEO_GROUP in m.fullPath()
-            ]
-        else:
-            geometry_list = [
-                m.getTransform()
-                for m in self.no_intermediate_mesh_shapes
-                if self.DEFAULT_ASSET_GEO_GROUP in m.fullPath() and m.namespace() == ""
-            ]
-        if not geometry_list:
-            return None
+        """
+        Find the asset of a namespace, the nested namespaces are different assets.
 
-        return MayaAsset(geometry_list, namespace)
+        Args:
+            namespace(str): The asset namespace, ``None`` for the geometries without one.
+
+        Returns:
+            (MayaAsset): The asset, ``None`` when the namespace doesn't have geometries.
+        """
+        namespace = str(namespace).strip(":") if namespace else ""
+        return self._get_assets().get(namespace)
 
     def load_assets(self):
-        self._assets.append(self.find_asset())
-        for namespace in self.scene_namespaces():
-            asset = self.find_asset(namespace)
-            if asset is None:
+        """
+        Scan the whole scene and create a ``MayaAsset`` by namespace, in the order of
+        ``scene_namespaces``, with the meshes scanned once instead of once by namespace.
+        """
+        self._mesh_shapes = self._ls_meshes()
+        buckets = self._bucket_geometries()
+        self._namespaces = [str(n).strip(":") for n in self.scene_namespaces()]
+        self._dirty_namespaces = set()
+        self._references_changed = False
+        self._assets = collections.OrderedDict()
+        for namespace in [""] + self._namespaces:
+            geometry_list = buckets.pop(namespace, None)
+            if not geometry_list:
                 continue
-            self._assets.append(asset)
+            self._assets[namespace] = MayaAsset(geometry_list, namespace or None)
+
+    def load_namespace(self, namespace):
+        """
+        Scan the meshes of a namespace again, updating, adding or removing its asset.
+
+        Args:
+            namespace(str): The asset namespace, ``""`` for the geometries without one.
+        """
+        if self._assets is None:
+            self.load_assets()
+            return
 
+        namespace = str(namespace).strip(":") if namespace else ""
+        meshes = self._ls_meshes("{}:*".format(namespace) if namespace else "*")
+        geometry_list = self._bucket_geometries(meshes).get(namespace)
+        if geometry_list:
+            self._assets[namespace] = MayaAsset(geometry_list, namespace or None)
+        else:
+            self._assets.pop(namespace, None)
+        # the scene meshes are listed again when they're requested
+        self._mesh_shapes = None
+
+    def _update(self):
+        """
+        Scan the namespaces changed since the last request.
+        """
+        if self._references_changed:
+            # a reference was loaded or unloaded, the namespaces added or removed are scanned
+            namespaces = [str(n).strip(":") for n in self.scene_namespaces()]
+            self._dirty_namespaces.update(
+                set(self._namespaces).symmetric_difference(namespaces)
+            )
+            self._namespaces = namespaces
+            self._references_changed = False
+
+        dirty = self._dirty_namespaces
+        self._dirty_namespaces = set()
+        for namespace in sorted(dirty):
+            self.load_namespace(namespace)
+
+    @property
+    def is_watching(self):
+        return bool(self._callback_ids)
+
+    def watch(self):
+        """
+        Register the Maya callbacks keeping the assets updated, the changes are scanned on the next
+        request.
+        """
+        if self._callback_ids:
+            return
+
+        import maya.api.OpenMaya as om
+
+        self._om = om
+        scene_message = om.MSceneMessage
+        self._callback_ids = [
+            om.MDGMessage.addNodeAddedCallback(self._on_node_changed, "mesh"),
+            om.MDGMessage.addNodeRemovedCallback(self._on_node_changed, "mesh"),
+        ]
+        for message in (
+            scene_message.kAfterLoadReference,
+            scene_message.kAfterUnloadReference,
+            scene_message.kAfterCreateReference,
+            scene_message.kAfterRemoveReference,
+        ):
+            self._callback_ids.append(
+                scene_message.addCallback(message, self._on_references_changed)
+            )
+        for message in (scene_message.kAfterOpen, scene_message.kAfterNew):
+            self._callback_ids.append(
+                scene_message.addCallback(message, self._on_scene_changed)
+            )
+
+    def unwatch(self):
+        """
+        Remove the Maya callbacks, the assets aren't updated anymore.
+        """
+        if not self._callback_ids:
+            return
+        self._om.MMessage.removeCallbacks(self._callback_ids)
+        self._callback_ids = []
+
+    def _on_node_changed(self, node, client_data=None):
+        name = self._om.MFnDependencyNode(node).name()
+        self._dirty_namespaces.add(name.rsplit(":", 1)[0] if ":" in name else "")
+
+    def _on_references_changed(self, client_data=None):
+        self._references_changed = True
+
+    def _on_scene_changed(self, client_data=None):
+        self._assets = None
+        self._mesh_shapes = None
+
+
+class MayaAsset(_NodeIdsMixin, MayaBaseClass):
+    """
+    The geometries of an asset, the transforms of its meshes.
+
+    The geometries can be PyNodes or long names, the PyNode of a long name is built the first time
+    it's iterated.
+    """
 
-class MayaAsset(MayaBaseClass):
     def __init__(self, geometry_list, namespace=None):
+        """
+        Args:
+            geometry_list(list): The PyNodes or the long names of the geometries
+            namespace(str): The asset namespace, ``None`` for the geometries without one.
+        """
         super(MayaAsset, self).__init__()
         self._geometry_list = geometry_list
+        self._geometry_names = [
+            geo if isinstance(geo, string_types) else None for geo in geometry_list
+        ]
         self._namespace = (
             namespace if namespace is not None else self.DEFAULT_NO_REF_KEY
         )
 
     def __iter__(self):
-        for geo in self._geometry_list:
+        for index, geo in enumerate(self._geometry_list):
             if geo is None:
                 continue
+            if isinstance(geo, string_types):
+                geo = self._geometry_list[index] = self.pm.PyNode(geo)
             yield geo
 
     def __len__(self):
@@ -114,25 +552,45 @@ class MayaAsset(MayaBaseClass):
         return "" if self._namespace == self.DEFAULT_NO_REF_KEY else self._namespace
 
     @property
-    def node_ids(self):
-        ids = []
-        for geo in self._geometry_list:
-            if not hasattr(geo, self.DEFAULT_CONSULADO_GEO_ATTR):
+    def geometry_names(self):
+        """
+        Returns:
+            The long names of the geometries, without building their PyNodes.
+        """
+        names = []
+        for index, geo in enumerate(self._geometry_list):
+            if geo is None:
                 continue
-
-            attr = getattr(geo, self.DEFAULT_CONSULADO_GEO_ATTR)
-            ids.append(attr.get())
-
-        return ids
+            name = self._geometry_names[index]
+            if name is None:
+                name = self._geometry_names[index] = geo.fullPath()
+            names.append(name)
+        return names
 
     @property
-    def geos_without_sg_ids(self):
+    def node_ids(self):
+        """
+        Returns:
+            The ``cNodeId`` values of the geometries having the attribute
+        """
+        values = self.read_node_ids()
         return [
-            geo
-            for geo in self._geometry_list
-            if not hasattr(geo, self.DEFAULT_CONSULADO_GEO_ATTR)
+            values[name] for name in self.geometry_names if values[name] is not None
         ]
 
-    def create_sg_attr(self):
-        for geo in self.geos_without_sg_ids:
-            self.pm.addAttr(geo, longName=self.DEFAULT_CONSULADO_GEO_ATTR, at="long")
+    @property
+    def geos_without_sg_ids(self):
+        """
+        Returns:
+            The PyNodes of the geometries without the ``cNodeId`` attribute
+        """
+        names = self.geometry_names
+        existing = self.nodes_with_attr(names, self.DEFAULT_CONSULADO_GEO_ATTR)
+        geos = [g for g in self._geometry_list if g is not None]
+        result = []
+        for index, name in enumerate(names):
+            if name in existing:
+                continue
+            geo = geos[index]
+            result.append(self.pm.PyNode(geo) if isinstance(geo, string_types) else geo)
+        return result
@@ -0,0 +1,295 @@
+from ..shotgun_model import EntityIter, metrics
+from .maya_scene import MayaBaseClass
+
+
+def _same_value(value, other):
+    """
+    Compare two Shotgun values, the entity links are compared by type and id only.
+    """
+    value = getattr(value, "shotgun_entity_data", value)
+    other = getattr(other, "shotgun_entity_data", other)
+    if isinstance(value, dict) and isinstance(other, dict):
+        return (value.get("type"), value.get("id")) == (
+            other.get("type"),
+            other.get("id"),
+        )
+    return value == other
+
+
+class NodeDiff(object):
+    """
+    The differences between the geometries of a ``MayaScene`` and their ``node`` entities, computed by
+    ``NodeSync.diff``.
+
+    Attributes:
+        new(list): The ``(geometry long name, data)`` tuples of the geometries without a ``node`` entity,
+            including the ones with an id not found in Shotgun, already used by another geometry or of
+            an entity linked to another scene entity, which is kept as it is.
+        changed(list): The ``(node, data)`` tuples of the entities whose fields are different from
+            their geometry, with the new values.
+        orphaned(list): The entities of the scene and namespaces not used by any geometry, the ones
+            linked to another scene entity are never orphaned.
+        linked(dict): The geometry long names and their entities.
+        nodes(EntityIter): All the entities requested.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.new = []
+        self.changed = []
+        self.orphaned = []
+        self.linked = {}
+
+    def __bool__(self):
+        return bool(self.new or self.changed or self.orphaned)
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return "<NodeDiff new={} changed={} orphaned={} linked={}>".format(
+            len(self.new), len(self.changed), len(self.orphaned), len(self.linked)
+        )
+
+
+class NodeSync(object):
+    """
+    Keep the geometries of a ``MayaScene`` in sync with their ``node`` Shotgun entities, linked by the
+    ``cNodeId`` attribute of the geometries.
+
+    ``diff`` reads all ``cNodeId`` values in bulk and requests the entities with a single ``find``,
+    the ones linked to the scene entity or to the namespace entities and the ones used by the
+    geometries. ``apply`` sends the changes with batched ``create`` and ``update`` requests, and writes
+    the ids of the new entities to the geometries in a single undo step.
+
+    For example::
+        sync = NodeSync(
+            MayaScene(),
+            context,
+            sg,
+            scene_entity=scene,
+            namespaces={"chair": chair_namespace},
+        )
+        diff = sync.diff()
+        result = sync.apply(diff)
+    """
+
+    DEFAULT_FIELDS = ["code"]
+    DEFAULT_SCENE_FIELD = "sg_scene"
+    DEFAULT_NAMESPACE_FIELD = "sg_namespace"
+
+    def __init__(
+        self,
+        scene,
+        context,
+        sg,
+        scene_entity=None,
+        namespaces=None,
+        fields=None,
+        attributes=None,
+        batch_size=None,
+        scene_field=DEFAULT_SCENE_FIELD,
+        namespace_field=DEFAULT_NAMESPACE_FIELD,
+    ):
+        """
+        Args:
+            scene(MayaScene): The scene with the geometries
+            context(sgtk.Context): The Shotgun Toolkit context
+            sg(shotgun_api3.Shotgun): The Shotgun connection
+            scene_entity(dict): The entity linked to the ``node`` entities by ``scene_field``
+            namespaces(dict): The asset namespaces and the entities linked to their ``node`` entities by
+                ``namespace_field``.
+            fields(list): The ``node`` fields set by ``attributes``, defaults to ``DEFAULT_FIELDS``.
+            attributes(callable): Called with a ``MayaAsset`` and the long name of one of its geometries,
+                returns a dict with the ``fields`` values of its ``node`` entity. Defaults to the ``code``
+                being the geometry name without its namespace.
+            batch_size(int): The max number of requests sent by each ``sg.batch`` call
+            scene_field(str): The ``node`` field linking the scene entity
+            namespace_field(str): The ``node`` field linking the namespace entities
+        """
+        self.scene = scene
+        self.context = context
+        self.sg = sg
+        self.scene_entity = scene_entity
+        self.namespaces = namespaces or {}
+        self.attributes = attributes or self.default_attributes
+        self.batch_size = batch_size or EntityIter.DEFAULT_BATCH_SIZE
+        self.scene_field = scene_field
+        self.namespace_field = namespace_field
+
+        self.fields = list(fields or self.DEFAULT_FIELDS)
+        if scene_entity is not None:
+            self.fields.append(scene_field)
+        if self.namespaces:
+            self.fields.append(namespace_field)
+
+    @staticmethod
+    def default_attributes(asset, name):
+        return {"code": name.rsplit("|", 1)[-1].rsplit(":", 1)[-1]}
+
+    def _data(self, asset, name):
+        """
+        Returns:
+            The ``node`` entity data of a geometry
+        """
+        data = dict(self.attributes(asset, name))
+        if self.scene_entity is not None:
+            data[self.scene_field] = self.scene_entity
+        namespace = self.namespaces.get(asset.namespace)
+        if namespace is not None:
+            data[self.namespace_field] = namespace
+        return data
+
+    def _filter(self, node_ids):
+        filters = []
+        if self.scene_entity is not None:
+            filters.append([self.scene_field, "is", self.scene_entity])
+        if self.namespaces:
+            filters.append([self.namespace_field, "in", list(self.namespaces.values())])
+        if node_ids:
+            filters.append(["id", "in", sorted(node_ids)])
+        if not filters:
+            return None
+        return [{"filter_operator": "any", "filters": filters}]
+
+    def _new_nodes(self):
+        return EntityIter(
+            MayaBaseClass.NODE_ENTITY_TYPE,
+            list(self.fields),
+            self.context,
+            self.sg,
+            batch_size=self.batch_size,
+            index_on=["id"],
+        )
+
+    def _in_scene(self, node):
+        """
+        Returns:
+            ``False`` when the ``node`` entity is linked to another scene entity
+        """
+        if self.scene_entity is None:
+            return True
+        return _same_value(getattr(node, self.scene_field), self.scene_entity)
+
+    def diff(self):
+        """
+        Compare the geometries with their ``node`` entities, with a single Shotgun query.
+
+        Returns:
+            (NodeDiff): The differences
+        """
+        node_ids = self.scene.read_node_ids()
+        nodes = self._new_nodes()
+        entity_filter = self._filter(set(i for i in node_ids.values() if i))
+        if entity_filter is not None:
+            nodes.load(entity_filter)
+
+        diff = NodeDiff(nodes)
+        used = set()
+        for asset in self.scene:
+            for name in asset.geometry_names:
+                data = self._data(asset, name)
+                node_id = node_ids.get(name)
+                node = nodes.get_by("id", node_id) if node_id else None
+                if node is None or node_id in used or not self._in_scene(node):
+                    # a duplicated geometry keeps the id of the original one, and a geometry imported
+                    # from another scene keeps the id of its entity, both get a new entity
+                    diff.new.append((name, data))
+                    continue
+
+                used.add(node_id)
+                diff.linked[name] = node
+                changes = dict(
+                    (field, value)
+                    for field, value in data.items()
+                    if not _same_value(getattr(node, field), value)
+                )
+                if changes:
+                    diff.changed.append((node, changes))
+
+        diff.orphaned = [
+            node for node in nodes if node.id not in used and self._in_scene(node)
+        ]
+        return diff
+
+    def apply(self, diff=None, delete_orphans=False):
+        """
+        Send the differences to Shotgun with batched requests and write the ids of the new entities to
+        the ``cNodeId`` of their geometries.
+
+        Args:
+            diff(NodeDiff): The differences to apply, defaults to a new ``diff``.
+            delete_orphans(bool): Delete the orphaned entities as well
+
+        Returns:
+            A dict with the ``created``, ``updated`` and ``deleted`` entities, and the ``errors`` list of
+            ``(entity, Exception)`` tuples.
+        """
+        diff = diff if diff is not None else self.diff()
+        errors = []
+
+        for node, changes in diff.changed:
+            for field, value in changes.items():
+                setattr(node, field, value)
+        update_errors = diff.nodes.update(batch_size=self.batch_size)
+        errors.extend(update_errors)
+
+        new_nodes = self._new_nodes()
+        created = []
+        for name, data in diff.new:
+            node = new_nodes.add_new_entity()
+            for field, value in data.items():
+                setattr(node, field, value)
+            created.append((name, node))
+        errors.extend(new_nodes.create(batch_size=self.batch_size))
+
+        created = [(name, node) for name, node in created if node.id]
+        self.scene.write_node_ids(dict(created))
+        diff.linked.update(created)
+
+        deleted = []
+        if delete_orphans:
+            deleted, delete_errors = self._delete(diff.nodes, diff.orphaned)
+            errors.extend(delete_errors)
+
+        failed = set(id(node) for node, _ in update_errors)
+        return {
+            "created": [node for _, node in created],
+            "updated": [node for node, _ in diff.changed if id(node) not in failed],
+            "deleted": deleted,
+            "errors": errors,
+        }
+
+    def _delete(self, entity_iter, nodes):
+        """
+        Delete the ``nodes`` entities with batched requests, and remove them from the ``entity_iter``
+        holding them.
+
+        Returns:
+            A tuple with the list of entities deleted, and the list of ``(entity, Exception)`` tuples
+        """
+        deleted = []
+        errors = []
+        for i in range(0, len(nodes), self.batch_size):
+            chunk = nodes[i : i + self.batch_size]
+            requests = [
+                {
+                    "request_type": "delete",
+                    "entity_type": MayaBaseClass.NODE_ENTITY_TYPE,
+                    "entity_id": node.id,
+                }
+                for node in chunk
+            ]
+            try:
+                metrics.measure(
+                    MayaBaseClass.NODE_ENTITY_TYPE, "batch", self.sg.batch, requests
+                )
+            except Exception as e:
+                errors.extend((node, e) for node in chunk)
+                continue
+            for node in chunk:
+                entity_iter.remove_entity("id", node.id)
+            deleted.extend(chunk)
+
+        if deleted:
+            entity_iter._invalidate_cache()
+        return deleted, errors
@@ -1 +1,20 @@
-from .shotgun_model import Entity, EntityIter
+import sys
+
+from .shotgun_model import Entity, EntityIter, EntityRecord, entity_record_class
+from .query_cache import QueryCache
+from .disk_cache import DiskCache
+from .request_coalescer import RequestCoalescer
+from .schema_cache import SchemaCache, SchemaError
+from .concurrent_loader import load_many, LoadResult
+from .connection_pool import ConnectionPool
+from .transport import (
+    ShotgunTransport,
+    Throttle,
+    get_default_throttle,
+    set_default_throttle,
+)
+from .identity_map import IdentityMap
+from .metrics import MetricsRegistry, enable_metrics, disable_metrics, get_metrics
+
+if sys.version_info >= (3, 7):
+    from .async_model import AsyncExecutor, get_default_executor, set_default_executor
@@ -0,0 +1,179 @@
+"""
+The asyncio front-end of the model classes, it requires python 3.7 or newer.
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncExecutor(object):
+    """
+    Run the blocking Shotgun calls of the model classes on a bounded thread pool, so an event loop
+    can keep many queries in flight while at most ``max_workers`` of them are sent at the same time.
+
+    Since ``shotgun_api3.Shotgun`` isn't thread-safe, the calls using the same raw connection are
+    serialised. Use a ``ConnectionPool`` as the models connection to run them in parallel.
+
+    A call cancelled or timed out stops being awaited right away, but the Shotgun request already
+    sent finishes on its thread and its result is discarded.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, max_workers=None, timeout=None):
+        """
+        Args:
+            max_workers(int): The max number of Shotgun calls running at the same time
+            timeout(float): The default max seconds waiting for each call, waits forever when ``None``.
+        """
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(self.max_workers)
+        self._locks = weakref.WeakKeyDictionary()
+        self._locks_lock = threading.Lock()
+
+    def _connection_lock(self, sg):
+        if hasattr(sg, "checkout"):
+            return None
+
+        with self._locks_lock:
+            lock = self._locks.get(sg)
+            if lock is None:
+                lock = self._locks[sg] = threading.Lock()
+            return lock
+
+    def _call(self, sg, function, *args):
+        lock = self._connection_lock(sg)
+        if lock is None:
+            return function(*args)
+
+        with lock:
+            return function(*args)
+
+    async def run(self, sg, function, *args, timeout=None):
+        """
+        Call a blocking function using the ``sg`` connection on the thread pool.
+
+        Args:
+            sg(shotgun_api3.Shotgun): The connection used by the function
+            function(callable): The blocking function
+            args: The function arguments
+            timeout(float): The max seconds waiting for the function, defaults to the executor timeout.
+
+        Returns:
+            The function result
+
+        Raises:
+            asyncio.TimeoutError: When the function doesn't finish before the timeout
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor, functools.partial(self._call, sg, function, *args)
+        )
+        timeout = timeout if timeout is not None else self.timeout
+        return await asyncio.wait_for(future, timeout)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait)
+
+
+_default_executor = None
+
+
+def get_default_executor():
+    """
+    Returns:
+        (AsyncExecutor): The executor used when none is given, created on the first call.
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = AsyncExecutor()
+    return _default_executor
+
+
+def set_default_executor(executor):
+    """
+    Args:
+        executor(AsyncExecutor): The executor used when none is given
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+async def aload(model, entity_filter=None, timeout=None, executor=None):
+    """
+    Load an ``Entity`` or ``EntityIter``, the Shotgun call runs on the executor and the data is only
+    added to the model when it isn't cancelled nor timed out.
+
+    Returns:
+        The loaded model, see the ``load`` method of the model
+    """
+    executor = executor or get_default_executor()
+    sg_data = await executor.run(
+        model._sg, model._fetch, entity_filter, timeout=timeout
+    )
+    return model._set_loaded_data(sg_data)
+
+
+async def aupdate(
+    model, multi_entity_update_modes=None, timeout=None, executor=None, **kwargs
+):
+    """
+    Run the ``update`` of an ``Entity`` or ``EntityIter`` on the executor. The Shotgun requests
+    already sent when it's cancelled or timed out still finish, and their results are added to
+    the model.
+
+    Returns:
+        The result of the ``update`` method
+    """
+    executor = executor or get_default_executor()
+    return await executor.run(
+        model._sg,
+        functools.partial(model.update, multi_entity_update_modes, **kwargs),
+        timeout=timeout,
+    )
+
+
+async def acreate(model, return_fields=None, timeout=None, executor=None, **kwargs):
+    """
+    Run the ``create`` of an ``Entity`` or ``EntityIter`` on the executor, the same as ``aupdate``.
+
+    Returns:
+        The result of the ``create`` method
+    """
+    executor = executor or get_default_executor()
+    return await executor.run(
+        model._sg,
+        functools.partial(model.create, return_fields, **kwargs),
+        timeout=timeout,
+    )
+
+
+async def astream(
+    entity_iter, entity_filter=None, page_size=None, timeout=None, executor=None
+):
+    """
+    Yield the ``EntityRecord`` instances of an ``EntityIter`` page by page, each page is requested
+    on the executor.
+    """
+    executor = executor or get_default_executor()
+    page_size = entity_iter._page_size(page_size)
+    page = 1
+    while True:
+        sg_data = await executor.run(
+            entity_iter._sg,
+            entity_iter._fetch_page,
+            entity_filter,
+            page_size,
+            page,
+            timeout=timeout,
+        )
+        for entity in sg_data:
+            yield entity_iter._new_entity(entity)
+
+        if len(sg_data) < page_size:
+            break
+        page += 1
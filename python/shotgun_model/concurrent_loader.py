@@ -0,0 +1,135 @@
+import threading
+import time
+
+try:
+    import queue
+except ImportError:  # pragma: no cover
+    import Queue as queue
+
+
+class LoadResult(object):
+    """
+    The result of one of the loads run by ``load_many``.
+    """
+
+    def __init__(self, model, entity_filter=None):
+        self.model = model
+        self.entity_filter = entity_filter
+        self.duration = None
+        self.error = None
+
+    def __repr__(self):
+        return "<LoadResult {} {:.3f}s{}>".format(
+            self.model._entity_type,
+            self.duration or 0,
+            " error: {}".format(self.error) if self.error else "",
+        )
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def _open_connection(connection_factory):
+    if connection_factory is None:
+        return None
+    if hasattr(connection_factory, "checkout"):
+        return connection_factory.checkout()
+    return connection_factory()
+
+
+def _close_connection(connection_factory, sg):
+    if hasattr(connection_factory, "checkout"):
+        connection_factory.checkin(sg)
+    elif hasattr(sg, "close"):
+        sg.close()
+
+
+def _run(result, sg):
+    model = result.model
+    model._set_loaded_data(model._fetch(result.entity_filter, sg))
+
+
+def _worker(tasks, connection_factory):
+    """
+    Run the loads of the ``tasks`` queue until it's empty, with one connection opened on the
+    first of them.
+    """
+    sg = None
+    try:
+        while True:
+            try:
+                result = tasks.get_nowait()
+            except queue.Empty:
+                return
+
+            start = time.time()
+            try:
+                if sg is None:
+                    sg = _open_connection(connection_factory)
+                _run(result, sg)
+            except Exception as e:
+                result.error = e
+            result.duration = time.time() - start
+    finally:
+        if sg is not None:
+            _close_connection(connection_factory, sg)
+
+
+def load_many(loads, connection_factory=None, max_workers=4):
+    """
+    Run the ``load`` of many ``Entity`` and ``EntityIter`` instances at the same time, so the total
+    time is about the time of the slowest one instead of the sum of all of them.
+
+    Since ``shotgun_api3.Shotgun`` isn't thread-safe, each worker thread uses its own connection,
+    created by ``connection_factory`` and closed when the loads are done, or checked out of a
+    ``ConnectionPool``. The connection is only given to the Shotgun calls of the loads, the models
+    keep their own connection.
+
+    Args:
+        loads(list): The models to load, or ``(model, entity_filter)`` tuples.
+            For example::
+                results = load_many(
+                    [(assets, [["sg_asset_type", "is", "Character"]]), scenes, namespaces],
+                    lambda: Shotgun(host, script_name=script_name, api_key=api_key),
+                )
+        connection_factory(callable): Returns a new Shotgun connection, it can also be a
+            ``ConnectionPool``. When it's ``None`` the models use their own connection, which
+            must be a ``ConnectionPool``.
+        max_workers(int): The max number of threads, and so of connections
+
+    Returns:
+        A list of ``LoadResult`` in the same order of ``loads``
+
+    Raises:
+        ValueError: When ``max_workers`` is lower than 1, or when there's no ``connection_factory``
+            and the connection of a model isn't a ``ConnectionPool``.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1, got {}".format(max_workers))
+
+    results = []
+    for load in loads:
+        model, entity_filter = load if isinstance(load, tuple) else (load, None)
+        if connection_factory is None and not hasattr(model._sg, "checkout"):
+            raise ValueError(
+                "The {} model connection isn't a ConnectionPool, "
+                "a connection_factory is required".format(model._entity_type)
+            )
+        results.append(LoadResult(model, entity_filter))
+
+    tasks = queue.Queue()
+    for result in results:
+        tasks.put(result)
+
+    threads = [
+        threading.Thread(target=_worker, args=(tasks, connection_factory))
+        for _ in range(min(max_workers, len(results)))
+    ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
@@ -0,0 +1,197 @@
+import contextlib
+import threading
+import time
+
+
+class ConnectionPool(object):
+    """
+    A thread-safe pool of Shotgun connections.
+
+    The model classes can take a pool instead of a raw Shotgun connection: every Shotgun method
+    called on the pool checks a connection out, calls the method on it and checks it back in, so
+    the same models can be used by many threads at the same time.
+
+    The connections idle for more than ``health_check_interval`` seconds are checked with a cheap
+    ``info`` call before being reused, and replaced by new ones when the check fails.
+
+    For example::
+        pool = ConnectionPool(lambda: Shotgun(host, script_name=script_name, api_key=api_key), size=4)
+        assets = EntityIter("Asset", ["code"], context, pool)
+        with pool.connection() as sg:
+            sg.find("Asset", [], ["code"])
+    """
+
+    DEFAULT_SIZE = 4
+    DEFAULT_HEALTH_CHECK_INTERVAL = 300
+
+    def __init__(self, connection_factory, size=None, health_check_interval=None):
+        """
+        Args:
+            connection_factory(callable): Returns a new Shotgun connection
+            size(int): The max number of connections
+            health_check_interval(float): The idle seconds after which a connection is checked
+        """
+        self._connection_factory = connection_factory
+        self.size = size or self.DEFAULT_SIZE
+        self.health_check_interval = (
+            health_check_interval
+            if health_check_interval is not None
+            else self.DEFAULT_HEALTH_CHECK_INTERVAL
+        )
+
+        self._idle = []
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self.created = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.health_checks = 0
+        self.discarded = 0
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            with self.connection() as sg:
+                return getattr(sg, name)(*args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def _is_healthy(self, sg, idle_since):
+        if time.time() - idle_since < self.health_check_interval:
+            return True
+
+        with self._condition:
+            self.health_checks += 1
+        try:
+            sg.info()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def _close_connection(sg):
+        try:
+            sg.close()
+        except Exception:
+            pass
+
+    def checkout(self, timeout=None):
+        """
+        Get a connection for the exclusive use of the caller, it must be returned with ``checkin``.
+
+        Args:
+            timeout(float): The max seconds waiting for a free connection, waits forever when ``None``.
+
+        Returns:
+            (shotgun_api3.Shotgun): The Shotgun connection
+
+        Raises:
+            RuntimeError: When the pool is closed or no connection is free after the ``timeout``.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("The connection pool is closed")
+                if self._idle or self._in_use + len(self._idle) < self.size:
+                    break
+
+                self.waits += 1
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise RuntimeError(
+                        "No Shotgun connection available after {}s".format(timeout)
+                    )
+                self._condition.wait(remaining)
+
+            self._in_use += 1
+            self.checkouts += 1
+            idle = self._idle.pop() if self._idle else None
+
+        try:
+            if idle is not None:
+                sg, idle_since = idle
+                if self._is_healthy(sg, idle_since):
+                    return sg
+
+                with self._condition:
+                    self.discarded += 1
+                self._close_connection(sg)
+
+            sg = self._connection_factory()
+            with self._condition:
+                self.created += 1
+            return sg
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def checkin(self, sg, discard=False):
+        """
+        Return a connection to the pool.
+
+        Args:
+            sg(shotgun_api3.Shotgun): The connection returned by ``checkout``
+            discard(bool): Close the connection instead of reusing it, like after a connection error
+        """
+        with self._condition:
+            self._in_use -= 1
+            if discard or self._closed:
+                if discard:
+                    self.discarded += 1
+                self._close_connection(sg)
+            else:
+                self._idle.append((sg, time.time()))
+            self._condition.notify()
+
+    @contextlib.contextmanager
+    def connection(self, timeout=None):
+        """
+        Check a connection out during the ``with`` block.
+
+        Args:
+            timeout(float): The same as the ``checkout`` method.
+        """
+        sg = self.checkout(timeout)
+        try:
+            yield sg
+        finally:
+            self.checkin(sg)
+
+    def close(self):
+        """
+        Close the idle connections, the checked out ones are closed when they are returned.
+        """
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+
+        for sg, _ in idle:
+            self._close_connection(sg)
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            A dict with the pool ``size``, the connections ``in_use`` and ``idle`` and the number of
+            connections ``created``, ``checkouts``, ``waits``, ``health_checks`` and ``discarded``.
+        """
+        with self._condition:
+            return {
+                "size": self.size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "created": self.created,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "health_checks": self.health_checks,
+                "discarded": self.discarded,
+            }
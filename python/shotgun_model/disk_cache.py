@@ -0,0 +1,212 @@
+import contextlib
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+
+from . import incremental_sync
+from .query_cache import QueryCache
+
+
+class DiskCache(object):
+    """
+    A persistent cache of the Shotgun ``find`` queries made by the model classes, stored in a
+    SQLite file and shared by all the DCC sessions using the same file.
+
+    A cached query is refreshed incrementally: only the entities with ``updated_at`` after the last
+    sync are requested, and an ``id`` only query finds the entities deleted or no longer matching
+    the filter. When the last sync is newer than the ``refresh_interval`` of the entity type the
+    cached rows are returned without any Shotgun call.
+
+    For example::
+        cache = DiskCache(framework.get_entity_cache_path(), refresh_intervals={"CustomNonProjectEntity01": 3600})
+        node_types = EntityIter("CustomNonProjectEntity01", ["code"], context, sg, cache=cache)
+    """
+
+    CLOCK_SKEW = incremental_sync.CLOCK_SKEW
+
+    def __init__(self, path, refresh_interval=0, refresh_intervals=None):
+        """
+        Args:
+            path(str): The SQLite file path, its folder must exist
+            refresh_interval(float): The default number of seconds a query is used without syncing
+            refresh_intervals(dict): The number of seconds by entity type, overriding the ``refresh_interval``
+        """
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.refresh_intervals = dict(refresh_intervals or {})
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.synced_rows = 0
+        self.deleted_rows = 0
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS queries "
+                "(key TEXT PRIMARY KEY, entity_type TEXT, last_sync REAL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rows "
+                "(key TEXT, id INTEGER, data BLOB, PRIMARY KEY (key, id))"
+            )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """
+        Open a connection committing the changes at the end, a new one is used by each call since the
+        SQLite connections can't be shared between threads.
+        """
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def key(entity_type, filters, fields):
+        """
+        Build the key of a query stored in the SQLite file.
+
+        Returns:
+            A hex digest string
+        """
+        key = QueryCache.key("find", entity_type, filters, fields)
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+    def _load(self, connection, key):
+        row = connection.execute(
+            "SELECT last_sync FROM queries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None, {}
+
+        rows = connection.execute(
+            "SELECT id, data FROM rows WHERE key = ?", (key,)
+        ).fetchall()
+        return row[0], dict((i, pickle.loads(bytes(data))) for i, data in rows)
+
+    def _save(self, connection, key, entity_type, last_sync, changed, deleted):
+        connection.execute(
+            "INSERT OR REPLACE INTO queries (key, entity_type, last_sync) VALUES (?, ?, ?)",
+            (key, entity_type, last_sync),
+        )
+        connection.executemany(
+            "INSERT OR REPLACE INTO rows (key, id, data) VALUES (?, ?, ?)",
+            [(key, row["id"], sqlite3.Binary(pickle.dumps(row, 2))) for row in changed],
+        )
+        connection.executemany(
+            "DELETE FROM rows WHERE key = ? AND id = ?", [(key, i) for i in deleted]
+        )
+
+    def read(self, sg, method, entity_type, filters, fields, **kwargs):
+        """
+        Get the result of a Shotgun read method, only the ``find`` calls without extra arguments are cached.
+
+        Args:
+            sg(shotgun_api3.Shotgun): The Shotgun connection
+            method(str): The Shotgun method name, like ``find`` or ``find_one``
+            entity_type(str): The Shotgun entity type
+            filters(list): The Shotgun filter
+            fields(list): The Shotgun field names
+            kwargs: Any other argument of the Shotgun method
+
+        Returns:
+            The Shotgun result, the cached ``find`` results are sorted by id.
+        """
+        if method != "find" or kwargs:
+            return getattr(sg, method)(entity_type, filters, fields, **kwargs)
+
+        key = self.key(entity_type, filters, fields)
+        with self._lock, self._connect() as connection:
+            last_sync, rows = self._load(connection, key)
+
+        now = time.time()
+        interval = self.refresh_intervals.get(entity_type, self.refresh_interval)
+        if last_sync is not None and now - last_sync < interval:
+            self.hits += 1
+            return [rows[i] for i in sorted(rows)]
+
+        if not last_sync:
+            # a new or invalidated query, all its rows are requested again
+            self.misses += 1
+            changed = sg.find(entity_type, filters, fields)
+            current_ids = set(r["id"] for r in changed)
+            deleted = [i for i in rows if i not in current_ids]
+        else:
+            # not a hit, the sync makes two Shotgun calls even when nothing changed
+            self.revalidations += 1
+            changed, current_ids = incremental_sync.find_changes(
+                sg.find, entity_type, filters, fields, last_sync, self.CLOCK_SKEW
+            )
+            deleted = [i for i in rows if i not in current_ids]
+
+        for row in changed:
+            rows[row["id"]] = row
+        for i in deleted:
+            del rows[i]
+        self.synced_rows += len(changed)
+        self.deleted_rows += len(deleted)
+
+        with self._lock, self._connect() as connection:
+            self._save(connection, key, entity_type, now, changed, deleted)
+
+        return [rows[i] for i in sorted(rows)]
+
+    def invalidate(self, entity_type=None):
+        """
+        Mark the cached queries of an entity type as out of date, so their next read requests Shotgun
+        even when the ``refresh_interval`` isn't over. Use ``clear`` to remove the cached queries.
+
+        Args:
+            entity_type(str): The Shotgun entity type, when it's ``None`` all the queries are marked.
+        """
+        with self._lock, self._connect() as connection:
+            if entity_type is None:
+                connection.execute("UPDATE queries SET last_sync = 0")
+                return
+
+            connection.execute(
+                "UPDATE queries SET last_sync = 0 WHERE entity_type = ?", (entity_type,)
+            )
+
+    def clear(self, entity_type=None):
+        """
+        Remove the cached queries of an entity type.
+
+        Args:
+            entity_type(str): The Shotgun entity type, when it's ``None`` the whole cache is cleared.
+        """
+        with self._lock, self._connect() as connection:
+            if entity_type is None:
+                connection.execute("DELETE FROM rows")
+                connection.execute("DELETE FROM queries")
+                return
+
+            connection.execute(
+                "DELETE FROM rows WHERE key IN "
+                "(SELECT key FROM queries WHERE entity_type = ?)",
+                (entity_type,),
+            )
+            connection.execute(
+                "DELETE FROM queries WHERE entity_type = ?", (entity_type,)
+            )
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            A dict with the number of ``hits``, ``misses``, ``revalidations``, which are the
+            incremental syncs, ``synced_rows`` and ``deleted_rows``
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "synced_rows": self.synced_rows,
+            "deleted_rows": self.deleted_rows,
+        }
@@ -0,0 +1,90 @@
+import threading
+import weakref
+
+
+class IdentityMap(object):
+    """
+    A session-scoped map keeping a single ``Entity`` instance by Shotgun entity type and id.
+
+    The model classes sharing an identity map reuse the instance already loaded for a Shotgun
+    entity and merge the new Shotgun data into it, instead of creating a copy, so the changes made
+    through one ``EntityIter`` are visible through all the others. The instances are held by weak
+    references, so the ones no longer used are garbage collected.
+
+    For example::
+        session = IdentityMap()
+        assets = EntityIter("Asset", ["code"], context, sg, identity_map=session)
+        characters = EntityIter("Asset", ["code"], context, sg, identity_map=session)
+    """
+
+    def __init__(self):
+        self._entities = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entities)
+
+    def __contains__(self, key):
+        return key in self._entities
+
+    def get(self, entity_type, entity_id):
+        """
+        Args:
+            entity_type(str): The Shotgun entity type
+            entity_id(int): The Shotgun entity id
+
+        Returns:
+            The instance of the Shotgun entity, otherwise, ``None``
+        """
+        return self._entities.get((entity_type, entity_id))
+
+    def add(self, entity):
+        """
+        Add an instance when there isn't one for its Shotgun entity yet.
+
+        Args:
+            entity(BaseEntity): An instance with a Shotgun id
+
+        Returns:
+            The instance kept by the map
+        """
+        if not entity.id:
+            return entity
+
+        with self._lock:
+            return self._entities.setdefault((entity._entity_type, entity.id), entity)
+
+    def resolve(self, entity_type, sg_data, factory):
+        """
+        Get the instance of a Shotgun entity, merging the ``sg_data`` into it, or create a new one.
+
+        The fields the existing instance wasn't loaded with, like the ones of a record loaded with
+        fewer fields, are merged as well, so there's a single instance by Shotgun entity.
+
+        Args:
+            entity_type(str): The Shotgun entity type
+            sg_data(dict): The Shotgun data with the entity id
+            factory(callable): Returns a new instance without data
+
+        Returns:
+            The instance of the Shotgun entity
+        """
+        key = (entity_type, sg_data.get("id"))
+        with self._lock:
+            entity = self._entities.get(key)
+            if entity is not None:
+                entity.merge_sg_data(sg_data)
+                return entity
+
+            entity = factory()
+            entity.add_sg_data(sg_data)
+            self._entities[key] = entity
+            return entity
+
+    def discard(self, entity_type, entity_id):
+        with self._lock:
+            self._entities.pop((entity_type, entity_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
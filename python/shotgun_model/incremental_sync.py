@@ -0,0 +1,33 @@
+"""
+The incremental sync of the Shotgun queries, shared by ``EntityIter.refresh`` and the ``DiskCache``.
+"""
+
+import datetime
+
+# the seconds subtracted from the last sync to cover the clock difference with the Shotgun server
+CLOCK_SKEW = 60
+
+
+def find_changes(find, entity_type, filters, fields, last_sync, clock_skew=CLOCK_SKEW):
+    """
+    Request the entities of a query updated since its last sync, and the ids of all the entities still
+    matching it. The entities synced before and not in these ids were deleted or don't match the
+    filter anymore.
+
+    Args:
+        find(callable): Called like ``sg.find``, with the entity type, the filter and the fields
+        entity_type(str): The Shotgun entity type
+        filters(list): The Shotgun filter of the query
+        fields(list): The Shotgun field names
+        last_sync(float): The time of the last sync, as returned by ``time.time``
+        clock_skew(float): The seconds subtracted from the ``last_sync``
+
+    Returns:
+        A tuple with the list of entities updated and the set of the current ids
+    """
+    since = datetime.datetime.fromtimestamp(last_sync - clock_skew)
+    changed = find(
+        entity_type, list(filters) + [["updated_at", "greater_than", since]], fields
+    )
+    current_ids = set(row["id"] for row in find(entity_type, filters, ["id"]))
+    return changed, current_ids
@@ -0,0 +1,308 @@
+"""
+The timing metrics of the Shotgun calls made by the model classes.
+
+The metrics are disabled by default, so the model classes only check a global before each Shotgun
+call. Use ``enable_metrics`` to record them.
+"""
+
+import json
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _CallCounter(object):
+    """
+    A Shotgun connection proxy counting the calls made through it, so a cached read can tell
+    whether Shotgun was called.
+    """
+
+    def __init__(self, sg):
+        self._sg = sg
+        self.called = False
+
+    def __getattr__(self, name):
+        self.called = True
+        return getattr(self._sg, name)
+
+
+class MetricsRegistry(object):
+    """
+    Record the latency, the number of rows, the payload size and the cache state of the Shotgun calls,
+    by entity type and operation.
+
+    Each call is also sent as an event dict to the hooks, with its ``time``, ``entity_type``, ``operation``,
+    ``duration``, ``rows``, ``bytes``, ``cache_hit`` and ``error``.
+
+    For example::
+        registry = enable_metrics()
+        registry.add_hook(MetricsRegistry.json_lines_writer(open("calls.jsonl", "a")))
+        assets.load()
+        print(registry.summary())
+    """
+
+    def __init__(self, measure_bytes=True):
+        """
+        Args:
+            measure_bytes(bool): Measure the size of the results, serialising them to JSON
+        """
+        self.measure_bytes = measure_bytes
+        self._stats = {}
+        self._hooks = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook):
+        """
+        A hook already added isn't added again. The errors raised by a hook are logged, they don't
+        reach the code calling Shotgun.
+
+        Args:
+            hook(callable): Called with the event dict of each Shotgun call
+        """
+        if hook not in self._hooks:
+            self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    @staticmethod
+    def json_lines_writer(stream):
+        """
+        Create a hook writing each event as a line of JSON.
+
+        Args:
+            stream: A file like object open for writing
+
+        Returns:
+            The hook function
+        """
+
+        def write(event):
+            # json.dumps is ascii only, the unicode newline makes it a text line on python 2 too
+            stream.write(json.dumps(event, default=str) + u"\n")
+
+        return write
+
+    def _size(self, result):
+        if not self.measure_bytes or result is None:
+            return 0
+        return len(json.dumps(result, default=str))
+
+    def record(
+        self,
+        entity_type,
+        operation,
+        duration,
+        rows=0,
+        size=0,
+        cache_hit=None,
+        error=None,
+    ):
+        """
+        Record a Shotgun call.
+
+        Args:
+            entity_type(str): The Shotgun entity type
+            operation(str): The Shotgun method name, like ``find`` or ``batch``
+            duration(float): The seconds taken by the call
+            rows(int): The number of entities returned
+            size(int): The number of bytes of the result serialised to JSON
+            cache_hit(bool): Whether the result came from a cache, ``None`` when there's no cache.
+            error(str): The error raised by the call
+        """
+        event = {
+            "time": time.time(),
+            "entity_type": entity_type,
+            "operation": operation,
+            "duration": duration,
+            "rows": rows,
+            "bytes": size,
+            "cache_hit": cache_hit,
+            "error": error,
+        }
+        with self._lock:
+            stats = self._stats.get((entity_type, operation))
+            if stats is None:
+                stats = self._stats[(entity_type, operation)] = {
+                    "entity_type": entity_type,
+                    "operation": operation,
+                    "calls": 0,
+                    "errors": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "rows": 0,
+                    "bytes": 0,
+                    "cache_hits": 0,
+                }
+            stats["calls"] += 1
+            stats["errors"] += 1 if error else 0
+            stats["total_time"] += duration
+            stats["max_time"] = max(stats["max_time"], duration)
+            stats["rows"] += rows
+            stats["bytes"] += size
+            stats["cache_hits"] += 1 if cache_hit else 0
+
+        for hook in list(self._hooks):
+            try:
+                hook(event)
+            except Exception:
+                logger.exception("The Shotgun metrics hook %r failed", hook)
+
+    def measure(self, entity_type, operation, function, *args, **kwargs):
+        """
+        Call a Shotgun method and record it.
+
+        Returns:
+            The function result
+        """
+        return self._measure(entity_type, operation, None, function, args, kwargs)
+
+    def read(self, sg, cache, method, entity_type, filters, fields, **kwargs):
+        """
+        Call a Shotgun read method, through the ``cache`` when there's one, and record it.
+
+        Returns:
+            The Shotgun result
+        """
+        if cache is None:
+            function = getattr(sg, method)
+            return self._measure(
+                entity_type,
+                method,
+                None,
+                function,
+                (entity_type, filters, fields),
+                kwargs,
+            )
+
+        counter = _CallCounter(sg)
+        args = (counter, method, entity_type, filters, fields)
+        return self._measure(entity_type, method, counter, cache.read, args, kwargs)
+
+    def _measure(self, entity_type, operation, counter, function, args, kwargs):
+        start = time.time()
+        result = None
+        error = None
+        try:
+            result = function(*args, **kwargs)
+            return result
+        except Exception as e:
+            error = repr(e)
+            raise
+        finally:
+            duration = time.time() - start
+            if isinstance(result, list):
+                rows = len(result)
+            else:
+                rows = 1 if result else 0
+            self.record(
+                entity_type,
+                operation,
+                duration,
+                rows,
+                self._size(result),
+                None if counter is None else not counter.called,
+                error,
+            )
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            A list with the stats dict of each entity type and operation, sorted by ``total_time``.
+        """
+        with self._lock:
+            stats = [dict(s) for s in self._stats.values()]
+        return sorted(stats, key=lambda s: s["total_time"], reverse=True)
+
+    def summary(self):
+        """
+        Returns:
+            A text table with the stats, the slowest operations first.
+        """
+        lines = [
+            "{:<28} {:<10} {:>7} {:>10} {:>9} {:>9} {:>9} {:>12} {:>7}".format(
+                "entity type",
+                "operation",
+                "calls",
+                "total (s)",
+                "mean (ms)",
+                "max (ms)",
+                "rows",
+                "bytes",
+                "hits",
+            )
+        ]
+        for s in self.stats:
+            lines.append(
+                "{:<28} {:<10} {:>7} {:>10.3f} {:>9.1f} {:>9.1f} {:>9} {:>12} {:>7}".format(
+                    s["entity_type"],
+                    s["operation"],
+                    s["calls"],
+                    s["total_time"],
+                    s["total_time"] / s["calls"] * 1000,
+                    s["max_time"] * 1000,
+                    s["rows"],
+                    s["bytes"],
+                    s["cache_hits"],
+                )
+            )
+        return "\n".join(lines)
+
+    def json_lines(self):
+        """
+        Returns:
+            The stats as JSON lines, one by entity type and operation.
+        """
+        return "".join(json.dumps(s, sort_keys=True) + "\n" for s in self.stats)
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+
+_registry = None
+
+
+def get_metrics():
+    """
+    Returns:
+        (MetricsRegistry): The registry recording the Shotgun calls, ``None`` when they aren't recorded.
+    """
+    return _registry
+
+
+def enable_metrics(registry=None):
+    """
+    Record the Shotgun calls of the model classes.
+
+    Args:
+        registry(MetricsRegistry): Defaults to a new one
+
+    Returns:
+        (MetricsRegistry): The registry used
+    """
+    global _registry
+    _registry = registry or MetricsRegistry()
+    return _registry
+
+
+def disable_metrics():
+    global _registry
+    _registry = None
+
+
+def measure(entity_type, operation, function, *args, **kwargs):
+    """
+    Call a Shotgun method, recording it when the metrics are enabled.
+
+    Returns:
+        The function result
+    """
+    registry = _registry
+    if registry is None:
+        return function(*args, **kwargs)
+    return registry.measure(entity_type, operation, function, *args, **kwargs)
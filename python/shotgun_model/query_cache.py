@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+def freeze(value):
+    """
+    Get a hashable version of a Shotgun value, the order of the list items is kept.
+
+    Args:
+        value: A Shotgun value, like an entity link or the ``order`` argument
+
+    Returns:
+        A hashable tuple, or the value itself when it's already hashable
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def freeze_filter(filters):
+    """
+    Get a hashable version of a Shotgun filter.
+
+    The conditions of the filter and of its nested ``filter_operator`` groups are sorted, since their
+    order doesn't change the Shotgun result. The values of the conditions keep their order.
+
+    Args:
+        filters(list): A Shotgun filter, or a dict with a ``filter_operator``
+
+    Returns:
+        A hashable tuple
+    """
+    if isinstance(filters, dict):
+        return freeze(dict(filters, filters=freeze_filter(filters.get("filters"))))
+
+    conditions = []
+    for condition in filters or []:
+        if isinstance(condition, dict) and "filter_operator" in condition:
+            condition = dict(condition, filters=freeze_filter(condition.get("filters")))
+        conditions.append(freeze(condition))
+    return tuple(sorted(conditions, key=repr))
+
+
+def _copy(value):
+    """
+    Copy the lists and dicts of a Shotgun result, so the cached result isn't changed by the callers.
+    """
+    if isinstance(value, dict):
+        return dict((k, _copy(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+class QueryCache(object):
+    """
+    A client-side cache of the Shotgun queries made by the model classes.
+
+    The entries are keyed by the entity type, the normalised filter and the fields, they expire after
+    the ``ttl`` of their entity type and the least recently used ones are evicted when the cache has
+    more than ``max_size`` entries. The model classes invalidate the entries of an entity type when
+    they create or update an entity of that type.
+
+    For example::
+        cache = QueryCache(max_size=512, ttl=60, ttls={"CustomNonProjectEntity01": 3600})
+        assets = EntityIter("Asset", ["code"], context, sg, cache=cache)
+    """
+
+    DEFAULT_MAX_SIZE = 256
+    DEFAULT_TTL = 60
+
+    def __init__(self, max_size=None, ttl=None, ttls=None):
+        """
+        Args:
+            max_size(int): The max number of cached queries
+            ttl(float): The default number of seconds a query stays cached
+            ttls(dict): The number of seconds by entity type, overriding the ``ttl``
+        """
+        self.max_size = max_size or self.DEFAULT_MAX_SIZE
+        self.ttl = ttl if ttl is not None else self.DEFAULT_TTL
+        self.ttls = dict(ttls or {})
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(method, entity_type, filters, fields, **kwargs):
+        """
+        Build the cache key of a query.
+
+        Args:
+            method(str): The Shotgun method name, like ``find`` or ``find_one``
+            entity_type(str): The Shotgun entity type
+            filters(list): The Shotgun filter
+            fields(list): The Shotgun field names
+            kwargs: Any other argument changing the Shotgun result, like ``order``
+
+        Returns:
+            A hashable tuple
+        """
+        return (
+            entity_type,
+            method,
+            freeze_filter(filters),
+            tuple(sorted(set(fields or []))),
+            freeze(kwargs),
+        )
+
+    def get(self, key):
+        """
+        Get a cached result.
+
+        Args:
+            key(tuple): The key returned by the ``key`` method
+
+        Returns:
+            A tuple with ``True`` and a copy of the result when it's cached, otherwise, ``(False, None)``
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None or entry[0] < time.time():
+                self.misses += 1
+                return False, None
+
+            # re-insert the entry to keep the most recently used at the end
+            self._entries[key] = entry
+            self.hits += 1
+        return True, _copy(entry[1])
+
+    def set(self, key, result):
+        """
+        Cache the result of a query.
+
+        Args:
+            key(tuple): The key returned by the ``key`` method
+            result: The Shotgun result
+        """
+        ttl = self.ttls.get(key[0], self.ttl)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time() + ttl, result)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def read(self, sg, method, entity_type, filters, fields, **kwargs):
+        """
+        Get the result of a Shotgun read method from the cache, calling Shotgun when it isn't cached.
+
+        Args:
+            sg(shotgun_api3.Shotgun): The Shotgun connection
+            method(str): The Shotgun method name, like ``find`` or ``find_one``
+            entity_type(str): The Shotgun entity type
+            filters(list): The Shotgun filter
+            fields(list): The Shotgun field names
+            kwargs: Any other argument of the Shotgun method
+
+        Returns:
+            The Shotgun result
+        """
+        key = self.key(method, entity_type, filters, fields, **kwargs)
+        found, result = self.get(key)
+        if not found:
+            result = getattr(sg, method)(entity_type, filters, fields, **kwargs)
+            self.set(key, _copy(result))
+        return result
+
+    def invalidate(self, entity_type=None):
+        """
+        Remove the cached queries of an entity type.
+
+        Args:
+            entity_type(str): The Shotgun entity type, when it's ``None`` the whole cache is cleared.
+        """
+        with self._lock:
+            if entity_type is None:
+                self._entries.clear()
+                return
+
+            for key in [k for k in self._entries if k[0] == entity_type]:
+                del self._entries[key]
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            A dict with the number of ``hits``, ``misses``, ``evictions`` and cached ``entries``
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,194 @@
+import threading
+import time
+
+from .query_cache import QueryCache
+
+
+class _Call(object):
+    """
+    A Shotgun call in flight, shared by all the requests waiting for its result.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.ids = set()
+
+    def wait(self):
+        self.event.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class RequestCoalescer(object):
+    """
+    A single-flight layer of the Shotgun queries made by the model classes, it can be used as their
+    ``cache``, alone or in front of a ``QueryCache`` or ``DiskCache``.
+
+    The identical requests made at the same time, like by the widgets of a panel loading on their own
+    threads, share one Shotgun call and all of them get its result. The ``find_one`` requests by id made
+    during the same ``batch_window`` seconds, with the same other filters and fields, are sent as a single
+    ``find`` with an ``id in`` filter. A request by id made while no other one is pending is sent right
+    away, so only the concurrent requests wait for the ``batch_window``.
+
+    The results are shared by the requests, so they must not be changed in place.
+
+    For example::
+        coalescer = RequestCoalescer(QueryCache())
+        assets = EntityIter("Asset", ["code"], context, pool, cache=coalescer)
+    """
+
+    DEFAULT_BATCH_WINDOW = 0.005
+
+    def __init__(self, cache=None, batch_window=None):
+        """
+        Args:
+            cache(QueryCache): The optional cache called by the Shotgun calls sent
+            batch_window(float): The seconds waiting for other ``find_one`` requests by id, ``0`` disables it.
+        """
+        self.cache = cache
+        self.batch_window = (
+            batch_window if batch_window is not None else self.DEFAULT_BATCH_WINDOW
+        )
+
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._batches = {}
+        self._pending_by_id = 0
+        self.calls = 0
+        self.coalesced = 0
+
+    def _send(self, sg, method, entity_type, filters, fields, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.cache is None:
+            return getattr(sg, method)(entity_type, filters, fields, **kwargs)
+        return self.cache.read(sg, method, entity_type, filters, fields, **kwargs)
+
+    @staticmethod
+    def _split_id(filters):
+        """
+        Split a filter with a single ``["id", "is", value]`` condition.
+
+        Returns:
+            A tuple with the id and the other conditions, the id is ``None`` when there isn't one.
+        """
+        entity_id = None
+        others = []
+        for condition in filters or []:
+            if (
+                entity_id is None
+                and isinstance(condition, (list, tuple))
+                and len(condition) == 3
+                and condition[0] == "id"
+                and condition[1] == "is"
+            ):
+                entity_id = condition[2]
+            else:
+                others.append(condition)
+        return entity_id, others
+
+    def read(self, sg, method, entity_type, filters, fields, **kwargs):
+        """
+        Get the result of a Shotgun read method, sharing the call of an identical request in flight.
+
+        Args:
+            sg(shotgun_api3.Shotgun): The Shotgun connection
+            method(str): The Shotgun method name, like ``find`` or ``find_one``
+            entity_type(str): The Shotgun entity type
+            filters(list): The Shotgun filter
+            fields(list): The Shotgun field names
+            kwargs: Any other argument of the Shotgun method
+
+        Returns:
+            The Shotgun result
+        """
+        if method == "find_one" and not kwargs and self.batch_window > 0:
+            entity_id, others = self._split_id(filters)
+            if entity_id is not None:
+                with self._lock:
+                    self._pending_by_id += 1
+                try:
+                    return self._read_by_id(sg, entity_type, entity_id, others, fields)
+                finally:
+                    with self._lock:
+                        self._pending_by_id -= 1
+
+        key = QueryCache.key(method, entity_type, filters, fields, **kwargs)
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return call.wait()
+
+        try:
+            call.result = self._send(sg, method, entity_type, filters, fields, **kwargs)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.event.set()
+        return call.result
+
+    def _read_by_id(self, sg, entity_type, entity_id, filters, fields):
+        key = QueryCache.key("find_one", entity_type, filters, fields)
+        with self._lock:
+            batch = self._batches.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._batches[key] = _Call()
+            else:
+                self.coalesced += 1
+            batch.ids.add(entity_id)
+            # this request is the only pending one, so there's nothing to wait for
+            alone = self._pending_by_id == 1
+
+        if not leader:
+            return batch.wait().get(entity_id)
+
+        if not alone:
+            time.sleep(self.batch_window)
+        with self._lock:
+            # the requests arriving from now on start a new batch
+            del self._batches[key]
+            ids = sorted(batch.ids)
+
+        try:
+            rows = self._send(
+                sg, "find", entity_type, list(filters) + [["id", "in", ids]], fields
+            )
+            batch.result = dict((row["id"], row) for row in rows)
+        except Exception as e:
+            batch.error = e
+            raise
+        finally:
+            batch.event.set()
+        return batch.result.get(entity_id)
+
+    def invalidate(self, entity_type=None):
+        """
+        Invalidate the cached queries of an entity type, the calls in flight are still shared.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(entity_type)
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            A dict with the number of Shotgun ``calls`` sent and of ``coalesced`` requests, plus the ``cache``
+            stats when there's one.
+        """
+        stats = {"calls": self.calls, "coalesced": self.coalesced}
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats
+        return stats
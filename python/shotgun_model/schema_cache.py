@@ -0,0 +1,299 @@
+import datetime
+import json
+import os
+import re
+import threading
+import time
+
+try:
+    string_types = (basestring,)  # noqa: F821
+except NameError:  # pragma: no cover
+    string_types = (str,)
+
+
+class SchemaError(ValueError):
+    """
+    Raised when fields or values don't match the Shotgun schema.
+    """
+
+
+_DATE_REGEX = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_FIELDS_ALWAYS_VALID = ("type", "id")
+
+
+def _compact(field_schema):
+    """
+    Keep only the parts of a ``schema_field_read`` field used by the validation.
+    """
+    properties = field_schema.get("properties") or {}
+    return {
+        "data_type": (field_schema.get("data_type") or {}).get("value"),
+        "editable": (field_schema.get("editable") or {}).get("value", True),
+        "valid_types": (properties.get("valid_types") or {}).get("value"),
+        "valid_values": (properties.get("valid_values") or {}).get("value"),
+    }
+
+
+class SchemaCache(object):
+    """
+    A per-site cache of the Shotgun schema used by the model classes to check the field names and to
+    check or coerce the values before sending them, so a bad write fails locally instead of after a
+    Shotgun round trip, or halfway through a ``batch``.
+
+    The schema of an entity type is read once with ``schema_field_read``, saved to the ``path`` JSON
+    file when there's one, and read again after ``ttl`` seconds.
+
+    For example::
+        schema = SchemaCache(framework.get_schema_cache_path())
+        assets = EntityIter("Asset", ["code", "sg_asset_type"], context, sg, schema=schema)
+    """
+
+    DEFAULT_TTL = 24 * 60 * 60
+
+    def __init__(self, path=None, ttl=None):
+        """
+        Args:
+            path(str): The JSON file path, the schema is only kept in memory when it's ``None``.
+            ttl(float): The number of seconds a schema is used before being read again.
+        """
+        self.path = path
+        self.ttl = ttl if ttl is not None else self.DEFAULT_TTL
+        self._lock = threading.Lock()
+        self._entity_types = self._read_file()
+        self.reads = 0
+
+    def _read_file(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, OSError, ValueError):
+            # a corrupted file is read again from Shotgun
+            return {}
+
+    def _write_file(self):
+        if not self.path:
+            return
+
+        temp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(temp_path, "w") as f:
+            json.dump(self._entity_types, f)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        os.rename(temp_path, self.path)
+
+    def load_all(self, sg):
+        """
+        Read the schema of all entity types with a single ``schema_read`` call.
+
+        Args:
+            sg(shotgun_api3.Shotgun): The Shotgun connection
+        """
+        schema = sg.schema_read()
+        now = time.time()
+        with self._lock:
+            self.reads += 1
+            for entity_type, fields in schema.items():
+                self._entity_types[entity_type] = {
+                    "time": now,
+                    "fields": dict((k, _compact(v)) for k, v in fields.items()),
+                }
+            self._write_file()
+
+    def fields(self, sg, entity_type):
+        """
+        Get the schema of an entity type, reading it from Shotgun when it isn't cached or has expired.
+
+        Args:
+            sg(shotgun_api3.Shotgun): The Shotgun connection
+            entity_type(str): The Shotgun entity type
+
+        Returns:
+            A dict with the field names and dicts with their ``data_type``, ``editable``, ``valid_types``
+            and ``valid_values``.
+        """
+        entry = self._entity_types.get(entity_type)
+        if entry is not None and time.time() - entry["time"] < self.ttl:
+            return entry["fields"]
+
+        fields = sg.schema_field_read(entity_type)
+        entry = {
+            "time": time.time(),
+            "fields": dict((k, _compact(v)) for k, v in fields.items()),
+        }
+        with self._lock:
+            self.reads += 1
+            self._entity_types[entity_type] = entry
+            self._write_file()
+        return entry["fields"]
+
+    def clear(self):
+        with self._lock:
+            self._entity_types = {}
+            self._write_file()
+
+    def validate_fields(self, sg, entity_type, fields):
+        """
+        Check the field names, only the first part of the deep-link fields is checked.
+
+        Raises:
+            SchemaError: When a field isn't in the schema
+        """
+        schema = self.fields(sg, entity_type)
+        unknown = [
+            f
+            for f in fields
+            if f not in _FIELDS_ALWAYS_VALID and f.split(".")[0] not in schema
+        ]
+        if unknown:
+            raise SchemaError(
+                "Unknown {} fields: {}".format(entity_type, ", ".join(unknown))
+            )
+
+    def validate_data(self, sg, entity_type, data):
+        """
+        Check the data sent by a ``create`` or ``update`` and coerce its values to the types of their fields.
+
+        Args:
+            sg(shotgun_api3.Shotgun): The Shotgun connection
+            entity_type(str): The Shotgun entity type
+            data(dict): The field names and values
+
+        Returns:
+            A new dict with the coerced values
+
+        Raises:
+            SchemaError: With all the invalid fields of the data
+        """
+        schema = self.fields(sg, entity_type)
+        result = {}
+        errors = []
+        for field, value in data.items():
+            spec = schema.get(field)
+            if spec is None:
+                errors.append("{}: unknown field".format(field))
+                continue
+            if not spec["editable"]:
+                errors.append("{}: not editable".format(field))
+                continue
+
+            try:
+                result[field] = self.coerce(spec, value)
+            except (TypeError, ValueError) as e:
+                errors.append("{}: {}".format(field, e))
+
+        if errors:
+            raise SchemaError(
+                "Invalid {} data: {}".format(entity_type, "; ".join(errors))
+            )
+        return result
+
+    def coerce(self, spec, value):
+        """
+        Check a value against the schema of its field, converting it when it's safe.
+
+        Args:
+            spec(dict): The field schema returned by ``fields``
+            value: The field value
+
+        Returns:
+            The value to send to Shotgun
+
+        Raises:
+            ValueError: When the value doesn't match the field type
+        """
+        if value is None:
+            return None
+
+        coerce = getattr(self, "_coerce_{}".format(spec["data_type"]), None)
+        return coerce(spec, value) if coerce is not None else value
+
+    @staticmethod
+    def _coerce_text(spec, value):
+        if not isinstance(value, string_types):
+            raise ValueError("expected a text, got {!r}".format(value))
+        return value
+
+    _coerce_entity_type = _coerce_text
+    _coerce_color = _coerce_text
+
+    @staticmethod
+    def _coerce_number(spec, value):
+        if isinstance(value, bool):
+            raise ValueError("expected a number, got {!r}".format(value))
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, string_types) and value.strip().lstrip("-").isdigit():
+            return int(value)
+        if not isinstance(value, int) and type(value).__name__ != "long":
+            raise ValueError("expected a number, got {!r}".format(value))
+        return value
+
+    _coerce_percent = _coerce_number
+    _coerce_duration = _coerce_number
+    _coerce_timecode = _coerce_number
+
+    @staticmethod
+    def _coerce_float(spec, value):
+        if isinstance(value, bool):
+            raise ValueError("expected a float, got {!r}".format(value))
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError("expected a float, got {!r}".format(value))
+
+    @staticmethod
+    def _coerce_checkbox(spec, value):
+        if value in (0, 1):
+            return bool(value)
+        raise ValueError("expected a bool, got {!r}".format(value))
+
+    @staticmethod
+    def _coerce_date(spec, value):
+        if isinstance(value, datetime.datetime):
+            value = value.date()
+        if isinstance(value, datetime.date):
+            return value.isoformat()
+        if isinstance(value, string_types) and _DATE_REGEX.match(value):
+            return value
+        raise ValueError("expected a YYYY-MM-DD date, got {!r}".format(value))
+
+    @staticmethod
+    def _coerce_date_time(spec, value):
+        if not isinstance(value, datetime.datetime):
+            raise ValueError("expected a datetime, got {!r}".format(value))
+        return value
+
+    @staticmethod
+    def _coerce_entity(spec, value):
+        value = getattr(value, "shotgun_entity_data", value)
+        if not isinstance(value, dict) or not value.get("type") or not value.get("id"):
+            raise ValueError("expected an entity, got {!r}".format(value))
+
+        valid_types = spec.get("valid_types")
+        if valid_types and value["type"] not in valid_types:
+            raise ValueError(
+                "{} isn't one of the valid types {}".format(value["type"], valid_types)
+            )
+        return value
+
+    @classmethod
+    def _coerce_multi_entity(cls, spec, value):
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("expected a list of entities, got {!r}".format(value))
+        return [cls._coerce_entity(spec, v) for v in value]
+
+    @staticmethod
+    def _coerce_list(spec, value):
+        if not isinstance(value, string_types):
+            raise ValueError("expected a text, got {!r}".format(value))
+
+        valid_values = spec.get("valid_values")
+        if valid_values and value not in valid_values:
+            raise ValueError(
+                "{!r} isn't one of the valid values {}".format(value, valid_values)
+            )
+        return value
+
+    _coerce_status_list = _coerce_list
@@ -1,21 +1,116 @@
+import itertools
+import re
+import time
+
+from . import incremental_sync, metrics
+from .schema_cache import SchemaError
+
+
 class EntityModel(object):
-    def __init__(self, entity_type, fields, context, sg):
+    __slots__ = ()
+    _deferred = ()
+    _schema = None
+
+    def __init__(
+        self,
+        entity_type,
+        fields,
+        context,
+        sg,
+        cache=None,
+        identity_map=None,
+        schema=None,
+    ):
         self._entity_type = entity_type
         self._fields = fields
         self._filter = []
 
         self._context = context
         self._sg = sg
+        self._cache = cache
+        self._identity_map = identity_map
+        self._schema = schema
+        if schema is not None:
+            schema.validate_fields(sg, entity_type, fields)
+
+    def _validate_data(self, data):
+        """
+        Check and coerce the data sent to Shotgun when there's a schema.
+
+        Raises:
+            SchemaError: When the data doesn't match the Shotgun schema
+        """
+        if self._schema is None:
+            return data
+        return self._schema.validate_data(self._sg, self._entity_type, data)
+
+    def _read(self, method, entity_filter, fields, sg=None, **kwargs):
+        """
+        Call a Shotgun read method, like ``find`` or ``find_one``, through the cache when there's one.
+
+        The ``sg`` connection is used instead of the one of this instance when it's given, like the
+        connection of a worker thread.
+        """
+        return self._read_type(
+            self._entity_type, method, entity_filter, fields, sg, **kwargs
+        )
+
+    def _read_type(self, entity_type, method, entity_filter, fields, sg=None, **kwargs):
+        """
+        The same as ``_read`` for another entity type, like the one of a linked entity.
+        """
+        sg = sg if sg is not None else self._sg
+        registry = metrics.get_metrics()
+        if registry is not None:
+            return registry.read(
+                sg,
+                self._cache,
+                method,
+                entity_type,
+                entity_filter,
+                fields,
+                **kwargs
+            )
+
+        if self._cache is None:
+            return getattr(sg, method)(entity_type, entity_filter, fields, **kwargs)
+
+        return self._cache.read(
+            sg, method, entity_type, entity_filter, fields, **kwargs
+        )
+
+    def _fetch_fields(self):
+        """
+        Get the fields requested by ``load``, all of them but the deferred ones.
+        """
+        if not self._deferred:
+            return self._fields
+        return [f for f in self._fields if f not in self._deferred]
+
+    @staticmethod
+    def _deferred_fields(deferred):
+        return tuple(f for f in deferred or () if f not in ("type", "id", "project"))
+
+    def _invalidate_cache(self):
+        if self._cache is not None:
+            self._cache.invalidate(self._entity_type)
+
+    def _attribute_names(self):
+        return [key for key in self.__dict__ if key[0] != "_"]
+
+    @staticmethod
+    def _sg_value(value):
+        return value.shotgun_entity_data if isinstance(value, BaseEntity) else value
 
     @property
     def metadata(self):
         data = {}
-        for (key, value) in self.__dict__.items():
-            if key[0] == "_" or not value:
+        for key in self._attribute_names():
+            value = getattr(self, key)
+            if not value:
                 continue
 
-            value = value.shotgun_entity_data if isinstance(value, Entity) else value
-            data[key] = value
+            data[key] = self._sg_value(value)
         return data
 
     @property
@@ -30,31 +125,183 @@ class EntityModel(object):
     def load(self, *args, **kwargs):
         pass
 
+    def aload(self, entity_filter=None, timeout=None, executor=None):
+        """
+        The asyncio version of the ``load`` method, the Shotgun call runs on the executor threads.
+
+        Args:
+            entity_filter(list): The Shotgun CRUD filter, the same as the ``load`` method.
+            timeout(float): The max seconds waiting for Shotgun, defaults to the executor timeout.
+            executor(AsyncExecutor): Defaults to the one returned by ``get_default_executor``.
+
+        Returns:
+            A coroutine returning this instance, for example::
+                assets = await EntityIter("Asset", ["code"], context, pool).aload()
+        """
+        from .async_model import aload
+
+        return aload(self, entity_filter, timeout, executor)
+
+    def _fetch(self, entity_filter=None, sg=None):
+        """
+        Request the Shotgun data of the ``load`` method, it's the only part of it calling Shotgun, so
+        it doesn't change this instance.
+
+        Args:
+            entity_filter(list): The Shotgun CRUD filter, the same as the ``load`` method.
+            sg(shotgun_api3.Shotgun): The connection used instead of the one of this instance
+        """
+        pass
+
+    def _set_loaded_data(self, sg_data):
+        """
+        Add the Shotgun data returned by ``_fetch`` to this instance.
+
+        Returns:
+            The loaded instance
+        """
+        return self
+
     def update(self, *args, **kwargs):
         pass
 
+    def aupdate(
+        self, multi_entity_update_modes=None, timeout=None, executor=None, **kwargs
+    ):
+        """
+        The asyncio version of the ``update`` method, the Shotgun calls run on the executor threads.
+
+        Args:
+            multi_entity_update_modes(dict): The same as the ``update`` method.
+            timeout(float): The max seconds waiting for Shotgun, defaults to the executor timeout.
+            executor(AsyncExecutor): Defaults to the one returned by ``get_default_executor``.
+            kwargs: Any other argument of the ``update`` method, like ``batch_size``.
+
+        Returns:
+            A coroutine returning the result of the ``update`` method
+        """
+        from .async_model import aupdate
+
+        return aupdate(self, multi_entity_update_modes, timeout, executor, **kwargs)
+
     def create(self, *args, **kwargs):
         pass
 
+    def acreate(self, return_fields=None, timeout=None, executor=None, **kwargs):
+        """
+        The asyncio version of the ``create`` method, the Shotgun calls run on the executor threads.
+
+        Args:
+            return_fields(list): The same as the ``create`` method.
+            timeout(float): The max seconds waiting for Shotgun, defaults to the executor timeout.
+            executor(AsyncExecutor): Defaults to the one returned by ``get_default_executor``.
+            kwargs: Any other argument of the ``create`` method, like ``batch_size``.
+
+        Returns:
+            A coroutine returning the result of the ``create`` method
+        """
+        from .async_model import acreate
+
+        return acreate(self, return_fields, timeout, executor, **kwargs)
+
 
-class Entity(EntityModel):
+class BaseEntity(EntityModel):
     """
-    This class encapsulates the Shotgun Entity data and give the Shotgun CRUD methods as well
+    The Shotgun CRUD methods shared by ``Entity`` and the compact ``EntityRecord`` classes.
+
+    The Shotgun data added by ``add_sg_data`` is considered unchanged, when one of its attributes is set
+    the previous value is kept in ``_sg_data`` until the next ``add_sg_data``, so ``update`` only sends the
+    changed fields.
+
+    The deferred fields aren't requested by ``load``, they are requested on their first access.
     """
 
-    def __init__(self, entity_type, fields, context, sg):
-        super(Entity, self).__init__(entity_type, fields, context, sg)
+    __slots__ = ()
+    _MISSING = object()
+    _owner = None
 
-        for f in fields:
-            setattr(self, f, None)
+    def __getattr__(self, name):
+        # only called for the attributes not set, like the deferred fields not requested yet
+        if name[0] == "_" or name not in self._deferred:
+            raise AttributeError(
+                "'{}' object has no attribute '{}'".format(type(self).__name__, name)
+            )
 
-        if "id" not in self._fields:
-            self._fields += ["id"]
-            setattr(self, "id", None)
+        if self._owner is not None:
+            # the field is requested for all the entities of the owner ``EntityIter`` at once
+            self._owner._load_deferred(name)
+        if not self._has_field(name):
+            self._load_deferred(name)
+        return object.__getattribute__(self, name)
 
-        if "project" not in self._fields:
-            self._fields += ["project"]
-        setattr(self, "project", self._context.project)
+    def _has_field(self, name):
+        try:
+            object.__getattribute__(self, name)
+        except AttributeError:
+            return False
+        return True
+
+    def _load_deferred(self, name):
+        data = None
+        if self.id:
+            data = self._read("find_one", [["id", "is", self.id]], [name])
+        super(BaseEntity, self).__setattr__(name, (data or {}).get(name))
+
+    def _unload_deferred(self):
+        """
+        Mark the deferred fields without local changes as not requested, so their next access requests them again.
+        """
+        changed = self._sg_data or {}
+        for name in self._deferred:
+            if name not in changed and self._has_field(name):
+                object.__delattr__(self, name)
+
+    def __setattr__(self, name, value):
+        set_attr = super(BaseEntity, self).__setattr__
+        if name[0] == "_" or isinstance(getattr(type(self), name, None), property):
+            set_attr(name, value)
+            return
+
+        try:
+            # not through __getattr__, so setting a deferred field doesn't request it
+            original = self._sg_value(object.__getattribute__(self, name))
+        except AttributeError:
+            original = self._MISSING
+        set_attr(name, value)
+        if self._sg_data is None:
+            set_attr("_sg_data", {})
+        self._sg_data.setdefault(name, original)
+
+    def _take_snapshot(self, keys):
+        """
+        Mark the ``keys`` attributes as unchanged.
+        """
+        if not self._sg_data:
+            return
+
+        for key in keys:
+            self._sg_data.pop(key, None)
+        if not self._sg_data:
+            super(BaseEntity, self).__setattr__("_sg_data", None)
+
+    @property
+    def changed_data(self):
+        """
+        The attributes set since the last Shotgun data was added and whose value is different from it.
+
+        Changes made in place, like appending an item to a multi-entity list, are not tracked, so
+        set a new value to the attribute instead.
+
+        Returns:
+            A dict with the changed field names and values.
+        """
+        data = {}
+        for key, original in (self._sg_data or {}).items():
+            value = self._sg_value(getattr(self, key))
+            if original is not self._MISSING and original == value:
+                continue
+            data[key] = value
+        return data
 
     @property
     def shotgun_entity_data(self):
@@ -75,31 +322,75 @@ class Entity(EntityModel):
         if isinstance(data, list):
             data = data[0]
 
+        set_attr = super(BaseEntity, self).__setattr__
         for key, value in data.items():
-            setattr(self, key, value)
+            set_attr(key, value)
+        self._take_snapshot(data)
         return data
 
+    def merge_sg_data(self, data):
+        """
+        Add newer Shotgun data keeping the local changes, the changed fields get the new data as their
+        original value, so they are still sent by the next ``update``.
+
+        Args:
+            data(dict): The Shotgun entity data
+
+        Returns:
+            The Shotgun data
+        """
+        changed = self._sg_data or {}
+        set_attr = super(BaseEntity, self).__setattr__
+        for key, value in data.items():
+            if key in changed:
+                changed[key] = self._sg_value(value)
+            else:
+                set_attr(key, value)
+        return data
+
+    def _register(self):
+        """
+        Returns:
+            The instance kept by the identity map for this Shotgun entity, otherwise, this one
+        """
+        if self._identity_map is None:
+            return self
+        return self._identity_map.add(self)
+
     def load(self, entity_filter=None):
         """
         Load the Shotgun data into this class
 
         Args:
             entity_filter(list): The Shotgun CRUD filter.
+
+        Returns:
+            The instance kept by the identity map, it's another one with the Shotgun data merged into it
+            when the entity was already loaded, otherwise, this one.
         """
+        return self._set_loaded_data(self._fetch(entity_filter))
+
+    def _fetch(self, entity_filter=None, sg=None):
         entity_filter = (
             entity_filter if entity_filter is not None else self.entity_filter
         )
-        entity_filter += [["project", "is", self._context.project]]
-        data = self._sg.find_one(self._entity_type, entity_filter, self._fields)
-        if not data:
+        entity_filter = list(entity_filter) + [["project", "is", self._context.project]]
+        return self._read("find_one", entity_filter, self._fetch_fields(), sg)
+
+    def _set_loaded_data(self, sg_data):
+        if not sg_data:
             # TODO: add logging warning
-            return
+            return self
 
-        self.add_sg_data(data)
+        self.add_sg_data(sg_data)
+        entity = self._register()
+        if entity is not self:
+            entity.merge_sg_data(sg_data)
+        return entity
 
     def update(self, multi_entity_update_modes=None):
         """
-        Commit changes on Shotgun.
+        Commit the changed fields on Shotgun. Nothing is sent when there aren't changes.
         Args:
             multi_entity_update_modes(dict): Optional dict indicating what update mode to use when updating a
                 multi-entity link field. The keys in the dict are the fields to set the mode for, and the values
@@ -107,25 +398,52 @@ class Entity(EntityModel):
         Returns:
             Dictionary of the fields updated
         """
-        data = self.metadata
-
-        if not data:
+        request = self.update_request(multi_entity_update_modes)
+        if not request:
             # TODO: logging this warning
             return {}
 
-        entity_id = data.get("id")
-        if entity_id:
-            del data["id"]
-        else:
-            return {}
-        if data.get("type"):
-            del data["type"]
-
-        return self.add_sg_data(
-            self._sg.update(
-                self._entity_type, entity_id, data, multi_entity_update_modes
-            )
+        data = metrics.measure(
+            self._entity_type,
+            "update",
+            self._sg.update,
+            request["entity_type"],
+            request["entity_id"],
+            request["data"],
+            request["multi_entity_update_modes"],
         )
+        self._invalidate_cache()
+        return self.add_sg_data(data)
+
+    def update_request(self, multi_entity_update_modes=None):
+        """
+        Build the Shotgun ``batch`` request used to commit the changes of this entity.
+
+        Args:
+            multi_entity_update_modes(dict): The same as the ``update`` method.
+
+        Returns:
+            A dict with the ``update`` request, otherwise, ``None`` when this entity has nothing to update.
+        """
+        entity_id = self.id
+        if not entity_id:
+            return None
+
+        data = self.changed_data
+        data.pop("id", None)
+        data.pop("type", None)
+
+        if not data:
+            return None
+        data = self._validate_data(data)
+
+        return {
+            "request_type": "update",
+            "entity_type": self._entity_type,
+            "entity_id": entity_id,
+            "data": data,
+            "multi_entity_update_modes": multi_entity_update_modes,
+        }
 
     def create(self, return_fields=None):
         """
@@ -138,18 +456,239 @@ class Entity(EntityModel):
             as well as the defaults type and id. If any additional fields were provided using the return_fields parameter,
             these would be included as well.
         """
+        request = self.create_request(return_fields)
+        if not request:
+            return {}
+
+        data = metrics.measure(
+            self._entity_type,
+            "create",
+            self._sg.create,
+            request["entity_type"],
+            request["data"],
+            request["return_fields"],
+        )
+        self._invalidate_cache()
+        self.add_sg_data(data)
+        self._register()
+        return data
+
+    def create_request(self, return_fields=None):
+        """
+        Build the Shotgun ``batch`` request used to create this entity.
+
+        Args:
+            return_fields(list): The same as the ``create`` method.
+
+        Returns:
+            A dict with the ``create`` request, otherwise, ``None`` when this entity has no data.
+        """
         data = self.metadata
         return_fields = return_fields or self._fields
 
         if not data:
-            return {}
+            return None
 
         if data.get("id"):
             del data["id"]
         if data.get("type"):
             del data["type"]
+        data = self._validate_data(data)
+
+        return {
+            "request_type": "create",
+            "entity_type": self._entity_type,
+            "data": data,
+            "return_fields": return_fields,
+        }
+
+
+class Entity(BaseEntity):
+    """
+    This class encapsulates the Shotgun Entity data and give the Shotgun CRUD methods as well
+
+    The ``deferred`` fields, like large text fields or image urls, are requested on their first access.
+    For example::
+        scene = Entity("CustomEntity02", ["code", "description"], context, sg, deferred=["description"])
+    """
+
+    def __init__(
+        self,
+        entity_type,
+        fields,
+        context,
+        sg,
+        cache=None,
+        identity_map=None,
+        deferred=None,
+        schema=None,
+    ):
+        self._sg_data = None
+        self._deferred = self._deferred_fields(deferred)
+        super(Entity, self).__init__(
+            entity_type, fields, context, sg, cache, identity_map, schema
+        )
+
+        for f in fields:
+            if f not in self._deferred:
+                setattr(self, f, None)
+
+        if "id" not in self._fields:
+            self._fields += ["id"]
+            setattr(self, "id", None)
+
+        if "project" not in self._fields:
+            self._fields += ["project"]
+        setattr(self, "project", self._context.project)
+
+        self._sg_data = None
+
+
+class EntityRecord(BaseEntity):
+    """
+    The base of the compact ``Entity`` classes created by ``entity_record_class``.
+
+    The fields are stored in ``__slots__`` and the entity type and fields live on the class, while the
+    context, Shotgun connection, cache, identity map and schema are the ones of the ``EntityIter`` owning
+    the record, so it's the best choice to hold a lot of entities. The attributes other than its fields,
+    like its own ``entity_filter`` or the ones merged by an ``IdentityMap`` from a load with more fields,
+    are stored in a ``__dict__`` created on their first assignment.
+
+    For example::
+        assets = EntityIter("Asset", ["code"], context, sg)
+        asset = entity_record_class("Asset", ["code"])(assets)
+    """
+
+    __slots__ = ("_sg_data", "_owner", "__dict__", "__weakref__")
+    _entity_type = None
+    _fields = []
+    _record_fields = ()
+    _record_field_set = frozenset()
+    _filter = ()
+    _deferred = ()
+
+    def __init__(self, owner):
+        """
+        Args:
+            owner(EntityIter): The ``EntityIter`` creating this record, it requests the deferred fields
+        """
+        set_attr = super(BaseEntity, self).__setattr__
+        set_attr("_sg_data", None)
+        set_attr("_owner", owner)
+        deferred = self._deferred
+        for f in self._record_fields:
+            if f not in deferred:
+                set_attr(f, None)
+        set_attr("project", self._context.project)
+
+    def _attribute_names(self):
+        names = self._record_fields
+        if self._deferred:
+            names = [f for f in names if self._has_field(f)]
+        extra = [
+            key
+            for key in self.__dict__
+            if key[0] != "_" and key not in self._record_field_set
+        ]
+        return list(names) + extra if extra else names
+
+    @property
+    def _context(self):
+        return self._owner._context
+
+    @property
+    def _sg(self):
+        return self._owner._sg
+
+    @property
+    def _cache(self):
+        return self._owner._cache
+
+    @property
+    def _identity_map(self):
+        return self._owner._identity_map
+
+    @property
+    def _schema(self):
+        return self._owner._schema
+
+
+def _column_key(value):
+    """
+    Get a hashable and comparable version of a Shotgun value, entity links become ``(type, id)`` tuples.
+    """
+    if isinstance(value, dict) and "type" in value and "id" in value:
+        return value["type"], value["id"]
+    if isinstance(value, BaseEntity):
+        return value._entity_type, value.id
+    if isinstance(value, (list, tuple)):
+        return tuple(_column_key(v) for v in value)
+    return value
+
+
+_COLUMN_OPERATORS = {
+    "is": lambda value, other: value == other,
+    "is_not": lambda value, other: value != other,
+    "in": lambda value, other: value in other,
+    "not_in": lambda value, other: value not in other,
+    "greater_than": lambda value, other: value is not None and value > other,
+    "less_than": lambda value, other: value is not None and value < other,
+    "contains": lambda value, other: value is not None and other in value,
+}
 
-        return self.add_sg_data(self._sg.create(self._entity_type, data, return_fields))
+# the placeholder of the entities removed from an ``EntityIter``
+_REMOVED = object()
+# the placeholder of the deferred fields not requested yet in the ``EntityIter`` columns
+_UNLOADED = object()
+
+_record_classes = {}
+_IDENTIFIER_REGEX = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def entity_record_class(entity_type, fields, deferred=None):
+    """
+    Get the ``EntityRecord`` class of the ``entity_type``, ``fields`` and ``deferred`` fields, it's created
+    only once and shared by all the ``EntityIter`` instances using them.
+
+    The ``id`` and ``project`` fields are always added, as ``Entity`` does. The fields that aren't valid
+    python identifiers, like the deep-link ``sg_namespace.CustomEntity03.code``, are stored in the ``__dict__``.
+
+    Args:
+        entity_type(str): The Shotgun entity type
+        fields(list): The Shotgun field names
+        deferred(list): The fields requested on their first access
+
+    Returns:
+        The ``EntityRecord`` subclass, its instances are created with their owner ``EntityIter``.
+    """
+    record_fields = tuple(fields)
+    for f in ("id", "project"):
+        if f not in record_fields:
+            record_fields += (f,)
+    deferred = EntityModel._deferred_fields(deferred)
+
+    key = (entity_type, record_fields, deferred)
+    record_class = _record_classes.get(key)
+    if record_class is None:
+        attributes = record_fields
+        if "type" not in attributes:
+            attributes += ("type",)
+        slots = tuple(f for f in attributes if _IDENTIFIER_REGEX.match(f))
+
+        record_class = type(
+            str("{}Record".format(entity_type)),
+            (EntityRecord,),
+            {
+                "__slots__": slots,
+                "_entity_type": entity_type,
+                "_fields": list(record_fields),
+                "_record_fields": attributes,
+                "_record_field_set": frozenset(attributes),
+                "_deferred": deferred,
+            },
+        )
+        _record_classes[key] = record_class
+    return record_class
 
 
 class EntityIter(EntityModel):
@@ -157,19 +696,64 @@ class EntityIter(EntityModel):
     This class interacts with the many Shotgun Entity data and give the Shotgun CRUD methods as well.
 
     This class allows the for/loop and len method to access the surveyed entities' data.
+
+    The fields in ``index_on`` are indexed by ``load``, so ``get_by`` and ``remove_entity`` find their
+    entities in constant time. For example::
+        assets = EntityIter("Asset", ["code"], context, sg, index_on=["id", "code"])
+        assets.load()
+        hero = assets.get_by("code", "Hero")
+
+    When there's a ``schema`` the fields are checked by the constructor and the data sent by ``update``
+    and ``create`` is checked before any Shotgun call, the invalid entities are returned as errors.
+
+    The ``deferred`` fields aren't requested by ``load``. The first access to one of them requests it
+    for all the entities at once, with one ``id in`` query by ``DEFAULT_PAGE_SIZE`` entities.
+    For example::
+        assets = EntityIter("Asset", ["code", "description"], context, sg, deferred=["description"])
     """
 
-    def __init__(self, entity_type, fields, context, sg):
-        super(EntityIter, self).__init__(entity_type, fields, context, sg)
+    DEFAULT_BATCH_SIZE = 100
+    DEFAULT_PAGE_SIZE = 500
+    CLOCK_SKEW = incremental_sync.CLOCK_SKEW
+
+    def __init__(
+        self,
+        entity_type,
+        fields,
+        context,
+        sg,
+        batch_size=None,
+        columnar=False,
+        cache=None,
+        identity_map=None,
+        index_on=None,
+        deferred=None,
+        schema=None,
+    ):
+        super(EntityIter, self).__init__(
+            entity_type, fields, context, sg, cache, identity_map, schema
+        )
 
         self._entities = []
+        self._removed = 0
+        self._last_sync = None
+        self._prefetch = None
+        self._columns = {} if columnar else None
+        self._source = None
+        self._indexes = dict((f, {}) for f in index_on or [])
+        self._unindexed = []
+        self._deferred = self._deferred_fields(deferred)
+        self.batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+        self._record_class = entity_record_class(entity_type, fields, self._deferred)
 
     def __iter__(self):
-        for entity in self._entities:
-            yield entity
+        for i, entity in enumerate(self._entities):
+            if entity is _REMOVED:
+                continue
+            yield entity if entity is not None else self._entity_at(i)
 
     def __len__(self):
-        return len(self._entities)
+        return len(self._entities) - self._removed
 
     def add_new_entity(self):
         """
@@ -178,70 +762,673 @@ class EntityIter(EntityModel):
         Returns:
             (Entity): The ``Entity`` class instance
         """
-        entity = Entity(self._entity_type, self._fields, self._context, self._sg)
+        entity = Entity(
+            self._entity_type,
+            self._fields,
+            self._context,
+            self._sg,
+            self._cache,
+            self._identity_map,
+            schema=self._schema,
+        )
         self._entities.append(entity)
+        if self._columns is not None:
+            for column in self._columns.values():
+                column.append(None)
+        if self._indexes:
+            # its fields are only set after this call, so it's checked by every lookup until it's created
+            self._unindexed.append(len(self._entities) - 1)
         return entity
 
     def remove_entity(self, entity_field, entity_value):
         """
         It removes the entity found by ``entity_field`` and ``entity_value`` from the entities internal list and it deletes this class instance.
 
+        It takes constant time when the ``entity_field`` is in the ``index_on`` fields.
+
         Args:
             entity_field(str): The entity field name
             entity_value(str): The entity field value
         """
-        removed_entity = None
-        for entity in self._entities:
-            attr = getattr(entity, entity_field)
-            if attr == entity_value:
-                removed_entity = entity
-                self._entities.remove(entity)
-                break
-        if removed_entity:
-            del removed_entity
+        position = self._position_of(entity_field, entity_value)
+        if position is not None:
+            self._remove_at(position)
 
-    def load(self, entity_filter=None):
+    def _remove_at(self, position):
+        # the removed position is kept, so the positions of the indexes and views stay valid
+        self._entities[position] = _REMOVED
+        self._removed += 1
+        if self._columns is not None:
+            for column in self._columns.values():
+                column[position] = None
+
+    def get_by(self, field, value):
+        """
+        Get the first entity with the ``value`` in the ``field``. It takes constant time when the
+        ``field`` is in the ``index_on`` fields, otherwise all entities are checked.
+
+        The indexes are built by ``load`` and updated by ``update`` and ``create``, so call ``reindex``
+        after changing an indexed field of the loaded entities without committing it.
+
+        Args:
+            field(str): The entity field name
+            value: The entity field value, entity links are compared by type and id.
+
+        Returns:
+            The entity found, otherwise, ``None``
+        """
+        position = self._position_of(field, value)
+        if position is None:
+            return None
+
+        entity = self._entities[position]
+        return entity if entity is not None else self._entity_at(position)
+
+    def reindex(self):
+        """
+        Build the indexes of the ``index_on`` fields with the current values of the entities.
+        """
+        for field in self._indexes:
+            index = {}
+            for position, value in self._values(field):
+                index.setdefault(_column_key(value), []).append(position)
+            self._indexes[field] = index
+
+    def _index_positions(self, positions):
+        """
+        Add the current values of the entities at the ``positions`` to the indexes, the new entities
+        are not checked by every lookup anymore.
+        """
+        positions = set(positions)
+        for field, index in self._indexes.items():
+            for position in sorted(positions):
+                key = _column_key(self._value_at(position, field))
+                indexed = index.setdefault(key, [])
+                if position not in indexed:
+                    indexed.append(position)
+        self._unindexed = [p for p in self._unindexed if p not in positions]
+
+    def _position_of(self, field, value):
+        key = _column_key(value)
+        index = self._indexes.get(field)
+        if index is None:
+            for position, v in self._values(field):
+                if _column_key(v) == key:
+                    return position
+            return None
+
+        for position in itertools.chain(index.get(key, ()), self._unindexed):
+            # the removed and changed entities are skipped, since they are not removed from the index
+            if self._entities[position] is _REMOVED:
+                continue
+            if _column_key(self._value_at(position, field)) == key:
+                return position
+        return None
+
+    def load(self, entity_filter=None, prefetch=None):
         """
-        Find all Shotgun entities and creates a new ``Entity`` class instances with the Shotgun data encapsulated
+        Find all Shotgun entities and creates a new ``EntityRecord`` class instances with the Shotgun data encapsulated
         Args:
             entity_filter(list): The Shotgun CRUD filter.
                 For example::
                     entity_filter=[["project", "is", {"type": "Project", "id": 123}], ["code", "is", "some_code"]]
+            prefetch(dict): The linked entities requested as well, see the ``prefetch`` method.
         """
+        self._set_loaded_data(self._fetch(entity_filter))
+        if prefetch:
+            self.prefetch(prefetch)
+
+    def prefetch(self, links):
+        """
+        Replace the entity links of all entities by the ``EntityRecord`` instances of the linked entities,
+        requested with one ``id in`` query by linked entity type, instead of one ``load`` by entity.
+
+        The links already replaced are skipped, so ``refresh`` only requests the links of the updated entities
+        when it's called again. The local changes of the link fields are kept.
+
+        Args:
+            links(dict): The link fields and the fields requested for their linked entities, the link fields
+                must be in the fields of this instance, including the deep-link ones.
+                For example::
+                    nodes = EntityIter("CustomEntity05", ["code", "sg_namespace"], context, sg)
+                    nodes.load(prefetch={"sg_namespace": ["code", "sg_path"]})
+                    paths = [node.sg_namespace.sg_path for node in nodes]
+
+        Raises:
+            ValueError: When a link field isn't in the fields of this instance
+        """
+        for field in links:
+            if field not in self._fields:
+                raise ValueError("Field {} not in {}".format(field, self._fields))
+
+        self._prefetch = dict(links)
+        for field, fields in links.items():
+            values = self._values(field)
+
+            ids = {}
+            for _, value in values:
+                for link in value if isinstance(value, list) else [value]:
+                    if isinstance(link, dict) and link.get("id"):
+                        ids.setdefault(link["type"], set()).add(link["id"])
+            if not ids:
+                continue
+
+            linked = {}
+            for entity_type, type_ids in ids.items():
+                linked.update(self._fetch_linked(entity_type, sorted(type_ids), fields))
+
+            for position, value in values:
+                entity = self._entities[position]
+                if entity is not None and field in (entity._sg_data or {}):
+                    continue
+
+                if isinstance(value, list):
+                    value = [linked.get(_column_key(v), v) for v in value]
+                elif isinstance(value, dict):
+                    value = linked.get(_column_key(value), value)
+                else:
+                    continue
+
+                if entity is None:
+                    self._columns[field][position] = value
+                else:
+                    object.__setattr__(entity, field, value)
+
+    def _fetch_linked(self, entity_type, ids, fields):
+        """
+        Request the linked entities of the ``prefetch`` method.
+
+        Returns:
+            A dict with the ``(type, id)`` tuples and the ``EntityRecord`` instances
+        """
+        record_class = entity_record_class(entity_type, fields)
+        linked = {}
+        for start in range(0, len(ids), self.DEFAULT_PAGE_SIZE):
+            entity_filter = [["id", "in", ids[start : start + self.DEFAULT_PAGE_SIZE]]]
+            for row in self._read_type(entity_type, "find", entity_filter, fields):
+                if self._identity_map is not None:
+                    entity = self._identity_map.resolve(
+                        entity_type, row, lambda: record_class(self)
+                    )
+                else:
+                    entity = record_class(self)
+                    entity.add_sg_data(row)
+                linked[(entity_type, row["id"])] = entity
+        return linked
+
+    def _fetch(self, entity_filter=None, sg=None):
         entity_filter = (
             entity_filter if entity_filter is not None else self.entity_filter
         )
-        sg_data = self._sg.find(self._entity_type, entity_filter, self._fields)
+        # the sync time is taken before the request, so the entities updated during it are requested by
+        # the next ``refresh``
+        sync_time = time.time()
+        sg_data = self._read("find", entity_filter, self._fetch_fields(), sg)
+        return sync_time, entity_filter, sg_data
 
+    def _set_loaded_data(self, fetched):
+        sync_time, entity_filter, sg_data = fetched
+        self._last_sync = (sync_time, entity_filter)
         if not sg_data:
+            return self
+
+        if self._columns is not None:
+            self._load_columns(sg_data)
+        else:
+            self._entities = [self._new_entity(entity) for entity in sg_data]
+        self._removed = 0
+        self._unindexed = []
+        self.reindex()
+        return self
+
+    def refresh(self):
+        """
+        Request only the entities created, updated or deleted since the last ``load`` or ``refresh``,
+        using the same filter. The updated entities keep their instances and local changes, see
+        ``BaseEntity.merge_sg_data``, the new ones are added and the deleted ones are removed.
+
+        It's a full ``load`` when the entities weren't loaded yet.
+
+        Returns:
+            A dict with the number of ``created``, ``updated`` and ``deleted`` entities
+        """
+        if self._last_sync is None:
+            self.load()
+            return {"created": len(self), "updated": 0, "deleted": 0}
+
+        last_sync, entity_filter = self._last_sync
+        now = time.time()
+        changed, current_ids = incremental_sync.find_changes(
+            # not through the cache, its results are the ones this call looks for changes in
+            lambda entity_type, filters, fields: metrics.measure(
+                entity_type, "find", self._sg.find, entity_type, filters, fields
+            ),
+            self._entity_type,
+            entity_filter,
+            self._fetch_fields(),
+            last_sync,
+            self.CLOCK_SKEW,
+        )
+
+        positions = {}
+        for position, entity_id in self._values("id"):
+            positions.setdefault(entity_id, position)
+
+        created = updated = deleted = 0
+        for row in changed:
+            position = positions.pop(row["id"], None)
+            if position is None:
+                self._append(row)
+                created += 1
+                continue
+
+            entity = self._entities[position]
+            if entity is None:
+                # a columnar entity not accessed yet has no local changes
+                for field, column in self._columns.items():
+                    column[position] = row.get(field, _UNLOADED)
+            else:
+                entity.merge_sg_data(row)
+                entity._unload_deferred()
+            updated += 1
+
+        for entity_id, position in positions.items():
+            if entity_id and entity_id not in current_ids:
+                self._remove_at(position)
+                deleted += 1
+
+        self._last_sync = (now, entity_filter)
+        if created or updated or deleted:
+            # the queries cached before the refresh don't have these changes
+            self._invalidate_cache()
+        if created or updated:
+            if self._prefetch:
+                self.prefetch(self._prefetch)
+            self.reindex()
+        return {"created": created, "updated": updated, "deleted": deleted}
+
+    def _append(self, data):
+        if self._columns is None:
+            self._entities.append(self._new_entity(data))
             return
 
-        new_entities = []
-        for entity in sg_data:
-            new_entity = Entity(
-                self._entity_type, self._fields, self._context, self._sg
+        if not self._columns:
+            self._columns = dict(
+                (f, [None] * len(self._entities)) for f in self._column_fields()
+            )
+        for field, column in self._columns.items():
+            column.append(data.get(field, _UNLOADED))
+        self._entities.append(None)
+
+    def _new_entity(self, data):
+        if self._identity_map is not None and data.get("id"):
+            return self._identity_map.resolve(
+                self._entity_type, data, lambda: self._record_class(self)
             )
-            new_entity.add_sg_data(entity)
-            new_entities.append(new_entity)
 
-        self._entities = new_entities
+        entity = self._record_class(self)
+        entity.add_sg_data(data)
+        return entity
 
-    def update(self, multi_entity_update_modes=None):
+    def _load_columns(self, sg_data):
+        """
+        Store the Shotgun data as one list per field, the ``EntityRecord`` instances are only created
+        when a row is accessed.
+        """
+        self._columns = dict(
+            (f, [row.get(f) for row in sg_data]) for f in self._column_fields()
+        )
+        self._entities = [None] * len(sg_data)
+
+    def _column_fields(self):
+        return ["type", "id"] + [
+            f for f in self._fetch_fields() if f not in ("type", "id")
+        ]
+
+    def _load_deferred(self, field):
+        """
+        Request a deferred field of all the entities not having it yet.
         """
-        Commit changes on Shotgun.
+        if self._columns is not None and field not in self._columns:
+            self._columns[field] = [_UNLOADED] * len(self._entities)
+
+        positions = {}
+        for position, entity in enumerate(self._entities):
+            if entity is _REMOVED:
+                continue
+            if entity is None:
+                if self._columns[field][position] is not _UNLOADED:
+                    continue
+            elif entity._has_field(field):
+                continue
+            positions.setdefault(self._value_at(position, "id"), []).append(position)
+
+        ids = [i for i in positions if i]
+        values = {}
+        for start in range(0, len(ids), self.DEFAULT_PAGE_SIZE):
+            entity_filter = [["id", "in", ids[start : start + self.DEFAULT_PAGE_SIZE]]]
+            for row in self._read("find", entity_filter, [field]):
+                values[row["id"]] = row.get(field)
+
+        for entity_id, entity_positions in positions.items():
+            value = values.get(entity_id)
+            for position in entity_positions:
+                entity = self._entities[position]
+                if entity is None:
+                    self._columns[field][position] = value
+                else:
+                    object.__setattr__(entity, field, value)
+
+    def _entity_at(self, position):
+        entity = None
+        if self._source is not None:
+            # the rows of a view are created by its source, so both share the same instances
+            source, positions = self._source
+            entity = source._entities[positions[position]]
+            if entity is None:
+                entity = source._entity_at(positions[position])
+            elif entity is _REMOVED:
+                entity = None
+
+        if entity is None:
+            entity = self._new_entity(
+                dict(
+                    (f, column[position])
+                    for f, column in self._columns.items()
+                    if column[position] is not _UNLOADED
+                )
+            )
+        self._entities[position] = entity
+        return entity
+
+    def _value_at(self, position, field):
+        entity = self._entities[position]
+        if entity is None:
+            if field in self._columns:
+                value = self._columns[field][position]
+                if value is not _UNLOADED:
+                    return value
+                self._load_deferred(field)
+                return self._columns[field][position]
+            entity = self._entity_at(position)
+        return getattr(entity, field, None)
+
+    def _values(self, field):
+        """
+        Get the ``(position, value)`` pairs of the ``field`` for all entities, reading the columns
+        of the entities not accessed yet.
+        """
+        if field in self._deferred:
+            self._load_deferred(field)
+
+        if self._columns is not None and field in self._columns:
+            return [
+                (i, value if entity is None else getattr(entity, field, None))
+                for i, (value, entity) in enumerate(
+                    zip(self._columns[field], self._entities)
+                )
+                if entity is not _REMOVED
+            ]
+
+        return [
+            (i, self._value_at(i, field))
+            for i, entity in enumerate(self._entities)
+            if entity is not _REMOVED
+        ]
+
+    @property
+    def is_columnar(self):
+        return self._columns is not None
+
+    def column(self, field):
+        """
+        Get the values of the ``field`` for all entities, the changes made in the accessed entities are
+        considered as well.
+
+        Args:
+            field(str): The entity field name
+
+        Returns:
+            A list with the values in the same order of the entities
+        """
+        return [value for _, value in self._values(field)]
+
+    def _view(self, positions):
+        """
+        Create a new ``EntityIter`` with the entities of the ``positions``, sharing the entities with this one.
+        """
+        view = EntityIter(
+            self._entity_type,
+            self._fields,
+            self._context,
+            self._sg,
+            batch_size=self.batch_size,
+            columnar=self._columns is not None,
+            cache=self._cache,
+            identity_map=self._identity_map,
+            deferred=self._deferred,
+        )
+        view._schema = self._schema
+        view._filter = self._filter
+        view._entities = [self._entities[i] for i in positions]
+        if self._columns is not None:
+            view._columns = dict(
+                (f, [column[i] for i in positions])
+                for f, column in self._columns.items()
+            )
+            view._source = (self, positions)
+        return view
+
+    def where(self, field, operator, value):
+        """
+        Filter the entities by the value of a field, like a Shotgun filter but without any Shotgun call.
+
+        Args:
+            field(str): The entity field name
+            operator(str): One of ``is``, ``is_not``, ``in``, ``not_in``, ``greater_than``,
+                ``less_than`` or ``contains``.
+            value: The value compared with the field values, entity links are compared by type and id.
+                For example::
+                    assets.where("sg_asset_type", "is", "Character").column("code")
+
+        Returns:
+            (EntityIter): A new ``EntityIter`` with the entities found
+
+        Raises:
+            ValueError: When the operator is unknown
+        """
+        if operator not in _COLUMN_OPERATORS:
+            raise ValueError("Unknown operator: {}".format(operator))
+
+        compare = _COLUMN_OPERATORS[operator]
+        value = _column_key(value)
+        return self._view(
+            [i for i, v in self._values(field) if compare(_column_key(v), value)]
+        )
+
+    def group_by(self, field):
+        """
+        Group the entities by the value of a field.
+
+        Args:
+            field(str): The entity field name
+
+        Returns:
+            A dict with the field values and the ``EntityIter`` of their entities, entity links are
+            grouped by their ``(type, id)`` tuple.
+        """
+        groups = {}
+        for i, value in self._values(field):
+            groups.setdefault(_column_key(value), []).append(i)
+        return dict(
+            (value, self._view(positions)) for value, positions in groups.items()
+        )
+
+    def stream(self, entity_filter=None, page_size=None):
+        """
+        Find the Shotgun entities page by page and yield a new ``EntityRecord`` class instance for each of them
+        as soon as its page arrives. The entities are not stored in this class, so the memory used is
+        bounded by the ``page_size``.
+
+        Args:
+            entity_filter(list): The Shotgun CRUD filter, the same as the ``load`` method.
+            page_size(int): The number of entities requested by each Shotgun call, at most the
+                ``records_per_page`` of the Shotgun connection.
+
+        Yields:
+            (EntityRecord): The ``EntityRecord`` class instance
+        """
+        page_size = self._page_size(page_size)
+        page = 1
+        while True:
+            sg_data = self._fetch_page(entity_filter, page_size, page)
+            for entity in sg_data:
+                yield self._new_entity(entity)
+
+            if len(sg_data) < page_size:
+                break
+            page += 1
+
+    def _page_size(self, page_size):
+        # Shotgun returns at most records_per_page entities by page whatever the limit,
+        # a larger page size would read the full first page as the last one
+        config = getattr(self._sg, "config", None)
+        records_per_page = (
+            getattr(config, "records_per_page", None) or self.DEFAULT_PAGE_SIZE
+        )
+        return min(page_size or self.DEFAULT_PAGE_SIZE, records_per_page)
+
+    def _fetch_page(self, entity_filter, page_size, page):
+        entity_filter = (
+            entity_filter if entity_filter is not None else self.entity_filter
+        )
+        return metrics.measure(
+            self._entity_type,
+            "find",
+            self._sg.find,
+            self._entity_type,
+            entity_filter,
+            self._fetch_fields(),
+            order=[{"field_name": "id", "direction": "asc"}],
+            limit=page_size,
+            page=page,
+        )
+
+    def astream(self, entity_filter=None, page_size=None, timeout=None, executor=None):
+        """
+        The asyncio version of the ``stream`` method, each page is requested on the executor threads.
+
+        Args:
+            entity_filter(list): The Shotgun CRUD filter, the same as the ``load`` method.
+            page_size(int): The number of entities requested by each Shotgun call, at most the
+                ``records_per_page`` of the Shotgun connection.
+            timeout(float): The max seconds waiting for each page, defaults to the executor timeout.
+            executor(AsyncExecutor): Defaults to the one returned by ``get_default_executor``.
+
+        Returns:
+            An asynchronous iterator of ``EntityRecord`` instances, for example::
+                async for asset in assets.astream(page_size=200):
+                    print(asset.code)
+        """
+        from .async_model import astream
+
+        return astream(self, entity_filter, page_size, timeout, executor)
+
+    def _batch(self, requests, batch_size=None):
+        """
+        Send the ``(entity, request)`` pairs to Shotgun through ``sg.batch`` in chunks of ``batch_size``
+        and add the results to the matching ``Entity`` instances.
+
+        Shotgun runs every batch inside a transaction, so when a chunk fails none of its requests are
+        committed and the error is reported for every entity of that chunk.
+
+        Args:
+            requests(list): A list of ``(Entity, dict)`` tuples.
+            batch_size(int): The max number of requests sent by each ``sg.batch`` call.
+
+        Returns:
+            A list of ``(Entity, Exception)`` tuples with the entities that failed.
+        """
+        batch_size = batch_size or self.batch_size
+        errors = []
+        done = []
+        for i in range(0, len(requests), batch_size):
+            chunk = requests[i : i + batch_size]
+            try:
+                results = metrics.measure(
+                    self._entity_type,
+                    "batch",
+                    self._sg.batch,
+                    [request for _, request in chunk],
+                )
+            except Exception as e:
+                errors.extend((entity, e) for entity, _ in chunk)
+                continue
+
+            for (entity, _), result in zip(chunk, results):
+                entity.add_sg_data(result)
+                entity._register()
+                done.append(entity)
+
+        if done and self._indexes:
+            # the new ids and the committed values are indexed
+            done = set(id(entity) for entity in done)
+            self._index_positions(
+                i for i, entity in enumerate(self._entities) if id(entity) in done
+            )
+        if requests:
+            self._invalidate_cache()
+        return errors
+
+    def update(self, multi_entity_update_modes=None, batch_size=None):
+        """
+        Commit changes on Shotgun using as few ``sg.batch`` calls as possible.
         Args:
             multi_entity_update_modes(dict): Optional dict indicating what update mode to use when updating a
                 multi-entity link field. The keys in the dict are the fields to set the mode for, and the values
                 from the dict are one of ``set``, ``add``, or ``remove``. Defaults to ``set``.
+            batch_size(int): optional argument. The max number of entities sent by each ``sg.batch`` call,
+                defaults to the ``batch_size`` provided in the constructor of that class.
+
+        Returns:
+            A list of ``(Entity, Exception)`` tuples with the entities that couldn't be updated.
         """
+        requests = []
+        errors = []
         for entity in self._entities:
-            entity.update(multi_entity_update_modes)
+            if entity is None or entity is _REMOVED:
+                # the columnar entities not accessed yet don't have changes
+                continue
+            try:
+                request = entity.update_request(multi_entity_update_modes)
+            except SchemaError as e:
+                errors.append((entity, e))
+                continue
+            if request:
+                requests.append((entity, request))
 
-    def create(self, return_fields=None):
+        return errors + self._batch(requests, batch_size)
+
+    def create(self, return_fields=None, batch_size=None):
         """
-        Create a new entity with the specified ``type``
+        Create all entities with the specified ``type`` using as few ``sg.batch`` calls as possible.
         Args:
             return_fields(list): optional argument. When this argument is ``None``, this method considers only the `` fields`` provided in the constructor of that class.
+            batch_size(int): optional argument. The max number of entities sent by each ``sg.batch`` call,
+                defaults to the ``batch_size`` provided in the constructor of that class.
+
+        Returns:
+            A list of ``(Entity, Exception)`` tuples with the entities that couldn't be created.
         """
-        for entity in self._entities:
-            entity.create(return_fields)
+        requests = []
+        errors = []
+        for entity in self:
+            try:
+                request = entity.create_request(return_fields)
+            except SchemaError as e:
+                errors.append((entity, e))
+                continue
+            if request:
+                requests.append((entity, request))
+
+        return errors + self._batch(requests, batch_size)
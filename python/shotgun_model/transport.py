@@ -0,0 +1,294 @@
+import contextlib
+import random
+import threading
+import time
+
+# the names of the exception classes, or of their bases, raised by transient network failures
+TRANSIENT_ERRORS = (
+    "ConnectionError",
+    "SSLError",
+    "timeout",
+    "TimeoutError",
+    "BadStatusLine",
+    "IncompleteRead",
+    "RemoteDisconnected",
+    "URLError",
+)
+
+# the HTTP status codes of the ``shotgun_api3.ProtocolError`` raised by transient server failures,
+# the other ones, like a 403, fail the same way when retried
+TRANSIENT_STATUS_CODES = (429, 502, 503, 504)
+
+
+def is_transient_error(error):
+    """
+    Returns:
+        ``True`` when the error is one of the ``TRANSIENT_ERRORS``, or a ``ProtocolError`` with one
+        of the ``TRANSIENT_STATUS_CODES``, so the call can be retried
+    """
+    names = set(c.__name__ for c in type(error).__mro__)
+    if "ProtocolError" in names:
+        return getattr(error, "errcode", None) in TRANSIENT_STATUS_CODES
+    return bool(names.intersection(TRANSIENT_ERRORS))
+
+
+class Throttle(object):
+    """
+    A client-side limit of the Shotgun calls: a token bucket allowing ``rate`` calls per second, with
+    bursts of up to ``burst`` calls, and a cap of ``max_concurrency`` calls running at the same time.
+
+    The ``ShotgunTransport`` instances share the default throttle of the process, see ``set_default_throttle``.
+    """
+
+    def __init__(self, rate=None, burst=None, max_concurrency=None):
+        """
+        Args:
+            rate(float): The max number of calls per second, there's no limit when it's ``None``.
+            burst(int): The number of calls allowed at once after an idle period, defaults to the ``rate``.
+            max_concurrency(int): The max number of calls at the same time, there's no limit when it's ``None``.
+        """
+        self.rate = rate
+        self.burst = burst or max(1, int(rate or 1))
+        self.max_concurrency = max_concurrency
+
+        self._tokens = float(self.burst)
+        self._updated = time.time()
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        )
+        self._lock = threading.Lock()
+        self._sleep = time.sleep
+
+        self.throttled = 0
+        self.throttle_wait = 0.0
+        self.concurrency_waits = 0
+        self.in_flight = 0
+
+    def _take_token(self):
+        if not self.rate:
+            return
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.time()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if waited:
+                        self.throttled += 1
+                        self.throttle_wait += waited
+                    return
+                delay = (1 - self._tokens) / self.rate
+
+            self._sleep(delay)
+            waited += delay
+
+    @contextlib.contextmanager
+    def slot(self):
+        """
+        Wait for a token and a free concurrency slot, kept during the ``with`` block.
+        """
+        self._take_token()
+        if self._semaphore is not None and not self._semaphore.acquire(False):
+            with self._lock:
+                self.concurrency_waits += 1
+            self._semaphore.acquire()
+
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            A dict with the number of ``throttled`` calls, the seconds they waited in ``throttle_wait``,
+            the number of ``concurrency_waits`` and the calls ``in_flight``.
+        """
+        with self._lock:
+            return {
+                "throttled": self.throttled,
+                "throttle_wait": self.throttle_wait,
+                "concurrency_waits": self.concurrency_waits,
+                "in_flight": self.in_flight,
+            }
+
+
+_default_throttle = Throttle()
+
+
+def get_default_throttle():
+    """
+    Returns:
+        (Throttle): The throttle shared by the ``ShotgunTransport`` instances created without one,
+        it has no limits until ``set_default_throttle`` is called.
+    """
+    return _default_throttle
+
+
+def set_default_throttle(throttle):
+    """
+    Set the limits of the Shotgun calls of the whole process, like in the farm jobs.
+
+    Args:
+        throttle(Throttle): The throttle used by the ``ShotgunTransport`` instances created without one
+    """
+    global _default_throttle
+    _default_throttle = throttle
+
+
+class ShotgunTransport(object):
+    """
+    A Shotgun connection wrapper retrying the calls failed by transient errors, with an exponential
+    backoff and full jitter, and limiting the calls by a ``Throttle``.
+
+    The model classes can take it as their Shotgun connection, it wraps a raw connection or a
+    ``ConnectionPool``. Only the ``retry_methods`` are retried, since retrying a ``create`` or a ``batch``
+    whose response was lost could create the entities twice.
+
+    For example::
+        set_default_throttle(Throttle(rate=20, max_concurrency=4))
+        sg = ShotgunTransport(pool, max_retries=5)
+        assets = EntityIter("Asset", ["code"], context, sg)
+    """
+
+    DEFAULT_MAX_RETRIES = 3
+    DEFAULT_BACKOFF = 0.5
+    DEFAULT_MAX_BACKOFF = 30
+    RETRY_METHODS = frozenset(
+        [
+            "find",
+            "find_one",
+            "summarize",
+            "info",
+            "schema_read",
+            "schema_entity_read",
+            "schema_field_read",
+        ]
+    )
+    # the methods of a ``ConnectionPool`` called without retry nor throttle
+    PASSTHROUGH_METHODS = frozenset(["checkout", "checkin", "connection", "close"])
+
+    def __init__(
+        self,
+        sg,
+        max_retries=None,
+        backoff=None,
+        max_backoff=None,
+        throttle=None,
+        retry_methods=None,
+    ):
+        """
+        Args:
+            sg(shotgun_api3.Shotgun): The wrapped Shotgun connection or ``ConnectionPool``
+            max_retries(int): The max number of retries of a call
+            backoff(float): The max seconds waited before the first retry, doubled by each retry
+            max_backoff(float): The max seconds waited before any retry
+            throttle(Throttle): Defaults to the throttle of the process when each call is made
+            retry_methods(list): The Shotgun methods retried, defaults to the ``RETRY_METHODS``.
+        """
+        self._sg = sg
+        self.max_retries = (
+            max_retries if max_retries is not None else self.DEFAULT_MAX_RETRIES
+        )
+        self.backoff = backoff if backoff is not None else self.DEFAULT_BACKOFF
+        self.max_backoff = (
+            max_backoff if max_backoff is not None else self.DEFAULT_MAX_BACKOFF
+        )
+        self.retry_methods = frozenset(retry_methods or self.RETRY_METHODS)
+        self._throttle = throttle
+        self._lock = threading.Lock()
+        self._sleep = time.sleep
+
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.backoff_wait = 0.0
+
+    @property
+    def throttle(self):
+        return self._throttle or get_default_throttle()
+
+    def __getattr__(self, name):
+        if name[0] == "_":
+            raise AttributeError(name)
+
+        attribute = getattr(self._sg, name)
+        if not callable(attribute) or name in self.PASSTHROUGH_METHODS:
+            return attribute
+
+        def call(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+    def is_transient(self, error):
+        """
+        Returns:
+            ``True`` when the ``error`` can be retried, see ``is_transient_error``
+        """
+        return is_transient_error(error)
+
+    def call(self, method, *args, **kwargs):
+        """
+        Call a Shotgun method, retrying it on transient errors.
+
+        Args:
+            method(str): The Shotgun method name
+            args: The method arguments
+            kwargs: The method keyword arguments
+
+        Returns:
+            The Shotgun result
+
+        Raises:
+            The error of the last try
+        """
+        retries = self.max_retries if method in self.retry_methods else 0
+        attempt = 0
+        while True:
+            with self._lock:
+                self.calls += 1
+            try:
+                with self.throttle.slot():
+                    return getattr(self._sg, method)(*args, **kwargs)
+            except Exception as e:
+                if attempt >= retries or not self.is_transient(e):
+                    with self._lock:
+                        self.failures += 1
+                    raise
+
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+            with self._lock:
+                self.retries += 1
+                self.backoff_wait += delay
+            self._sleep(delay)
+            attempt += 1
+
+    @property
+    def stats(self):
+        """
+        Returns:
+            A dict with the number of ``calls`` sent, including the ``retries``, the calls ending in
+            ``failures``, the seconds waited in ``backoff_wait`` and the ``throttle`` stats.
+        """
+        with self._lock:
+            stats = {
+                "calls": self.calls,
+                "retries": self.retries,
+                "failures": self.failures,
+                "backoff_wait": self.backoff_wait,
+            }
+        stats["throttle"] = self.throttle.stats
+        return stats
@@ -0,0 +1,6 @@
+#!/bin/bash
+
+# Usage: ./run_benchmarks.sh --rows 1000 10000 100000 --save benchmarks/main.json --compare benchmarks/previous.json
+# Add --latency 0.05 to make each fake Shotgun call take as long as a round trip to a Shotgun site
+export TK_FRAMEWORK_CONSULADOUTILS="$PWD"
+python -m tests.shotgun_model_benchmark "$@"
@@ -29,3 +29,26 @@ class BaseClass(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         cls._sg.close()
+
+
+class OfflineBaseClass(unittest.TestCase):
+    """
+    The same as ``BaseClass`` but using the in-memory ``FakeShotgun`` instead of a live site.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        if os.getenv("TK_FRAMEWORK_CONSULADOUTILS") not in sys.path:
+            sys.path.insert(0, os.getenv("TK_FRAMEWORK_CONSULADOUTILS"))
+
+        from python.shotgun_model import shotgun_model
+        import python.shotgun_globals as shotgun_globals
+
+        cls._context = ContextMock()
+        cls.shotgun_model = shotgun_model
+        cls.shotgun_globals = shotgun_globals
+
+    def setUp(self):
+        from tests.fake_shotgun import FakeShotgun
+
+        self._sg = FakeShotgun()
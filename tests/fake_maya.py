@@ -0,0 +1,446 @@
+import itertools
+import re
+import sys
+import types
+
+
+class FakeAttribute(object):
+    def __init__(self, scene, path, name):
+        self._scene = scene
+        self._path = path
+        self._name = name
+
+    def get(self):
+        self._scene._log("Attribute.get", self._path, self._name)
+        return self._scene.nodes[self._path]["attrs"][self._name]
+
+    def set(self, value):
+        self._scene._log("Attribute.set", self._path, self._name, value)
+        self._scene.nodes[self._path]["attrs"][self._name] = value
+
+
+class FakePyNode(object):
+    """
+    A stand-in for ``pymel.core.PyNode``, built on a long name of the ``FakeMaya`` scene.
+    """
+
+    def __init__(self, scene, path):
+        self.__dict__["_scene"] = scene
+        self.__dict__["_path"] = path
+
+    def __eq__(self, other):
+        return isinstance(other, FakePyNode) and other._path == self._path
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._path)
+
+    def __repr__(self):
+        return "FakePyNode({!r})".format(self._path)
+
+    def __str__(self):
+        return self._path.rsplit("|", 1)[-1]
+
+    def fullPath(self):
+        self._scene._log("PyNode.fullPath", self._path)
+        return self._path
+
+    longName = fullPath
+
+    def name(self):
+        self._scene._log("PyNode.name", self._path)
+        return self._path.rsplit("|", 1)[-1]
+
+    nodeName = name
+
+    def nodeType(self):
+        self._scene._log("PyNode.nodeType", self._path)
+        return self._scene.nodes[self._path]["type"]
+
+    def namespace(self):
+        self._scene._log("PyNode.namespace", self._path)
+        namespace = self._scene.namespace_of(self._path)
+        return namespace + ":" if namespace else ""
+
+    def getTransform(self):
+        self._scene._log("PyNode.getTransform", self._path)
+        return FakePyNode(self._scene, self._scene.parent_of(self._path))
+
+    def parent(self, index=0):
+        self._scene._log("PyNode.parent", self._path)
+        return FakePyNode(self._scene, self._scene.parent_of(self._path))
+
+    def hasAttr(self, name):
+        self._scene._log("PyNode.hasAttr", self._path, name)
+        return name in self._scene.nodes[self._path]["attrs"]
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        self._scene._log("PyNode.attr", self._path, name)
+        if name not in self._scene.nodes[self._path]["attrs"]:
+            raise AttributeError(name)
+        return FakeAttribute(self._scene, self._path, name)
+
+
+class FakeMaya(object):
+    """
+    A small in-memory stand-in for the Maya scene graph, used by the offline tests of ``maya_utils``.
+
+    ``install`` registers fake ``maya.cmds``, ``maya.mel`` and ``pymel.core`` modules working on the
+    scene, and every call is logged in ``calls`` so the tests can count them.
+    """
+
+    DEFAULT_NAMESPACES = ["UI", "shared"]
+
+    SCENE_MESSAGES = (
+        "kAfterOpen",
+        "kAfterNew",
+        "kAfterLoadReference",
+        "kAfterUnloadReference",
+        "kAfterCreateReference",
+        "kAfterRemoveReference",
+    )
+
+    def __init__(self):
+        self.nodes = {}
+        self.calls = []
+        self.callbacks = {}
+        self.undo_chunks = 0
+        self.require_undo_chunk = False
+        self._open_chunks = 0
+        self._callback_ids = itertools.count(1)
+        self._modules = {}
+
+    def _log(self, method, *args):
+        self.calls.append((method,) + args)
+
+    def count(self, method):
+        return len([c for c in self.calls if c[0] == method])
+
+    @staticmethod
+    def parent_of(path):
+        return path.rsplit("|", 1)[0]
+
+    @staticmethod
+    def namespace_of(path):
+        name = path.rsplit("|", 1)[-1]
+        return name.rsplit(":", 1)[0] if ":" in name else ""
+
+    def add_transform(self, path):
+        """
+        Add a transform and its missing parents.
+        """
+        parts = path.strip("|").split("|")
+        for i in range(len(parts)):
+            current = "|" + "|".join(parts[: i + 1])
+            if current not in self.nodes:
+                self.nodes[current] = {"type": "transform", "attrs": {}}
+                self._node_message("added", current)
+        return path
+
+    def add_mesh(self, transform, intermediate=False, shape_name=None):
+        """
+        Add a transform with a mesh shape.
+
+        Returns:
+            The long name of the transform
+        """
+        self.add_transform(transform)
+        shape = "{}|{}".format(
+            transform, shape_name or transform.rsplit("|", 1)[-1] + "Shape"
+        )
+        self.nodes[shape] = {
+            "type": "mesh",
+            "intermediate": intermediate,
+            "attrs": {},
+        }
+        self._node_message("added", shape)
+        return transform
+
+    def remove(self, path):
+        """
+        Delete a node and its children.
+        """
+        for current in sorted(self.nodes, reverse=True):
+            if current == path or current.startswith(path + "|"):
+                self._node_message("removed", current)
+                del self.nodes[current]
+
+    def load_reference(self, namespace, count, group="render_grp"):
+        """
+        Add the meshes of a referenced asset, like a reference being created and loaded.
+
+        Returns:
+            The long names of the geometries
+        """
+        geos = [
+            self.add_mesh("|{0}:root|{0}:{1}|{0}:geo_{2}".format(namespace, group, i))
+            for i in range(count)
+        ]
+        self.scene_message("kAfterCreateReference")
+        self.scene_message("kAfterLoadReference")
+        return geos
+
+    def unload_reference(self, namespace):
+        """
+        Remove the nodes of a namespace, like a reference being unloaded.
+        """
+        for path in sorted(self.nodes):
+            if path in self.nodes and self.namespace_of(path) == namespace:
+                self.remove(path)
+        self.scene_message("kAfterUnloadReference")
+
+    def new_scene(self):
+        self.nodes = {}
+        self.scene_message("kAfterNew")
+
+    def scene_message(self, message):
+        for kind, value, function in list(self.callbacks.values()):
+            if kind == "scene" and value == message:
+                function(None)
+
+    def _node_message(self, kind, path):
+        for callback_kind, node_type, function in list(self.callbacks.values()):
+            if callback_kind == kind and node_type in (
+                "dependNode",
+                self.nodes[path]["type"],
+            ):
+                function(path, None)
+
+    def _add_callback(self, kind, value, function):
+        callback_id = next(self._callback_ids)
+        self.callbacks[callback_id] = (kind, value, function)
+        return callback_id
+
+    def namespaces(self):
+        namespaces = set()
+        for path in self.nodes:
+            namespace = self.namespace_of(path)
+            while namespace:
+                namespaces.add(namespace)
+                namespace = namespace.rsplit(":", 1)[0] if ":" in namespace else ""
+        return sorted(namespaces)
+
+    def _meshes(self, no_intermediate=False):
+        return [
+            path
+            for path, node in sorted(self.nodes.items())
+            if node["type"] == "mesh"
+            and not (no_intermediate and node.get("intermediate"))
+        ]
+
+    def _ls(self, pattern=None, node_type=None, noIntermediate=False, **kwargs):
+        if node_type == "mesh":
+            paths = self._meshes(noIntermediate)
+        else:
+            paths = [
+                p
+                for p, n in sorted(self.nodes.items())
+                if node_type is None or n["type"] == node_type
+            ]
+        if pattern is None:
+            return paths
+
+        # like Maya, a "*" doesn't match the namespace separators
+        regex = re.compile("^{}$".format(re.escape(pattern).replace("\\*", "[^:|]*")))
+        return [p for p in paths if regex.match(p.rsplit("|", 1)[-1])]
+
+    # pymel.core
+    def pm_ls(self, *args, **kwargs):
+        self._log("pm.ls", args, kwargs)
+        node_type = kwargs.pop("type", None)
+        return [
+            FakePyNode(self, p) for p in self._ls(*args, node_type=node_type, **kwargs)
+        ]
+
+    def pm_namespace_info(self, *args, **kwargs):
+        self._log("pm.namespaceInfo", args, kwargs)
+        return self.DEFAULT_NAMESPACES + self.namespaces()
+
+    def pm_add_attr(self, node, longName=None, at=None, **kwargs):
+        self._log("pm.addAttr", node, longName)
+        self.nodes[node._path]["attrs"].setdefault(longName, 0)
+
+    def pm_py_node(self, name):
+        self._log("pm.PyNode", name)
+        return FakePyNode(self, name)
+
+    # maya.cmds
+    def cmds_namespace(self, *args, **kwargs):
+        self._log("cmds.namespace", args, kwargs)
+
+    def cmds_ls(self, *args, **kwargs):
+        self._log("cmds.ls", args, kwargs)
+        if args and isinstance(args[0], (list, tuple)):
+            return self._ls_names(args[0], kwargs.get("objectsOnly"))
+        node_type = kwargs.pop("type", None)
+        return self._ls(*args, node_type=node_type, **kwargs)
+
+    def _ls_names(self, names, objects_only=False):
+        """
+        The existing nodes and plugs of a list of long names, like ``ls`` does.
+        """
+        result = []
+        for name in names:
+            node, _, attr = name.partition(".")
+            if node not in self.nodes:
+                continue
+            if attr and attr not in self.nodes[node]["attrs"]:
+                continue
+            result.append(node if objects_only else name)
+        return result
+
+    def cmds_add_attr(self, *objects, **kwargs):
+        self._log("cmds.addAttr", objects, kwargs)
+        self._check_undo_chunk()
+        for name in objects:
+            self.nodes[name]["attrs"].setdefault(kwargs["longName"], 0)
+
+    def cmds_set_attr(self, plug, value):
+        self._log("cmds.setAttr", plug, value)
+        self._check_undo_chunk()
+        node, attr = plug.split(".")
+        if attr not in self.nodes[node]["attrs"]:
+            raise RuntimeError("No object matches name: {}".format(plug))
+        self.nodes[node]["attrs"][attr] = value
+
+    def cmds_get_attr(self, plug):
+        self._log("cmds.getAttr", plug)
+        node, attr = plug.split(".")
+        return self.nodes[node]["attrs"][attr]
+
+    def cmds_undo_info(self, openChunk=False, closeChunk=False, chunkName=None):
+        self._log("cmds.undoInfo", openChunk, closeChunk, chunkName)
+        if openChunk:
+            self.undo_chunks += 1
+            self._open_chunks += 1
+        if closeChunk:
+            self._open_chunks -= 1
+
+    def _check_undo_chunk(self):
+        if self.require_undo_chunk and not self._open_chunks:
+            raise AssertionError("Scene change outside an undo chunk")
+
+    def install(self):
+        """
+        Register the fake Maya modules, replacing the ones already imported.
+        """
+        cmds = types.ModuleType("maya.cmds")
+        cmds.namespace = self.cmds_namespace
+        cmds.ls = self.cmds_ls
+        cmds.addAttr = self.cmds_add_attr
+        cmds.setAttr = self.cmds_set_attr
+        cmds.getAttr = self.cmds_get_attr
+        cmds.undoInfo = self.cmds_undo_info
+
+        mel = types.ModuleType("maya.mel")
+        maya = types.ModuleType("maya")
+        maya.cmds = cmds
+        maya.mel = mel
+
+        core = types.ModuleType("pymel.core")
+        core.ls = self.pm_ls
+        core.namespaceInfo = self.pm_namespace_info
+        core.addAttr = self.pm_add_attr
+        core.PyNode = self.pm_py_node
+        pymel = types.ModuleType("pymel")
+        pymel.core = core
+
+        scene = self
+
+        class MSceneMessage(object):
+            @staticmethod
+            def addCallback(message, function, client_data=None):
+                return scene._add_callback("scene", message, function)
+
+        for message in self.SCENE_MESSAGES:
+            setattr(MSceneMessage, message, message)
+
+        class MDGMessage(object):
+            @staticmethod
+            def addNodeAddedCallback(
+                function, node_type="dependNode", client_data=None
+            ):
+                return scene._add_callback("added", node_type, function)
+
+            @staticmethod
+            def addNodeRemovedCallback(
+                function, node_type="dependNode", client_data=None
+            ):
+                return scene._add_callback("removed", node_type, function)
+
+        class MMessage(object):
+            @staticmethod
+            def removeCallbacks(ids):
+                for callback_id in ids:
+                    del scene.callbacks[callback_id]
+
+        class MFnDependencyNode(object):
+            # the fake MObjects are the long names
+            def __init__(self, node):
+                self._node = node
+
+            def name(self):
+                return self._node.rsplit("|", 1)[-1]
+
+        class MPlug(object):
+            def __init__(self, plug):
+                self._plug = plug
+
+            def asInt(self):
+                node, attr = self._plug.split(".")
+                return int(scene.nodes[node]["attrs"][attr])
+
+        class MSelectionList(object):
+            def __init__(self):
+                self._items = []
+
+            def add(self, name):
+                node, _, attr = name.partition(".")
+                if node not in scene.nodes or (
+                    attr and attr not in scene.nodes[node]["attrs"]
+                ):
+                    raise RuntimeError("(kInvalidParameter): Object does not exist")
+                self._items.append(name)
+                return self
+
+            def length(self):
+                return len(self._items)
+
+            def getPlug(self, index):
+                return MPlug(self._items[index])
+
+        open_maya = types.ModuleType("maya.api.OpenMaya")
+        open_maya.MSelectionList = MSelectionList
+        open_maya.MSceneMessage = MSceneMessage
+        open_maya.MDGMessage = MDGMessage
+        open_maya.MMessage = MMessage
+        open_maya.MFnDependencyNode = MFnDependencyNode
+        api = types.ModuleType("maya.api")
+        api.OpenMaya = open_maya
+        maya.api = api
+
+        modules = {
+            "maya": maya,
+            "maya.cmds": cmds,
+            "maya.mel": mel,
+            "maya.api": api,
+            "maya.api.OpenMaya": open_maya,
+            "pymel": pymel,
+            "pymel.core": core,
+        }
+        for name, module in modules.items():
+            self._modules[name] = sys.modules.get(name)
+            sys.modules[name] = module
+        return self
+
+    def uninstall(self):
+        for name, module in self._modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        self._modules = {}
@@ -0,0 +1,269 @@
+import copy
+import datetime
+import itertools
+import time
+
+
+class FakeShotgun(object):
+    """
+    A small in-memory stand-in for ``shotgun_api3.Shotgun`` used by the offline tests.
+
+    It supports the subset of the Shotgun API used by the framework and keeps a log of every
+    call in ``calls`` so the tests can count the round trips.
+    """
+
+    class Config(object):
+        records_per_page = 500
+
+    def __init__(self, latency=0):
+        self.config = self.Config()
+        self._records = {}
+        self._ids = itertools.count(1)
+        self.calls = []
+        self.latency = latency
+        self.closed = False
+        self._faults = {}
+        self._schema = {}
+
+    def clone(self):
+        """
+        Create a new connection to the same fake database.
+        """
+        sg = FakeShotgun(self.latency)
+        sg._records = self._records
+        sg._ids = self._ids
+        return sg
+
+    def inject_fault(self, method, error, count=1):
+        """
+        Make the next ``count`` calls of ``method`` raise ``error``, after being logged.
+        """
+        self._faults.setdefault(method, []).extend([error] * count)
+
+    def _log(self, method, *args):
+        self.calls.append((method,) + args)
+        if self.latency:
+            time.sleep(self.latency)
+        faults = self._faults.get(method)
+        if faults:
+            raise faults.pop(0)
+
+    def count(self, method):
+        return len([c for c in self.calls if c[0] == method])
+
+    @staticmethod
+    def _is_entity(value):
+        return isinstance(value, dict) and "type" in value and "id" in value
+
+    def _compare(self, value, other):
+        if self._is_entity(value) and self._is_entity(other):
+            return value["type"] == other["type"] and value["id"] == other["id"]
+        return value == other
+
+    def _match(self, record, entity_filter):
+        if isinstance(entity_filter, dict):
+            operator = entity_filter.get("filter_operator", "all")
+            results = [self._match(record, f) for f in entity_filter["filters"]]
+            return any(results) if operator == "any" else all(results)
+
+        field, relation, value = entity_filter[0], entity_filter[1], entity_filter[2:]
+        value = value[0] if len(value) == 1 else value
+        current = record.get(field)
+        if relation == "is":
+            return self._compare(current, value)
+        if relation == "is_not":
+            return not self._compare(current, value)
+        if isinstance(value, frozenset):
+            found = current in value
+            return found if relation == "in" else not found
+        if relation == "in":
+            return any(self._compare(current, v) for v in value)
+        if relation == "not_in":
+            return not any(self._compare(current, v) for v in value)
+        if relation == "greater_than":
+            return current is not None and current > value
+        if relation == "less_than":
+            return current is not None and current < value
+        raise ValueError("Unsupported filter relation: {}".format(relation))
+
+    def _compile(self, filters):
+        """
+        Replace the values of the ``in`` filters without entities by sets, so large id lists are
+        matched in constant time.
+        """
+        result = []
+        for entity_filter in filters:
+            if isinstance(entity_filter, dict):
+                entity_filter = dict(
+                    entity_filter, filters=self._compile(entity_filter["filters"])
+                )
+            elif (
+                entity_filter[1] in ("in", "not_in")
+                and len(entity_filter) == 3
+                and isinstance(entity_filter[2], (list, tuple))
+                and not any(isinstance(v, dict) for v in entity_filter[2])
+            ):
+                entity_filter = [
+                    entity_filter[0],
+                    entity_filter[1],
+                    frozenset(entity_filter[2]),
+                ]
+            result.append(entity_filter)
+        return result
+
+    def _format(self, record, fields):
+        data = {"type": record["type"], "id": record["id"]}
+        for field in fields or []:
+            data[field] = copy.deepcopy(record.get(field))
+        return data
+
+    def add(self, entity_type, data):
+        """
+        Add a record without logging the call, used to fill the fake database.
+        """
+        record = copy.deepcopy(data)
+        record.update({"type": entity_type, "id": next(self._ids)})
+        record.setdefault("updated_at", datetime.datetime.now())
+        self._records.setdefault(entity_type, {})[record["id"]] = record
+        return record
+
+    def find(
+        self,
+        entity_type,
+        filters,
+        fields=None,
+        order=None,
+        filter_operator=None,
+        limit=0,
+        retired_only=False,
+        page=0,
+    ):
+        self._log("find", entity_type, filters, fields)
+        entity_filter = {
+            "filter_operator": filter_operator or "all",
+            "filters": self._compile(filters),
+        }
+        records = [
+            r
+            for _, r in sorted(self._records.get(entity_type, {}).items())
+            if self._match(r, entity_filter)
+        ]
+        if limit:
+            # like Shotgun, never more than records_per_page entities by page
+            limit = min(limit, self.config.records_per_page)
+            page = page or 1
+            records = records[(page - 1) * limit : page * limit]
+        return [self._format(r, fields) for r in records]
+
+    def find_one(self, entity_type, filters, fields=None, **kwargs):
+        self._log("find_one", entity_type, filters, fields)
+        entity_filter = {"filter_operator": "all", "filters": filters}
+        for _, record in sorted(self._records.get(entity_type, {}).items()):
+            if self._match(record, entity_filter):
+                return self._format(record, fields)
+        return None
+
+    def _create(self, entity_type, data, return_fields=None):
+        record = self.add(entity_type, data)
+        return self._format(record, list(data.keys()) + list(return_fields or []))
+
+    def _update(self, entity_type, entity_id, data):
+        record = self._records[entity_type][entity_id]
+        record.update(copy.deepcopy(data))
+        record["updated_at"] = datetime.datetime.now()
+        return self._format(record, list(data.keys()))
+
+    def create(self, entity_type, data, return_fields=None):
+        self._log("create", entity_type, data)
+        return self._create(entity_type, data, return_fields)
+
+    def update(self, entity_type, entity_id, data, multi_entity_update_modes=None):
+        self._log("update", entity_type, entity_id, data)
+        return self._update(entity_type, entity_id, data)
+
+    def delete(self, entity_type, entity_id):
+        self._log("delete", entity_type, entity_id)
+        return self._records.get(entity_type, {}).pop(entity_id, None) is not None
+
+    def batch(self, requests):
+        """
+        Run all requests in a transaction, nothing is committed when one of them fails.
+        """
+        self._log("batch", requests)
+        # the previous state of the records changed, only those are restored on failure
+        undo = []
+        results = []
+        try:
+            for request in requests:
+                entity_type = request["entity_type"]
+                if request["request_type"] == "create":
+                    result = self._create(
+                        entity_type, request["data"], request.get("return_fields")
+                    )
+                    undo.append((entity_type, result["id"], None))
+                elif request["request_type"] == "update":
+                    entity_id = request["entity_id"]
+                    record = self._records[entity_type][entity_id]
+                    undo.append((entity_type, entity_id, copy.deepcopy(record)))
+                    result = self._update(entity_type, entity_id, request["data"])
+                elif request["request_type"] == "delete":
+                    entity_id = request["entity_id"]
+                    record = self._records[entity_type].pop(entity_id)
+                    undo.append((entity_type, entity_id, record))
+                    result = True
+                else:
+                    raise ValueError(
+                        "Unsupported request type: {}".format(request["request_type"])
+                    )
+                results.append(result)
+        except Exception:
+            for entity_type, entity_id, record in reversed(undo):
+                if record is None:
+                    del self._records[entity_type][entity_id]
+                else:
+                    self._records[entity_type][entity_id] = record
+            raise
+        return results
+
+    def add_field(
+        self,
+        entity_type,
+        field,
+        data_type,
+        editable=True,
+        valid_types=None,
+        valid_values=None,
+    ):
+        """
+        Add a field to the schema returned by ``schema_read`` and ``schema_field_read``.
+        """
+        properties = {}
+        if valid_types is not None:
+            properties["valid_types"] = {"value": valid_types}
+        if valid_values is not None:
+            properties["valid_values"] = {"value": valid_values}
+        self._schema.setdefault(entity_type, {})[field] = {
+            "data_type": {"value": data_type},
+            "editable": {"value": editable},
+            "properties": properties,
+        }
+
+    def schema_read(self):
+        self._log("schema_read")
+        return copy.deepcopy(self._schema)
+
+    def schema_field_read(self, entity_type, field_name=None):
+        self._log("schema_field_read", entity_type, field_name)
+        fields = copy.deepcopy(self._schema.get(entity_type, {}))
+        if field_name is not None:
+            return {field_name: fields[field_name]}
+        return fields
+
+    def info(self):
+        self._log("info")
+        if self.closed:
+            raise RuntimeError("The connection is closed")
+        return {"version": [8, 0, 0]}
+
+    def close(self):
+        self.closed = True
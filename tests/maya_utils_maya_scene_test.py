@@ -0,0 +1,227 @@
+import os
+import sys
+import unittest
+
+
+class MayaBaseTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if os.getenv("TK_FRAMEWORK_CONSULADOUTILS") not in sys.path:
+            sys.path.insert(0, os.getenv("TK_FRAMEWORK_CONSULADOUTILS"))
+
+        from python import maya_utils
+
+        cls.maya_utils = maya_utils
+
+    def setUp(self):
+        from tests.fake_maya import FakeMaya
+
+        self.maya = FakeMaya().install()
+
+    def tearDown(self):
+        self.maya.uninstall()
+
+    def add_asset(self, namespace, count, group="render_grp"):
+        prefix = namespace + ":" if namespace else ""
+        return [
+            self.maya.add_mesh("|{0}root|{0}{1}|{0}geo_{2}".format(prefix, group, i))
+            for i in range(count)
+        ]
+
+    def paths(self, asset):
+        return sorted(geo.fullPath() for geo in asset)
+
+
+class MayaSceneTests(MayaBaseTests):
+    def test_exact_namespaces(self):
+        local = self.add_asset("", 2)
+        chair = self.add_asset("chair", 3)
+        # a nested namespace isn't part of the parent one
+        table = self.add_asset("chair:table", 2)
+        chair_1 = self.add_asset("chair1", 1)
+
+        scene = self.maya_utils.MayaScene()
+        assets = dict((asset.namespace, asset) for asset in scene)
+
+        self.assertEqual(len(scene), 4)
+        self.assertEqual(self.paths(assets[""]), sorted(local))
+        self.assertFalse(assets[""].is_reference)
+        self.assertEqual(self.paths(assets["chair"]), sorted(chair))
+        self.assertEqual(self.paths(assets["chair:table"]), sorted(table))
+        self.assertEqual(self.paths(assets["chair1"]), sorted(chair_1))
+        self.assertTrue(assets["chair"].is_reference)
+
+    def test_render_grp_membership(self):
+        self.add_asset("chair", 2)
+        self.add_asset("chair", 2, group="render_grp_old")
+        self.add_asset("lamp", 2, group="proxy_grp")
+        self.maya.add_mesh(
+            "|chair:root|chair:render_grp|chair:hidden", intermediate=True
+        )
+
+        scene = self.maya_utils.MayaScene()
+        self.assertEqual([asset.namespace for asset in scene], ["chair"])
+        self.assertEqual(len(list(scene)[0]), 2)
+
+    def test_order_and_find_asset(self):
+        self.add_asset("b", 1)
+        self.add_asset("a", 1)
+        self.add_asset("", 1)
+
+        scene = self.maya_utils.MayaScene()
+        self.assertEqual([asset.namespace for asset in scene], ["", "a", "b"])
+        self.assertEqual(len(scene.find_asset("b")), 1)
+        self.assertEqual(scene.find_asset().namespace, "")
+        self.assertIsNone(scene.find_asset("missing"))
+
+    def add_layout(self):
+        namespaces = ["asset_{}".format(i) for i in range(300)]
+        for namespace in namespaces:
+            self.add_asset(namespace, 10)
+        self.add_asset("asset_0:nested", 10)
+
+    def test_single_scan(self):
+        self.add_layout()
+        scene = self.maya_utils.MayaScene(backend="pymel")
+
+        self.assertEqual(len(scene), 301)
+        self.assertTrue(all(len(asset) == 10 for asset in scene))
+        self.assertEqual(self.maya.count("pm.ls"), 1)
+        self.assertEqual(self.maya.count("PyNode.fullPath"), 3010)
+        self.assertEqual(self.maya.count("PyNode.namespace"), 0)
+
+    def test_cmds_backend(self):
+        self.add_layout()
+        scene = self.maya_utils.MayaScene()
+
+        self.assertEqual(len(scene), 301)
+        self.assertEqual(self.maya.count("cmds.ls"), 1)
+        self.assertEqual(self.maya.count("pm.ls"), 0)
+        self.assertEqual(self.maya.count("pm.PyNode"), 0)
+
+        asset = scene.find_asset("asset_0:nested")
+        self.assertEqual(
+            asset.geometry_names[0],
+            "|asset_0:nested:root|asset_0:nested:render_grp|asset_0:nested:geo_0",
+        )
+        self.assertEqual(self.maya.count("pm.PyNode"), 0)
+
+        # the PyNodes are only built when the geometries are iterated
+        geos = list(asset)
+        self.assertEqual(self.maya.count("pm.PyNode"), 10)
+        self.assertEqual([g.fullPath() for g in geos], asset.geometry_names)
+        list(asset)
+        self.assertEqual(self.maya.count("pm.PyNode"), 10)
+
+    def test_backends_match(self):
+        self.add_layout()
+        self.maya.add_mesh("|lamp:root|lamp:proxy_grp|lamp:geo")
+        cmds_scene = self.maya_utils.MayaScene()
+        pymel_scene = self.maya_utils.MayaScene(backend="pymel")
+
+        self.assertEqual(
+            [(a.namespace, a.geometry_names) for a in cmds_scene],
+            [(a.namespace, a.geometry_names) for a in pymel_scene],
+        )
+        self.assertEqual(cmds_scene.mesh_shape_names, pymel_scene.mesh_shape_names)
+        self.assertEqual(
+            cmds_scene.no_intermediate_mesh_shapes,
+            pymel_scene.no_intermediate_mesh_shapes,
+        )
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            self.maya_utils.MayaScene(backend="api")
+
+
+class LazyMayaSceneTests(MayaBaseTests):
+    def setUp(self):
+        super(LazyMayaSceneTests, self).setUp()
+        self.add_asset("", 2)
+        for i in range(50):
+            self.add_asset("asset_{}".format(i), 5)
+        self.scene = self.maya_utils.MayaScene(lazy=True)
+
+    def tearDown(self):
+        self.scene.unwatch()
+        super(LazyMayaSceneTests, self).tearDown()
+
+    def namespaces(self):
+        return [asset.namespace for asset in self.scene]
+
+    def test_scanned_on_first_request(self):
+        self.assertEqual(self.maya.count("cmds.ls"), 0)
+        self.assertFalse(self.scene.is_watching)
+
+        self.assertEqual(len(self.scene), 51)
+        self.assertEqual(self.maya.count("cmds.ls"), 1)
+        self.assertTrue(self.scene.is_watching)
+
+        list(self.scene)
+        self.scene.find_asset("asset_1")
+        self.assertEqual(self.maya.count("cmds.ls"), 1)
+
+    def test_reference_loaded_and_unloaded(self):
+        list(self.scene)
+        asset_1 = self.scene.find_asset("asset_1")
+        self.maya.calls = []
+
+        geos = self.maya.load_reference("chair", 3)
+        self.maya.load_reference("chair:table", 2)
+        chair = self.scene.find_asset("chair")
+
+        self.assertEqual(chair.geometry_names, geos)
+        self.assertEqual(len(self.scene.find_asset("chair:table")), 2)
+        self.assertEqual(len(self.scene), 53)
+        # only the changed namespaces are scanned, with the other assets kept as they were
+        self.assertEqual(
+            sorted(c[1] for c in self.maya.calls if c[0] == "cmds.ls"),
+            [("chair:*",), ("chair:table:*",)],
+        )
+        self.assertIs(self.scene.find_asset("asset_1"), asset_1)
+
+        self.maya.unload_reference("chair")
+        self.assertIsNone(self.scene.find_asset("chair"))
+        self.assertEqual(len(self.scene.find_asset("chair:table")), 2)
+        self.assertEqual(len(self.scene), 52)
+
+    def test_node_added_and_removed(self):
+        list(self.scene)
+        self.maya.add_mesh("|asset_2:root|asset_2:render_grp|asset_2:extra")
+        self.assertEqual(len(self.scene.find_asset("asset_2")), 6)
+
+        self.maya.remove("|asset_3:root")
+        self.assertNotIn("asset_3", self.namespaces())
+
+        self.maya.add_mesh("|root|render_grp|extra")
+        self.assertEqual(len(self.scene.find_asset()), 3)
+        self.assertEqual(self.maya.count("cmds.ls"), 4)
+
+    def test_new_scene(self):
+        list(self.scene)
+        self.maya.new_scene()
+        self.assertEqual(len(self.scene), 0)
+        self.assertTrue(self.scene.is_watching)
+
+    def test_unwatch(self):
+        with self.maya_utils.MayaScene(lazy=True) as scene:
+            list(scene)
+            self.assertTrue(scene.is_watching)
+        self.assertFalse(scene.is_watching)
+        self.assertEqual(len(self.maya.callbacks), 0)
+
+        list(self.scene)
+        self.scene.unwatch()
+        self.maya.load_reference("chair", 3)
+        self.assertIsNone(self.scene.find_asset("chair"))
+        self.assertEqual(len(self.maya.callbacks), 0)
+
+    def test_not_watching_when_not_lazy(self):
+        scene = self.maya_utils.MayaScene()
+        self.assertFalse(scene.is_watching)
+        self.maya.load_reference("chair", 3)
+        self.assertIsNone(scene.find_asset("chair"))
+
+
+if __name__ == "__main__":
+    unittest.main()
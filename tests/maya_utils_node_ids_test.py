@@ -0,0 +1,111 @@
+import unittest
+from tests.maya_utils_maya_scene_test import MayaBaseTests
+
+
+class NodeIdsTests(MayaBaseTests):
+    def setUp(self):
+        super(NodeIdsTests, self).setUp()
+        self.maya.require_undo_chunk = True
+        self.chair = self.add_asset("chair", 4)
+        self.lamp = self.add_asset("lamp", 2)
+        for node_id, geo in enumerate(self.chair[:2], 100):
+            self.maya.nodes[geo]["attrs"]["cNodeId"] = node_id
+        self.maya.nodes[self.chair[2]]["attrs"]["cNodeId"] = 0
+        self.scene = self.maya_utils.MayaScene()
+
+    def test_read(self):
+        chair = self.scene.find_asset("chair")
+        self.maya.calls = []
+
+        self.assertEqual(
+            chair.read_node_ids(),
+            {
+                self.chair[0]: 100,
+                self.chair[1]: 101,
+                self.chair[2]: 0,
+                self.chair[3]: None,
+            },
+        )
+        self.assertEqual(chair.node_id_map(), {100: self.chair[0], 101: self.chair[1]})
+        self.assertEqual(chair.node_ids, [100, 101, 0])
+        self.assertEqual(chair.node_filter(), [["id", "in", [100, 101]]])
+        self.assertEqual(self.maya.count("cmds.getAttr"), 0)
+        self.assertEqual(self.maya.count("pm.PyNode"), 0)
+
+        self.assertEqual(
+            [g.fullPath() for g in chair.geos_without_sg_ids], [self.chair[3]]
+        )
+
+    def test_scene_read(self):
+        self.maya.calls = []
+        self.assertEqual(
+            self.scene.node_id_map(), {100: self.chair[0], 101: self.chair[1]}
+        )
+        self.assertEqual(len(self.scene.read_node_ids()), 6)
+        self.assertEqual(self.maya.count("cmds.ls"), 2)
+
+    def test_create_sg_attr(self):
+        added = self.scene.create_sg_attr()
+
+        self.assertEqual(sorted(added), sorted(self.chair[3:] + self.lamp))
+        self.assertEqual(self.maya.count("cmds.addAttr"), 1)
+        self.assertEqual(self.maya.undo_chunks, 1)
+        self.assertEqual(self.scene.find_asset("lamp").node_ids, [0, 0])
+        # the existing values are kept
+        self.assertEqual(self.scene.find_asset("chair").node_ids, [100, 101, 0, 0])
+
+        self.assertEqual(self.scene.create_sg_attr(), [])
+        self.assertEqual(self.maya.undo_chunks, 1)
+
+    def test_write(self):
+        lamp = self.scene.find_asset("lamp")
+        geos = list(lamp)
+        added = lamp.write_node_ids(
+            {geos[0]: 200, self.lamp[1]: {"type": "CustomEntity05", "id": 201}}
+        )
+
+        self.assertEqual(sorted(added), sorted(self.lamp))
+        self.assertEqual(lamp.node_id_map(), {200: self.lamp[0], 201: self.lamp[1]})
+        self.assertEqual(self.maya.count("cmds.addAttr"), 1)
+        self.assertEqual(self.maya.undo_chunks, 1)
+
+    def test_link_nodes(self):
+        from python.shotgun_model import shotgun_model
+        from tests.base_test_class import ContextMock
+        from tests.fake_shotgun import FakeShotgun
+
+        sg = FakeShotgun()
+        for code in ("seat", "leg"):
+            sg.add("CustomEntity05", {"code": code, "project": ContextMock.project})
+        for geo, node in zip(self.chair, sg.find("CustomEntity05", [], [])):
+            self.maya.nodes[geo]["attrs"]["cNodeId"] = node["id"]
+
+        nodes = shotgun_model.EntityIter(
+            self.maya_utils.MayaScene.NODE_ENTITY_TYPE, ["code"], ContextMock(), sg
+        )
+        nodes.load(self.scene.node_filter())
+        links = self.scene.link_nodes(nodes)
+
+        self.assertEqual(
+            dict((geo, node.code) for geo, node in links.items()),
+            {self.chair[0]: "seat", self.chair[1]: "leg"},
+        )
+        self.assertEqual(sg.count("find"), 2)
+
+    def test_large_asset(self):
+        geos = self.add_asset("crowd", 20000)
+        crowd = self.maya_utils.MayaScene().find_asset("crowd")
+        self.maya.calls = []
+
+        crowd.create_sg_attr()
+        crowd.write_node_ids(dict((geo, i + 1) for i, geo in enumerate(geos)))
+        self.assertEqual(len(crowd.node_id_map()), 20000)
+
+        self.assertEqual(self.maya.count("cmds.addAttr"), 1)
+        self.assertEqual(self.maya.undo_chunks, 2)
+        self.assertEqual(self.maya.count("cmds.ls"), 3)
+        self.assertEqual(self.maya.count("pm.PyNode"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
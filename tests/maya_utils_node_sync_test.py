@@ -0,0 +1,171 @@
+import unittest
+from tests.maya_utils_maya_scene_test import MayaBaseTests
+
+
+class NodeSyncTests(MayaBaseTests):
+    def setUp(self):
+        super(NodeSyncTests, self).setUp()
+        from tests.base_test_class import ContextMock
+        from tests.fake_shotgun import FakeShotgun
+
+        self.context = ContextMock()
+        self.sg = FakeShotgun()
+        self.scene_entity = self.sg.add("CustomEntity04", {"code": "layout"})
+        self.chair_namespace = self.sg.add("CustomEntity03", {"code": "chair"})
+        self.chair = self.add_asset("chair", 3)
+        self.lamp = self.add_asset("lamp", 2)
+
+    def new_sync(self, **kwargs):
+        kwargs.setdefault("scene_entity", self.scene_entity)
+        kwargs.setdefault("namespaces", {"chair": self.chair_namespace})
+        return self.maya_utils.NodeSync(
+            self.maya_utils.MayaScene(), self.context, self.sg, **kwargs
+        )
+
+    def nodes(self):
+        return self.sg.find("CustomEntity05", [], ["code", "sg_scene", "sg_namespace"])
+
+    def node_id(self, geo):
+        return self.maya.nodes[geo]["attrs"].get("cNodeId")
+
+    def test_first_sync(self):
+        sync = self.new_sync()
+        diff = sync.diff()
+        self.assertEqual(len(diff.new), 5)
+        self.assertFalse(diff.changed or diff.orphaned)
+
+        result = sync.apply(diff)
+        self.assertEqual(len(result["created"]), 5)
+        self.assertEqual(result["errors"], [])
+
+        nodes = dict((n["id"], n) for n in self.nodes())
+        self.assertEqual(len(nodes), 5)
+        seat = nodes[self.node_id(self.chair[0])]
+        self.assertEqual(seat["code"], "geo_0")
+        self.assertEqual(seat["sg_scene"]["id"], self.scene_entity["id"])
+        self.assertEqual(seat["sg_namespace"]["id"], self.chair_namespace["id"])
+        self.assertIsNone(nodes[self.node_id(self.lamp[0])]["sg_namespace"])
+        self.assertEqual(self.maya.undo_chunks, 1)
+
+        self.assertFalse(self.new_sync().diff())
+
+    def test_changed_and_orphaned(self):
+        self.new_sync().apply()
+        chair_0 = self.node_id(self.chair[0])
+        self.sg._records["CustomEntity05"][chair_0]["code"] = "old_name"
+        lamp_ids = sorted(self.node_id(geo) for geo in self.lamp)
+        self.maya.remove("|lamp:root")
+
+        diff = self.new_sync().diff()
+        self.assertEqual(
+            [(node.id, changes) for node, changes in diff.changed],
+            [(chair_0, {"code": "geo_0"})],
+        )
+        self.assertEqual(sorted(node.id for node in diff.orphaned), lamp_ids)
+        self.assertEqual(len(diff.new), 0)
+
+        diff = self.new_sync().diff()
+        result = self.new_sync().apply(diff, delete_orphans=True)
+        self.assertEqual([node.id for node in result["updated"]], [chair_0])
+        self.assertEqual(len(result["deleted"]), 2)
+        self.assertEqual(len(self.nodes()), 3)
+        self.assertEqual(len(diff.nodes), 3)
+        self.assertIsNone(diff.nodes.get_by("id", lamp_ids[0]))
+        self.assertEqual(self.sg._records["CustomEntity05"][chair_0]["code"], "geo_0")
+
+        self.assertFalse(self.new_sync().diff())
+
+    def test_orphans_kept_by_default(self):
+        self.new_sync().apply()
+        self.maya.remove("|lamp:root")
+        result = self.new_sync().apply()
+        self.assertEqual(result["deleted"], [])
+        self.assertEqual(len(self.nodes()), 5)
+
+    def test_duplicated_and_unknown_ids(self):
+        self.new_sync().apply()
+        # a duplicated geometry keeps the id of the original one
+        copy = self.maya.add_mesh("|chair:root|chair:render_grp|chair:geo_3")
+        self.maya.nodes[copy]["attrs"]["cNodeId"] = self.node_id(self.chair[0])
+        unknown = self.maya.add_mesh("|chair:root|chair:render_grp|chair:geo_4")
+        self.maya.nodes[unknown]["attrs"]["cNodeId"] = 9999
+
+        sync = self.new_sync()
+        diff = sync.diff()
+        self.assertEqual(sorted(name for name, _ in diff.new), [copy, unknown])
+
+        sync.apply(diff)
+        ids = [self.node_id(geo) for geo in self.chair + [copy, unknown]]
+        self.assertEqual(len(set(ids)), 5)
+        self.assertNotIn(9999, ids)
+
+    def test_nodes_of_another_scene(self):
+        other_scene = self.sg.add("CustomEntity04", {"code": "animation"})
+        self.new_sync(scene_entity=other_scene).apply()
+        other_ids = sorted(self.node_id(geo) for geo in self.chair + self.lamp)
+
+        # the geometries imported from the other scene keep the ids of its entities
+        diff = self.new_sync().diff()
+        self.assertEqual(len(diff.new), 5)
+        self.assertFalse(diff.changed or diff.orphaned)
+
+        result = self.new_sync().apply(diff, delete_orphans=True)
+        self.assertEqual(len(result["created"]), 5)
+        self.assertEqual(result["deleted"], [])
+        self.assertEqual(len(self.nodes()), 10)
+        self.assertTrue(
+            all(
+                node["sg_scene"]["id"] == other_scene["id"]
+                for node in self.nodes()
+                if node["id"] in other_ids
+            )
+        )
+        self.assertFalse(set(other_ids) & set(self.node_id(g) for g in self.chair))
+
+    def test_custom_attributes(self):
+        def attributes(asset, name):
+            return {"code": name.rsplit("|", 1)[-1], "sg_asset": asset.namespace}
+
+        sync = self.new_sync(
+            scene_entity=None,
+            namespaces=None,
+            fields=["code", "sg_asset"],
+            attributes=attributes,
+        )
+        sync.apply()
+        codes = sorted(
+            (n["code"], n["sg_asset"])
+            for n in self.sg.find("CustomEntity05", [], ["code", "sg_asset"])
+        )
+        self.assertEqual(codes[0], ("chair:geo_0", "chair"))
+        self.assertEqual(len(codes), 5)
+
+    def test_batched(self):
+        self.add_asset("crowd", 2000)
+        sync = self.new_sync(batch_size=500)
+        sync.apply()
+        self.assertEqual(self.sg.count("find"), 1)
+        self.assertEqual(self.sg.count("batch"), 5)
+
+        self.sg.calls = []
+        self.maya.calls = []
+        self.assertFalse(self.new_sync().diff())
+        self.assertEqual(self.sg.count("find"), 1)
+        self.assertEqual(self.maya.count("cmds.getAttr"), 0)
+
+    def test_50k_nodes(self):
+        self.add_asset("crowd", 50000)
+
+        self.new_sync(batch_size=500).apply()
+        self.new_sync(batch_size=500).apply()
+
+        self.assertEqual(len(self.sg._records["CustomEntity05"]), 50005)
+        # 101 batches for the first sync, then no change
+        self.assertEqual(self.sg.count("batch"), 101)
+        self.assertEqual(self.sg.count("find"), 2)
+        self.assertEqual(self.maya.count("cmds.addAttr"), 1)
+        self.assertEqual(self.maya.undo_chunks, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
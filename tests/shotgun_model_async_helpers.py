@@ -0,0 +1,15 @@
+"""
+The coroutines of the asyncio tests, they're in their own module because the ``async`` syntax
+doesn't compile on python 2, it's only imported on python 3.7+.
+"""
+
+import asyncio
+
+
+async def collect(async_iterator):
+    return [item async for item in async_iterator]
+
+
+async def aload_all(models, executor):
+    await asyncio.gather(*[model.aload([], executor=executor) for model in models])
+    return models
@@ -0,0 +1,112 @@
+import sys
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+if sys.version_info >= (3, 7):
+    from tests import shotgun_model_async_helpers
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "asyncio front-end requires python 3.7")
+class AsyncModelTests(OfflineBaseClass):
+    def setUp(self):
+        super(AsyncModelTests, self).setUp()
+        from python.shotgun_model import AsyncExecutor
+
+        self.executor = AsyncExecutor(max_workers=4)
+        for i in range(5):
+            self._sg.add(
+                "Asset",
+                {"code": "Asset{}".format(i), "project": self._context.project},
+            )
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def new_assets(self, sg=None):
+        return self.shotgun_model.EntityIter(
+            "Asset", ["code"], self._context, sg or self._sg
+        )
+
+    def run_async(self, coroutine):
+        import asyncio
+
+        return asyncio.run(coroutine)
+
+    def test_aload(self):
+        assets = self.run_async(self.new_assets().aload([], executor=self.executor))
+        self.assertEqual(len(assets), 5)
+
+        asset = self.shotgun_model.Entity("Asset", ["code"], self._context, self._sg)
+        self.run_async(asset.aload([["code", "is", "Asset3"]], executor=self.executor))
+        self.assertEqual(asset.id, 4)
+
+    def test_astream(self):
+        stream = self.new_assets().astream([], page_size=2, executor=self.executor)
+        assets = self.run_async(shotgun_model_async_helpers.collect(stream))
+
+        self.assertEqual(
+            [asset.code for asset in assets], ["Asset{}".format(i) for i in range(5)]
+        )
+        self.assertEqual(self._sg.count("find"), 3)
+
+    def test_astream_page_size_above_records_per_page(self):
+        for i in range(5, 1200):
+            self._sg.add("Asset", {"code": "Asset{}".format(i)})
+
+        stream = self.new_assets().astream([], page_size=1000, executor=self.executor)
+        assets = self.run_async(shotgun_model_async_helpers.collect(stream))
+
+        self.assertEqual(len(assets), 1200)
+        self.assertEqual(self._sg.count("find"), 3)
+
+    def test_timeout_keeps_model_unchanged(self):
+        import asyncio
+
+        self._sg.latency = 0.2
+        assets = self.new_assets()
+        with self.assertRaises(asyncio.TimeoutError):
+            self.run_async(assets.aload([], timeout=0.01, executor=self.executor))
+        # the request still running on its thread doesn't change the model either
+        self.executor.shutdown()
+        self.assertEqual(len(assets), 0)
+        self.assertIsNone(assets._last_sync)
+
+    def test_aupdate_and_acreate(self):
+        assets = self.run_async(self.new_assets().aload([], executor=self.executor))
+        list(assets)[0].code = "Renamed"
+        errors = self.run_async(assets.aupdate(executor=self.executor, batch_size=1))
+        self.assertEqual(errors, [])
+        self.assertEqual(self._sg.count("batch"), 1)
+
+        new = assets.add_new_entity()
+        new.code = "New"
+        self.assertEqual(self.run_async(assets.acreate(executor=self.executor)), [])
+        self.assertTrue(new.id)
+
+        asset = self.shotgun_model.Entity("Asset", ["code"], self._context, self._sg)
+        asset.load([["id", "is", new.id]])
+        asset.code = "Renamed again"
+        data = self.run_async(asset.aupdate(executor=self.executor))
+        self.assertEqual(data["code"], "Renamed again")
+        self.assertEqual(
+            self._sg.find_one("Asset", [["id", "is", new.id]], ["code"])["code"],
+            "Renamed again",
+        )
+
+    def test_calls_in_flight(self):
+        import time
+        from python.shotgun_model import ConnectionPool
+
+        self._sg.latency = 0.1
+        pool = ConnectionPool(self._sg.clone, size=4)
+
+        models = [self.new_assets(pool) for _ in range(8)]
+
+        start = time.time()
+        self.run_async(shotgun_model_async_helpers.aload_all(models, self.executor))
+        self.assertTrue(all(len(m) == 5 for m in models))
+        self.assertLess(time.time() - start, 0.35)
+
+
+if __name__ == "__main__":
+    unittest.main()
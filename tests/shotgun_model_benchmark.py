@@ -0,0 +1,356 @@
+"""
+The offline benchmarks of the ``shotgun_model`` classes and of the ``maya_utils.NodeSync`` using them,
+run against the in-memory ``FakeShotgun`` and ``FakeMaya`` so their results only depend on the framework
+code and the machine.
+
+The results can be saved to a JSON file and compared with the ones of a previous run, the exit code
+is ``1`` when a result got worse than the tolerance.
+
+The ``--latency`` seconds are added to each Shotgun call, like the round trip to a Shotgun site, so the
+number of calls made by the model classes weighs on the results as well.
+
+For example::
+    export TK_FRAMEWORK_CONSULADOUTILS="$PWD"
+    python -m tests.shotgun_model_benchmark --rows 1000 10000 100000 --save benchmarks/main.json
+    python -m tests.shotgun_model_benchmark --rows 1000 10000 100000 --compare benchmarks/main.json
+    python -m tests.shotgun_model_benchmark --rows 1000 --latency 0.05
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+if os.getenv("TK_FRAMEWORK_CONSULADOUTILS") not in sys.path:
+    sys.path.insert(0, os.getenv("TK_FRAMEWORK_CONSULADOUTILS") or os.getcwd())
+
+from python.shotgun_model import shotgun_model, QueryCache, DiskCache
+from tests.base_test_class import ContextMock
+from tests.fake_shotgun import FakeShotgun
+
+FIELDS = ["code", "sg_asset_type", "description", "sg_namespace"]
+DEFAULT_ROWS = [1000, 10000, 100000]
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.2
+
+# the results where a bigger value is better, the others are durations or sizes
+HIGHER_IS_BETTER = ("hit_ratio", "speedup")
+
+
+def new_shotgun(rows, latency=0):
+    """
+    Create a ``FakeShotgun`` with ``rows`` assets, each of its calls takes ``latency`` seconds at least.
+    """
+    sg = FakeShotgun(latency)
+    namespaces = [
+        sg.add("CustomEntity03", {"code": "namespace_{}".format(i)}) for i in range(10)
+    ]
+    for i in range(rows):
+        sg.add(
+            "Asset",
+            {
+                "code": "asset_{}".format(i),
+                "sg_asset_type": ("Character", "Prop", "Set")[i % 3],
+                "description": "The description of the asset {}".format(i),
+                "sg_namespace": {
+                    "type": "CustomEntity03",
+                    "id": namespaces[i % 10]["id"],
+                },
+                "project": ContextMock.project,
+            },
+        )
+    return sg
+
+
+def new_assets(sg, **kwargs):
+    return shotgun_model.EntityIter("Asset", FIELDS, ContextMock(), sg, **kwargs)
+
+
+def best_time(function, repeat):
+    """
+    Returns:
+        The shortest duration of ``repeat`` calls, the least disturbed by the other processes.
+    """
+    durations = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.time()
+        function()
+        durations.append(time.time() - start)
+    return min(durations)
+
+
+def bench_load(sg, rows, repeat):
+    return {
+        "load.records.{}".format(rows): best_time(
+            lambda: new_assets(sg).load([]), repeat
+        ),
+        "load.columnar.{}".format(rows): best_time(
+            lambda: new_assets(sg, columnar=True).load([]), repeat
+        ),
+        "load.columnar_column.{}".format(rows): best_time(
+            lambda: _load_column(sg), repeat
+        ),
+    }
+
+
+def _load_column(sg):
+    assets = new_assets(sg, columnar=True)
+    assets.load([])
+    return assets.column("code")
+
+
+def bench_update(sg, rows, repeat):
+    def update():
+        assets = new_assets(sg)
+        assets.load([])
+        for asset in assets:
+            asset.code += "_v"
+        start = time.time()
+        assets.update()
+        return time.time() - start
+
+    return {"update.{}".format(rows): min(update() for _ in range(repeat))}
+
+
+def bench_create(rows, repeat, latency=0):
+    def create():
+        assets = new_assets(FakeShotgun(latency))
+        for i in range(rows):
+            assets.add_new_entity().code = "asset_{}".format(i)
+        start = time.time()
+        assets.create()
+        return time.time() - start
+
+    return {"create.{}".format(rows): min(create() for _ in range(repeat))}
+
+
+def bench_memory(sg, rows):
+    """
+    Measure the bytes allocated by entity, for the ``EntityRecord`` and ``Entity`` classes.
+    """
+    if tracemalloc is None:
+        return {}
+
+    sg_data = sg.find("Asset", [], FIELDS)
+
+    def measure(create):
+        gc.collect()
+        tracemalloc.start()
+        entities = create()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del entities
+        return float(size) / rows
+
+    def records():
+        owner = shotgun_model.EntityIter("Asset", list(FIELDS), ContextMock(), sg)
+        record_class = shotgun_model.entity_record_class("Asset", FIELDS)
+        entities = []
+        for row in sg_data:
+            entity = record_class(owner)
+            entity.add_sg_data(row)
+            entities.append(entity)
+        return entities
+
+    def entities():
+        result = []
+        for row in sg_data:
+            entity = shotgun_model.Entity("Asset", list(FIELDS), ContextMock(), sg)
+            entity.add_sg_data(row)
+            result.append(entity)
+        return result
+
+    return {
+        "memory.record.{}".format(rows): measure(records),
+        "memory.entity.{}".format(rows): measure(entities),
+    }
+
+
+def bench_cache(sg, rows):
+    """
+    Measure the time of a load with a cold and a warm cache, and the cache hit ratio.
+    """
+    results = {}
+    cache = QueryCache()
+    cold = best_time(lambda: new_assets(sg, cache=cache).load([]), 1)
+    warm = best_time(lambda: new_assets(sg, cache=cache).load([]), 3)
+    stats = cache.stats
+    results["cache.query.speedup.{}".format(rows)] = cold / max(warm, 1e-6)
+    results["cache.query.hit_ratio.{}".format(rows)] = float(stats["hits"]) / (
+        stats["hits"] + stats["misses"]
+    )
+
+    folder = tempfile.mkdtemp()
+    try:
+        cache = DiskCache(os.path.join(folder, "cache.sqlite"), refresh_interval=3600)
+        cold = best_time(lambda: new_assets(sg, cache=cache).load([]), 1)
+        warm = best_time(lambda: new_assets(sg, cache=cache).load([]), 3)
+        results["cache.disk.speedup.{}".format(rows)] = cold / max(warm, 1e-6)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return results
+
+
+def bench_node_sync(rows, repeat, latency=0):
+    """
+    Measure the ``maya_utils.NodeSync`` of a ``FakeMaya`` scene with ``rows`` geometries, the first sync
+    creating all their ``node`` entities and a second one without any change.
+    """
+    from python import maya_utils
+    from tests.fake_maya import FakeMaya
+
+    def sync():
+        maya = FakeMaya().install()
+        try:
+            for i in range(rows):
+                maya.add_mesh("|crowd:root|crowd:render_grp|crowd:geo_{}".format(i))
+            sg = FakeShotgun(latency)
+            durations = []
+            for _ in range(2):
+                start = time.time()
+                maya_utils.NodeSync(
+                    maya_utils.MayaScene(), ContextMock(), sg, batch_size=500
+                ).apply()
+                durations.append(time.time() - start)
+            return durations
+        finally:
+            maya.uninstall()
+
+    first, unchanged = zip(*[sync() for _ in range(repeat)])
+    return {
+        "node_sync.first.{}".format(rows): min(first),
+        "node_sync.unchanged.{}".format(rows): min(unchanged),
+    }
+
+
+def run(rows=None, repeat=None, latency=0):
+    """
+    Run all benchmarks.
+
+    Args:
+        rows(list): The numbers of entities of each run
+        repeat(int): The number of times each duration is measured, the shortest one is kept.
+        latency(float): The seconds taken by each ``FakeShotgun`` call at least
+
+    Returns:
+        A dict with the results by name, the durations are in seconds and the memory in bytes.
+    """
+    repeat = repeat or DEFAULT_REPEAT
+    results = {}
+    for count in rows or DEFAULT_ROWS:
+        sg = new_shotgun(count, latency)
+        results.update(bench_load(sg, count, repeat))
+        results.update(bench_update(sg, count, repeat))
+        results.update(bench_create(count, repeat, latency))
+        results.update(bench_memory(sg, count))
+        results.update(bench_cache(sg, count))
+        results.update(bench_node_sync(count, repeat, latency))
+    return results
+
+
+def compare(previous, current, tolerance=None):
+    """
+    Compare the results of two runs.
+
+    Args:
+        previous(dict): The results of the previous run
+        current(dict): The results of this run
+        tolerance(float): The relative change above which a result is a regression
+
+    Returns:
+        A list of ``(name, previous, current, change, regression)`` tuples, the change is relative to
+        the previous value and positive when the result got worse.
+    """
+    tolerance = tolerance if tolerance is not None else DEFAULT_TOLERANCE
+    rows = []
+    for name in sorted(set(previous) & set(current)):
+        before, after = previous[name], current[name]
+        if not before:
+            continue
+        change = (after - before) / float(before)
+        if any(key in name for key in HIGHER_IS_BETTER):
+            change = -change
+        rows.append((name, before, after, change, change > tolerance))
+    return rows
+
+
+def save(path, results, latency=0):
+    folder = os.path.dirname(path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "time": datetime.datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "latency": latency,
+                "results": results,
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--save", help="The JSON file where the results are saved")
+    parser.add_argument("--compare", help="The JSON file of a previous run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0,
+        help="The seconds added to each Shotgun call, like the round trip to a Shotgun site",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.repeat, args.latency)
+    for name in sorted(results):
+        print("{:<40} {:>14.6f}".format(name, results[name]))
+
+    if args.save:
+        save(args.save, results, args.latency)
+
+    if not args.compare:
+        return 0
+
+    regressions = 0
+    print("")
+    print(
+        "{:<40} {:>14} {:>14} {:>8}".format("compared", "previous", "current", "change")
+    )
+    for name, before, after, change, regression in compare(
+        load(args.compare), results, args.tolerance
+    ):
+        regressions += regression
+        print(
+            "{:<40} {:>14.6f} {:>14.6f} {:>+7.1f}%{}".format(
+                name, before, after, change * 100, "  REGRESSION" if regression else ""
+            )
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class BenchmarkTests(OfflineBaseClass):
+    def setUp(self):
+        super(BenchmarkTests, self).setUp()
+        from tests import shotgun_model_benchmark
+
+        self.benchmark = shotgun_model_benchmark
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def test_run(self):
+        results = self.benchmark.run(rows=[30], repeat=1)
+        self.assertIn("load.records.30", results)
+        self.assertIn("update.30", results)
+        self.assertIn("create.30", results)
+        self.assertIn("node_sync.first.30", results)
+        self.assertIn("node_sync.unchanged.30", results)
+        self.assertEqual(results["cache.query.hit_ratio.30"], 0.75)
+
+    def test_compare(self):
+        previous = {"load.records.10": 1.0, "cache.query.speedup.10": 10.0}
+        current = {"load.records.10": 1.5, "cache.query.speedup.10": 12.0}
+        rows = dict((r[0], r) for r in self.benchmark.compare(previous, current, 0.2))
+        self.assertTrue(rows["load.records.10"][4])
+        self.assertFalse(rows["cache.query.speedup.10"][4])
+
+    def test_save_and_compare(self):
+        path = os.path.join(self.folder, "results.json")
+        argv = ["--rows", "20", "--repeat", "1", "--save", path]
+        self.assertEqual(self.benchmark.main(argv), 0)
+        self.assertIn("load.columnar.20", self.benchmark.load(path))
+
+        argv = ["--rows", "5", "--repeat", "1", "--latency", "0.001", "--save", path]
+        self.assertEqual(self.benchmark.main(argv), 0)
+        with open(path) as f:
+            self.assertEqual(json.load(f)["latency"], 0.001)
+
+        # a previous run much faster than possible is a regression
+        self.benchmark.save(path, {"load.records.20": 1e-9})
+        argv = ["--rows", "20", "--repeat", "1", "--compare", path]
+        self.assertEqual(self.benchmark.main(argv), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
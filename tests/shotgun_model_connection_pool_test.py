@@ -0,0 +1,78 @@
+import threading
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class ConnectionPoolTests(OfflineBaseClass):
+    def setUp(self):
+        super(ConnectionPoolTests, self).setUp()
+        from python.shotgun_model import ConnectionPool, load_many
+
+        self.load_many = load_many
+        self.connections = []
+        self.pool = ConnectionPool(self.connection_factory, size=2)
+        for i in range(3):
+            self._sg.add("Asset", {"code": "Asset{}".format(i)})
+
+    def connection_factory(self):
+        sg = self._sg.clone()
+        self.connections.append(sg)
+        return sg
+
+    def test_models_use_the_pool(self):
+        assets = self.shotgun_model.EntityIter(
+            "Asset", ["code"], self._context, self.pool
+        )
+        assets.load([])
+        asset = list(assets)[0]
+        asset.code = "Renamed"
+        asset.update()
+
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(self.connections[0].count("update"), 1)
+        self.assertEqual(self.pool.stats["in_use"], 0)
+        self.assertEqual(self.pool.stats["checkouts"], 2)
+
+    def test_size_and_timeout(self):
+        first = self.pool.checkout()
+        second = self.pool.checkout()
+        with self.assertRaises(RuntimeError):
+            self.pool.checkout(timeout=0.01)
+
+        thread = threading.Timer(0.05, self.pool.checkin, [first])
+        thread.start()
+        self.assertIs(self.pool.checkout(timeout=1), first)
+        thread.join()
+        self.pool.checkin(first)
+        self.pool.checkin(second)
+        self.assertEqual(self.pool.stats["created"], 2)
+        self.assertEqual(self.pool.stats["idle"], 2)
+
+    def test_health_check(self):
+        self.pool.health_check_interval = 0
+        with self.pool.connection() as sg:
+            sg.close()
+        with self.pool.connection() as sg:
+            self.assertFalse(sg.closed)
+
+        self.assertEqual(self.pool.stats["health_checks"], 1)
+        self.assertEqual(self.pool.stats["discarded"], 1)
+        self.assertEqual(len(self.connections), 2)
+
+    def test_load_many_with_pool(self):
+        models = [
+            self.shotgun_model.EntityIter("Asset", ["code"], self._context, self.pool)
+            for _ in range(4)
+        ]
+        results = self.load_many(models, max_workers=4)
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertTrue(all(len(m) == 3 for m in models))
+        self.assertLessEqual(len(self.connections), 2)
+
+        self.pool.close()
+        self.assertTrue(all(sg.closed for sg in self.connections))
+
+
+if __name__ == "__main__":
+    unittest.main()
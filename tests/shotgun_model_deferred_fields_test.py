@@ -0,0 +1,98 @@
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class DeferredFieldsTests(OfflineBaseClass):
+    def setUp(self):
+        super(DeferredFieldsTests, self).setUp()
+        for i in range(5):
+            self._sg.add(
+                "Asset",
+                {
+                    "code": "asset_{}".format(i),
+                    "description": "description_{}".format(i),
+                    "project": self._context.project,
+                },
+            )
+
+    def new_assets(self, columnar=False):
+        return self.shotgun_model.EntityIter(
+            "Asset",
+            ["code", "description"],
+            self._context,
+            self._sg,
+            columnar=columnar,
+            deferred=["description"],
+        )
+
+    def test_deferred_field_not_requested_by_load(self):
+        assets = self.new_assets()
+        assets.load([])
+        self.assertNotIn("description", self._sg.calls[-1][3])
+
+    def test_batched_request(self):
+        for columnar in (False, True):
+            assets = self.new_assets(columnar)
+            assets.load([])
+            self._sg.calls = []
+
+            entities = list(assets)
+            self.assertEqual(entities[2].description, "description_2")
+            self.assertEqual(
+                [a.description for a in entities],
+                ["description_{}".format(i) for i in range(5)],
+            )
+            self.assertEqual(self._sg.count("find"), 1)
+            self.assertEqual(self._sg.calls[0][2], [["id", "in", [1, 2, 3, 4, 5]]])
+
+    def test_column_of_deferred_field(self):
+        assets = self.new_assets(columnar=True)
+        assets.load([])
+        self._sg.calls = []
+        self.assertEqual(assets.column("description")[0], "description_0")
+        self.assertEqual(self._sg.count("find"), 1)
+
+    def test_set_deferred_field(self):
+        assets = self.new_assets()
+        assets.load([])
+        asset = list(assets)[0]
+        self._sg.calls = []
+        asset.description = "changed"
+        self.assertEqual(self._sg.calls, [])
+        self.assertEqual(asset.changed_data, {"description": "changed"})
+        assets.update()
+        self.assertEqual(self._sg.count("find"), 0)
+        self.assertEqual(
+            self._sg.find_one("Asset", [["id", "is", 1]], ["description"])[
+                "description"
+            ],
+            "changed",
+        )
+
+    def test_refresh_requests_deferred_field_again(self):
+        assets = self.new_assets()
+        assets.CLOCK_SKEW = 0
+        assets.load([])
+        asset = list(assets)[1]
+        self.assertEqual(asset.description, "description_1")
+
+        self._sg.update("Asset", asset.id, {"description": "new"})
+        assets.refresh()
+        self.assertEqual(asset.description, "new")
+
+    def test_entity(self):
+        asset = self.shotgun_model.Entity(
+            "Asset",
+            ["code", "description"],
+            self._context,
+            self._sg,
+            deferred=["description"],
+        )
+        asset.load([["code", "is", "asset_3"]])
+        self.assertNotIn("description", self._sg.calls[-1][3])
+        self.assertEqual(asset.description, "description_3")
+        self.assertEqual(self._sg.count("find_one"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class DiskCacheTests(OfflineBaseClass):
+    def setUp(self):
+        super(DiskCacheTests, self).setUp()
+        from python.shotgun_model import DiskCache
+
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "entity_cache.sqlite")
+        self.new_cache = lambda **kwargs: DiskCache(self.path, **kwargs)
+        for i in range(3):
+            self._sg.add("CustomNonProjectEntity01", {"code": "Type{}".format(i)})
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def load(self, cache):
+        node_types = self.shotgun_model.EntityIter(
+            "CustomNonProjectEntity01", ["code"], self._context, self._sg, cache=cache
+        )
+        node_types.load([])
+        return [n.code for n in node_types]
+
+    def test_incremental_sync_between_sessions(self):
+        self.assertEqual(self.load(self.new_cache()), ["Type0", "Type1", "Type2"])
+
+        self._sg.update("CustomNonProjectEntity01", 2, {"code": "Renamed"})
+        self._sg.delete("CustomNonProjectEntity01", 3)
+        self._sg.calls = []
+
+        cache = self.new_cache()
+        cache.CLOCK_SKEW = 0
+        self.assertEqual(self.load(cache), ["Type0", "Renamed"])
+        updated_filter = self._sg.calls[0][2]
+        self.assertEqual(updated_filter[0][:2], ["updated_at", "greater_than"])
+        self.assertEqual(self._sg.calls[1][3], ["id"])
+        self.assertEqual(
+            cache.stats,
+            {
+                "hits": 0,
+                "misses": 0,
+                "revalidations": 1,
+                "synced_rows": 1,
+                "deleted_rows": 1,
+            },
+        )
+
+    def test_refresh_interval(self):
+        self.load(self.new_cache())
+        self._sg.calls = []
+
+        cache = self.new_cache(refresh_intervals={"CustomNonProjectEntity01": 3600})
+        self.assertEqual(self.load(cache), ["Type0", "Type1", "Type2"])
+        self.assertEqual(self._sg.calls, [])
+
+        cache.clear("CustomNonProjectEntity01")
+        self.load(cache)
+        self.assertEqual(self._sg.count("find"), 1)
+
+    def test_update_invalidates(self):
+        cache = self.new_cache(refresh_interval=3600)
+        self.load(cache)
+
+        node_types = self.shotgun_model.EntityIter(
+            "CustomNonProjectEntity01", ["code"], self._context, self._sg, cache=cache
+        )
+        node_types.load([])
+        list(node_types)[1].code = "Renamed"
+        self.assertEqual(node_types.update(), [])
+        self._sg.delete("CustomNonProjectEntity01", 3)
+        self._sg.calls = []
+
+        self.assertEqual(self.load(cache), ["Type0", "Renamed"])
+        self.assertEqual(self._sg.count("find"), 1)
+        self.assertEqual(cache.stats["deleted_rows"], 1)
+
+        # synced again, so the refresh interval applies
+        self._sg.calls = []
+        self.assertEqual(
+            self.load(self.new_cache(refresh_interval=3600)), ["Type0", "Renamed"]
+        )
+        self.assertEqual(self._sg.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
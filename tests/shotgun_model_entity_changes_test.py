@@ -0,0 +1,45 @@
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class EntityChangesTests(OfflineBaseClass):
+    def setUp(self):
+        super(EntityChangesTests, self).setUp()
+        self.asset_id = self._sg.add(
+            "Asset",
+            {"code": "Asset1", "description": "", "project": self._context.project},
+        )["id"]
+        self.asset = self.shotgun_model.Entity(
+            "Asset", ["code", "id", "project", "description"], self._context, self._sg
+        )
+        self.asset.load([["id", "is", self.asset_id]])
+
+    def test_loaded_entity_has_no_changes(self):
+        self.assertEqual(self.asset.changed_data, {})
+        self.assertEqual(self.asset.update(), {})
+        self.assertEqual(self._sg.count("update"), 0)
+
+    def test_update_only_changed_fields(self):
+        self.asset.description = "new description"
+        self.asset.code = "Asset1"
+        self.asset.update()
+
+        _, entity_type, entity_id, data = self._sg.calls[-1]
+        self.assertEqual((entity_type, entity_id), ("Asset", self.asset_id))
+        self.assertEqual(data, {"description": "new description"})
+        self.assertEqual(self.asset.changed_data, {})
+
+    def test_update_without_load(self):
+        asset = self.shotgun_model.Entity(
+            "Asset", ["code", "id", "project", "description"], self._context, self._sg
+        )
+        asset.id = self.asset_id
+        asset.entity_filter = [["code", "is", "Asset1"]]
+        asset.code = "Asset2"
+        asset.update()
+
+        self.assertEqual(self._sg.calls[-1][-1], {"code": "Asset2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class EntityIterBatchTests(OfflineBaseClass):
+    def setUp(self):
+        super(EntityIterBatchTests, self).setUp()
+        self.return_fields = ["code", "id", "project", "description"]
+        self.assets = self.shotgun_model.EntityIter(
+            "Asset", self.return_fields, self._context, self._sg, batch_size=2
+        )
+
+    def test_create_in_batches(self):
+        for i in range(5):
+            asset = self.assets.add_new_entity()
+            asset.code = "Asset{}".format(i)
+
+        errors = self.assets.create()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self._sg.count("batch"), 3)
+        self.assertEqual(self._sg.count("create"), 0)
+        for asset in self.assets:
+            self.assertIsNotNone(asset.id)
+            sg_asset = self._sg.find_one("Asset", [["id", "is", asset.id]], ["code"])
+            self.assertEqual(asset.code, sg_asset.get("code"))
+
+    def test_update_in_batches(self):
+        for i in range(3):
+            self._sg.add("Asset", {"code": "Asset{}".format(i)})
+        self.assets.load()
+
+        for asset in self.assets:
+            asset.description = "updated"
+        errors = self.assets.update(batch_size=10)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(self._sg.count("batch"), 1)
+        self.assertEqual(self._sg.count("update"), 0)
+        for sg_asset in self._sg.find("Asset", [], ["description"]):
+            self.assertEqual(sg_asset.get("description"), "updated")
+
+    def test_update_errors_per_entity(self):
+        for i in range(4):
+            self._sg.add("Asset", {"code": "Asset{}".format(i)})
+        self.assets.load()
+
+        entities = list(self.assets)
+        for asset in entities:
+            asset.description = "updated"
+        entities[3].id = 999
+
+        errors = self.assets.update()
+
+        self.assertEqual([entity for entity, _ in errors], entities[2:])
+        descriptions = [
+            a.get("description") for a in self._sg.find("Asset", [], ["description"])
+        ]
+        self.assertEqual(descriptions, ["updated", "updated", None, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
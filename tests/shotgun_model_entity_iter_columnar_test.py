@@ -0,0 +1,69 @@
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class EntityIterColumnarTests(OfflineBaseClass):
+    def setUp(self):
+        super(EntityIterColumnarTests, self).setUp()
+        for code, asset_type in [
+            ("Hero", "Character"),
+            ("Villain", "Character"),
+            ("Tree", "Prop"),
+            ("Rock", "Prop"),
+            ("City", "Environment"),
+        ]:
+            self._sg.add("Asset", {"code": code, "sg_asset_type": asset_type})
+        self.assets = self.shotgun_model.EntityIter(
+            "Asset",
+            ["code", "id", "sg_asset_type"],
+            self._context,
+            self._sg,
+            columnar=True,
+        )
+        self.assets.load([])
+
+    def test_entities_are_created_lazily(self):
+        self.assertTrue(self.assets.is_columnar)
+        self.assertEqual(len(self.assets), 5)
+        self.assertEqual(self.assets._entities, [None] * 5)
+
+        codes = [asset.code for asset in self.assets]
+        self.assertEqual(codes, ["Hero", "Villain", "Tree", "Rock", "City"])
+        self.assertNotIn(None, self.assets._entities)
+
+    def test_where_and_column(self):
+        characters = self.assets.where("sg_asset_type", "is", "Character")
+
+        self.assertEqual(characters.column("code"), ["Hero", "Villain"])
+        self.assertEqual(self.assets._entities, [None] * 5)
+        self.assertEqual(
+            self.assets.where("code", "in", ["Tree", "City"]).column("id"), [3, 5]
+        )
+        with self.assertRaises(ValueError):
+            self.assets.where("code", "like", "Tree")
+
+    def test_group_by(self):
+        groups = self.assets.group_by("sg_asset_type")
+
+        self.assertEqual(sorted(groups.keys()), ["Character", "Environment", "Prop"])
+        self.assertEqual(groups["Prop"].column("code"), ["Tree", "Rock"])
+
+    def test_changes_are_visible_in_columns(self):
+        hero = list(self.assets.where("code", "is", "Hero"))[0]
+        hero.code = "SuperHero"
+        self.assertEqual(self.assets.column("code")[0], "SuperHero")
+
+        self.assets.update()
+        self.assertEqual(self._sg.count("batch"), 1)
+        self.assertEqual(self._sg.calls[-1][-1][0]["data"], {"code": "SuperHero"})
+
+    def test_remove_entity(self):
+        self.assets.remove_entity("code", "Tree")
+        self.assertEqual(
+            self.assets.column("code"), ["Hero", "Villain", "Rock", "City"]
+        )
+        self.assertEqual(len(self.assets), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
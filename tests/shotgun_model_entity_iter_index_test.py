@@ -0,0 +1,105 @@
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class EntityIterIndexTests(OfflineBaseClass):
+    def setUp(self):
+        super(EntityIterIndexTests, self).setUp()
+        for i in range(10):
+            self._sg.add(
+                "Asset",
+                {"code": "asset_{}".format(i), "project": self._context.project},
+            )
+
+    def new_assets(self, columnar=False):
+        assets = self.shotgun_model.EntityIter(
+            "Asset",
+            ["code"],
+            self._context,
+            self._sg,
+            columnar=columnar,
+            index_on=["id", "code"],
+        )
+        assets.load([])
+        return assets
+
+    def test_get_by(self):
+        for columnar in (False, True):
+            assets = self.new_assets(columnar)
+            self.assertEqual(assets.get_by("code", "asset_3").code, "asset_3")
+            self.assertEqual(assets.get_by("id", 5).id, 5)
+            self.assertIsNone(assets.get_by("code", "missing"))
+
+    def test_get_by_not_indexed(self):
+        assets = self.new_assets()
+        asset = assets.get_by("type", "Asset")
+        self.assertEqual(asset.type, "Asset")
+
+    def test_remove_entity(self):
+        for columnar in (False, True):
+            assets = self.new_assets(columnar)
+            assets.remove_entity("code", "asset_3")
+            self.assertEqual(len(assets), 9)
+            self.assertIsNone(assets.get_by("code", "asset_3"))
+            self.assertNotIn("asset_3", [a.code for a in assets])
+            self.assertNotIn("asset_3", assets.column("code"))
+            # the other positions are still indexed
+            self.assertEqual(assets.get_by("code", "asset_4").code, "asset_4")
+
+    def test_add_new_entity(self):
+        assets = self.new_assets()
+        new = assets.add_new_entity()
+        new.code = "new_asset"
+        self.assertIs(assets.get_by("code", "new_asset"), new)
+        assets.remove_entity("code", "new_asset")
+        self.assertIsNone(assets.get_by("code", "new_asset"))
+
+    def test_add_new_entity_then_set(self):
+        for columnar in (False, True):
+            assets = self.new_assets(columnar)
+            new = assets.add_new_entity()
+            # looked up before its fields are set
+            self.assertIsNone(assets.get_by("code", "new_asset"))
+            new.code = "new_asset"
+            self.assertIs(assets.get_by("code", "new_asset"), new)
+            new.code = "renamed"
+            self.assertIsNone(assets.get_by("code", "new_asset"))
+            self.assertIs(assets.get_by("code", "renamed"), new)
+
+    def test_get_by_after_create(self):
+        assets = self.new_assets()
+        new = assets.add_new_entity()
+        new.code = "new_asset"
+        self.assertEqual(assets.create(), [])
+        self.assertTrue(new.id)
+        self.assertIs(assets.get_by("id", new.id), new)
+        self.assertIs(assets.get_by("code", "new_asset"), new)
+        self.assertEqual(assets._unindexed, [])
+
+    def test_get_by_after_update(self):
+        assets = self.new_assets()
+        assets.get_by("code", "asset_1").code = "renamed"
+        self.assertEqual(assets.update(), [])
+        self.assertEqual(assets.get_by("code", "renamed").id, 2)
+        self.assertIsNone(assets.get_by("code", "asset_1"))
+
+    def test_reindex(self):
+        assets = self.new_assets()
+        assets.get_by("code", "asset_1").code = "renamed"
+        self.assertIsNone(assets.get_by("code", "renamed"))
+        self.assertIsNone(assets.get_by("code", "asset_1"))
+        assets.reindex()
+        self.assertEqual(assets.get_by("code", "renamed").id, 2)
+
+    def test_update_skips_removed(self):
+        assets = self.new_assets()
+        assets.get_by("code", "asset_1").code = "renamed"
+        assets.remove_entity("code", "asset_2")
+        self.assertEqual(len(assets.update()), 0)
+        self.assertEqual(
+            self._sg.find_one("Asset", [["id", "is", 2]], ["code"])["code"], "renamed"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
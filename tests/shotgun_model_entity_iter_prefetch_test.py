@@ -0,0 +1,85 @@
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class EntityIterPrefetchTests(OfflineBaseClass):
+    def setUp(self):
+        super(EntityIterPrefetchTests, self).setUp()
+        self.namespaces = []
+        for i in range(3):
+            namespace = self._sg.add(
+                "CustomEntity03",
+                {
+                    "code": "namespace_{}".format(i),
+                    "sg_path": "/path/{}".format(i),
+                    "project": self._context.project,
+                },
+            )
+            self.namespaces.append({"type": "CustomEntity03", "id": namespace["id"]})
+
+        for i in range(9):
+            namespace = self.namespaces[i % 3]
+            self._sg.add(
+                "CustomEntity05",
+                {
+                    "code": "node_{}".format(i),
+                    "sg_namespace": namespace,
+                    "sg_namespace.CustomEntity03.sg_parent": self.namespaces[0],
+                    "project": self._context.project,
+                },
+            )
+
+    def new_nodes(self, fields=None, columnar=False):
+        return self.shotgun_model.EntityIter(
+            "CustomEntity05",
+            fields or ["code", "sg_namespace"],
+            self._context,
+            self._sg,
+            columnar=columnar,
+        )
+
+    def test_prefetch(self):
+        for columnar in (False, True):
+            self._sg.calls = []
+            nodes = self.new_nodes(columnar=columnar)
+            nodes.load([], prefetch={"sg_namespace": ["code", "sg_path"]})
+            self.assertEqual(self._sg.count("find"), 2)
+
+            paths = [node.sg_namespace.sg_path for node in nodes]
+            self.assertEqual(paths, ["/path/{}".format(i % 3) for i in range(9)])
+            entities = list(nodes)
+            self.assertIs(entities[0].sg_namespace, entities[3].sg_namespace)
+            self.assertEqual(entities[0].changed_data, {})
+
+    def test_deep_link(self):
+        field = "sg_namespace.CustomEntity03.sg_parent"
+        nodes = self.new_nodes(["code", field])
+        nodes.load([], prefetch={field: ["code"]})
+        node = list(nodes)[0]
+        self.assertEqual(getattr(node, field).code, "namespace_0")
+
+    def test_link_not_in_fields(self):
+        nodes = self.new_nodes()
+        with self.assertRaises(ValueError):
+            nodes.load([], prefetch={"sg_parent": ["code"]})
+
+    def test_where_by_prefetched_link(self):
+        nodes = self.new_nodes()
+        nodes.load([], prefetch={"sg_namespace": ["code"]})
+        found = nodes.where("sg_namespace", "is", self.namespaces[1])
+        self.assertEqual(len(found), 3)
+
+    def test_update_keeps_links(self):
+        nodes = self.new_nodes()
+        nodes.load([], prefetch={"sg_namespace": ["code"]})
+        node = list(nodes)[0]
+        node.sg_namespace = list(nodes)[1].sg_namespace
+        self.assertEqual(nodes.update(), [])
+        updated = self._sg.find_one(
+            "CustomEntity05", [["id", "is", node.id]], ["sg_namespace"]
+        )
+        self.assertEqual(updated["sg_namespace"]["id"], self.namespaces[1]["id"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class EntityIterRefreshTests(OfflineBaseClass):
+    def setUp(self):
+        super(EntityIterRefreshTests, self).setUp()
+        for i in range(5):
+            self._sg.add(
+                "Asset",
+                {"code": "asset_{}".format(i), "project": self._context.project},
+            )
+
+    def new_assets(self, columnar=False):
+        assets = self.shotgun_model.EntityIter(
+            "Asset",
+            ["code"],
+            self._context,
+            self._sg,
+            columnar=columnar,
+            index_on=["code"],
+        )
+        assets.CLOCK_SKEW = 0
+        return assets
+
+    def test_refresh_without_load(self):
+        assets = self.new_assets()
+        self.assertEqual(assets.refresh()["created"], 5)
+        self.assertEqual(len(assets), 5)
+
+    def test_refresh_changes(self):
+        for columnar in (False, True):
+            self._sg.calls = []
+            assets = self.new_assets(columnar)
+            assets.load([])
+            first = list(assets)[0]
+
+            self._sg.update("Asset", 1, {"code": "renamed"})
+            self._sg.add("Asset", {"code": "new", "project": self._context.project})
+            self._sg.delete("Asset", 3)
+            stats = assets.refresh()
+
+            self.assertEqual(stats, {"created": 1, "updated": 1, "deleted": 1})
+            self.assertIs(list(assets)[0], first)
+            self.assertEqual(first.code, "renamed")
+            self.assertEqual(
+                sorted(assets.column("code")),
+                ["asset_1", "asset_3", "asset_4", "new", "renamed"],
+            )
+            self.assertEqual(assets.get_by("code", "new").code, "new")
+            self.assertEqual(self._sg.count("find"), 3)
+
+            # restore the fake data for the next mode
+            self.setUp()
+
+    def test_refresh_keeps_local_changes(self):
+        assets = self.new_assets()
+        assets.load([])
+        asset = assets.get_by("code", "asset_1")
+        asset.code = "local"
+        self._sg.update("Asset", asset.id, {"code": "remote"})
+        assets.refresh()
+        self.assertEqual(asset.code, "local")
+        self.assertEqual(asset.changed_data, {"code": "local"})
+
+    def test_refresh_without_changes(self):
+        assets = self.new_assets()
+        assets.load([])
+        self.assertEqual(assets.refresh(), {"created": 0, "updated": 0, "deleted": 0})
+
+    def test_refresh_with_cache(self):
+        from python.shotgun_model import DiskCache, QueryCache
+
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder)
+        disk_cache = DiskCache(
+            os.path.join(folder, "cache.sqlite"), refresh_interval=3600
+        )
+        for cache in (QueryCache(ttl=600), disk_cache):
+            assets = self.shotgun_model.EntityIter(
+                "Asset", ["code"], self._context, self._sg, cache=cache
+            )
+            assets.CLOCK_SKEW = 0
+            assets.load([])
+            self.assertEqual(assets.refresh()["deleted"], 0)
+
+            self._sg.update("Asset", 1, {"code": "renamed"})
+            self._sg.delete("Asset", 3)
+            stats = assets.refresh()
+            self.assertEqual(stats["updated"], 1)
+            self.assertEqual(stats["deleted"], 1)
+
+            self._sg.delete("Asset", 4)
+            self.assertEqual(assets.refresh()["deleted"], 1)
+            self.assertEqual(
+                sorted(assets.column("code")), ["asset_1", "asset_4", "renamed"]
+            )
+
+            # the query cached by the load is invalidated by the refresh
+            others = self.shotgun_model.EntityIter(
+                "Asset", ["code"], self._context, self._sg, cache=cache
+            )
+            others.load([])
+            self.assertEqual(len(others), 3)
+            self.assertEqual(list(others)[0].code, "renamed")
+
+            # restore the fake data for the next cache
+            self.setUp()
+
+        # only the query of the loads is stored
+        with disk_cache._connect() as connection:
+            count = connection.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+        self.assertEqual(count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class EntityIterStreamTests(OfflineBaseClass):
+    def setUp(self):
+        super(EntityIterStreamTests, self).setUp()
+        for i in range(7):
+            self._sg.add("Asset", {"code": "Asset{}".format(i)})
+        self.assets = self.shotgun_model.EntityIter(
+            "Asset", ["code", "id"], self._context, self._sg
+        )
+
+    def test_stream_by_pages(self):
+        codes = [asset.code for asset in self.assets.stream([], page_size=3)]
+
+        self.assertEqual(codes, ["Asset{}".format(i) for i in range(7)])
+        self.assertEqual(self._sg.count("find"), 3)
+        self.assertEqual(len(self.assets), 0)
+
+    def test_stream_is_lazy(self):
+        stream = self.assets.stream([["code", "is_not", "Asset0"]], page_size=2)
+        self.assertEqual(next(stream).code, "Asset1")
+        self.assertEqual(self._sg.count("find"), 1)
+
+    def test_page_size_above_records_per_page(self):
+        for i in range(7, 1200):
+            self._sg.add("Asset", {"code": "Asset{}".format(i)})
+
+        codes = [asset.code for asset in self.assets.stream([], page_size=1000)]
+
+        self.assertEqual(codes, ["Asset{}".format(i) for i in range(1200)])
+        self.assertEqual(self._sg.count("find"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class EntityRecordTests(OfflineBaseClass):
+    def setUp(self):
+        super(EntityRecordTests, self).setUp()
+        self.fields = ["code", "description"]
+
+    def test_record_class_is_created_once(self):
+        record_class = self.shotgun_model.entity_record_class("Asset", self.fields)
+        self.assertIs(
+            record_class,
+            self.shotgun_model.entity_record_class("Asset", list(self.fields)),
+        )
+        self.assertIsNot(
+            record_class, self.shotgun_model.entity_record_class("Shot", self.fields)
+        )
+        self.assertEqual(record_class._fields, ["code", "description", "id", "project"])
+        self.assertIsNot(
+            record_class,
+            self.shotgun_model.entity_record_class(
+                "Asset", self.fields, deferred=["description"]
+            ),
+        )
+
+    def test_record_class_is_shared_by_iters_and_views(self):
+        assets = self.shotgun_model.EntityIter(
+            "Asset", self.fields, self._context, self._sg
+        )
+        others = self.shotgun_model.EntityIter(
+            "Asset", list(self.fields), self._context, self._sg
+        )
+        record_class = self.shotgun_model.entity_record_class("Asset", self.fields)
+        self.assertIs(assets._record_class, record_class)
+        self.assertIs(others._record_class, record_class)
+        self.assertIs(assets.where("code", "is", "x")._record_class, record_class)
+
+    def test_fields_are_not_in_dict(self):
+        record_class = self.shotgun_model.entity_record_class("Asset", self.fields)
+        assets = self.shotgun_model.EntityIter(
+            "Asset", self.fields, self._context, self._sg
+        )
+        record = record_class(assets)
+        record.add_sg_data({"type": "Asset", "id": 1, "code": "Asset1"})
+
+        self.assertEqual(vars(record), {})
+        self.assertIs(record._sg, self._sg)
+        self.assertEqual(record.project, self._context.project)
+        self.assertEqual(record.shotgun_entity_data, {"type": "Asset", "id": 1})
+        record.sg_status_list = "ip"
+        self.assertEqual(vars(record), {"sg_status_list": "ip"})
+        self.assertEqual(record.changed_data, {"sg_status_list": "ip"})
+
+    def test_entity_iter_load_records(self):
+        asset_id = self._sg.add("Asset", {"code": "Asset1"})["id"]
+        assets = self.shotgun_model.EntityIter(
+            "Asset", self.fields, self._context, self._sg
+        )
+        assets.load([])
+
+        asset = list(assets)[0]
+        self.assertIsInstance(asset, self.shotgun_model.EntityRecord)
+        self.assertEqual((asset.id, asset.code), (asset_id, "Asset1"))
+
+        self.assertIs(asset._sg, self._sg)
+        asset.description = "updated"
+        asset.update()
+        self.assertEqual(self._sg.calls[-1][-1], {"description": "updated"})
+
+    def test_record_entity_filter(self):
+        self._sg.add("Asset", {"code": "Asset1", "project": self._context.project})
+        self._sg.add("Asset", {"code": "Asset2", "project": self._context.project})
+        assets = self.shotgun_model.EntityIter(
+            "Asset", self.fields, self._context, self._sg
+        )
+        assets.load([])
+
+        asset = list(assets)[0]
+        asset.entity_filter = [["code", "is", "Asset2"]]
+        self.assertEqual(list(assets)[1].entity_filter, ())
+        asset.load()
+        self.assertEqual(asset.code, "Asset2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import gc
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class IdentityMapTests(OfflineBaseClass):
+    def setUp(self):
+        super(IdentityMapTests, self).setUp()
+        from python.shotgun_model import IdentityMap
+
+        self.session = IdentityMap()
+        for code, asset_type in [("Hero", "Character"), ("Tree", "Prop")]:
+            self._sg.add(
+                "Asset",
+                {
+                    "code": code,
+                    "sg_asset_type": asset_type,
+                    "project": self._context.project,
+                },
+            )
+
+    def new_assets(self, fields=None):
+        return self.shotgun_model.EntityIter(
+            "Asset",
+            fields or ["code", "sg_asset_type"],
+            self._context,
+            self._sg,
+            identity_map=self.session,
+        )
+
+    def test_same_instance_between_iters(self):
+        assets = self.new_assets()
+        assets.load([])
+        characters = self.new_assets()
+        characters.load([["sg_asset_type", "is", "Character"]])
+
+        hero = list(characters)[0]
+        self.assertIs(hero, list(assets)[0])
+        hero.code = "SuperHero"
+        self.assertEqual(list(assets)[0].code, "SuperHero")
+        self.assertEqual(len(self.session), 2)
+
+    def test_merge_keeps_local_changes(self):
+        assets = self.new_assets()
+        assets.load([])
+        hero = list(assets)[0]
+        hero.code = "SuperHero"
+
+        self._sg.update("Asset", hero.id, {"sg_asset_type": "Vehicle"})
+        assets.load([])
+
+        self.assertIs(list(assets)[0], hero)
+        self.assertEqual(hero.sg_asset_type, "Vehicle")
+        self.assertEqual(hero.changed_data, {"code": "SuperHero"})
+
+    def test_record_with_fewer_fields_is_merged(self):
+        codes = self.new_assets(["code"])
+        codes.load([])
+        hero = list(codes)[0]
+        self._sg.update("Asset", hero.id, {"description": "The hero"})
+        assets = self.new_assets(["code", "description"])
+        assets.load([])
+
+        self.assertIs(list(assets)[0], hero)
+        self.assertIs(self.session.get("Asset", hero.id), hero)
+        self.assertEqual(hero.description, "The hero")
+        self.assertEqual(hero.changed_data, {})
+
+        hero.description = "The super hero"
+        self.assertEqual(assets.update(), [])
+        self.assertEqual(
+            self._sg.find_one("Asset", [["id", "is", hero.id]], ["description"])[
+                "description"
+            ],
+            "The super hero",
+        )
+
+    def test_load_returns_the_registered_instance(self):
+        assets = self.new_assets()
+        assets.load([])
+        tree = list(assets)[1]
+        self._sg.update("Asset", tree.id, {"sg_asset_type": "Set"})
+
+        asset = self.shotgun_model.Entity(
+            "Asset",
+            ["code", "sg_asset_type"],
+            self._context,
+            self._sg,
+            identity_map=self.session,
+        )
+        self.assertIs(asset.load([["code", "is", "Tree"]]), tree)
+        self.assertIs(self.session.get("Asset", tree.id), tree)
+        self.assertEqual(tree.sg_asset_type, "Set")
+
+    def test_unused_entities_are_collected(self):
+        assets = self.new_assets()
+        assets.load([])
+        self.assertEqual(len(self.session), 2)
+
+        del assets
+        gc.collect()
+        self.assertEqual(len(self.session), 0)
+
+    def test_loaded_and_created_entities_are_registered(self):
+        asset = self.shotgun_model.Entity(
+            "Asset", ["code"], self._context, self._sg, identity_map=self.session
+        )
+        self.assertIs(asset.load([["code", "is", "Tree"]]), asset)
+        self.assertIs(self.session.get("Asset", 2), asset)
+
+        assets = self.new_assets()
+        new_asset = assets.add_new_entity()
+        new_asset.code = "Rock"
+        assets.create()
+        self.assertIs(self.session.get("Asset", new_asset.id), new_asset)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import time
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class LoadManyTests(OfflineBaseClass):
+    def setUp(self):
+        super(LoadManyTests, self).setUp()
+        from python.shotgun_model import load_many
+
+        self.load_many = load_many
+        self.connections = []
+        for entity_type in ["Asset", "CustomEntity03", "CustomEntity04"]:
+            self._sg.add(entity_type, {"code": entity_type})
+        self._sg.latency = 0.1
+
+    def connection_factory(self):
+        sg = self._sg.clone()
+        self.connections.append(sg)
+        return sg
+
+    def new_model(self, entity_type):
+        return self.shotgun_model.EntityIter(
+            entity_type, ["code"], self._context, self._sg
+        )
+
+    def test_loads_run_concurrently(self):
+        models = [
+            self.new_model(t) for t in ["Asset", "CustomEntity03", "CustomEntity04"]
+        ]
+        start = time.time()
+        results = self.load_many(
+            [(models[0], [["code", "is", "Asset"]])] + models[1:],
+            self.connection_factory,
+            max_workers=3,
+        )
+
+        self.assertLess(time.time() - start, 0.25)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertTrue(all(r.duration >= 0.1 for r in results))
+        self.assertEqual(
+            [list(m)[0].code for m in models], [m._entity_type for m in models]
+        )
+        self.assertEqual(self._sg.calls, [])
+        self.assertTrue(all(sg.closed for sg in self.connections))
+        self.assertIs(models[0]._sg, self._sg)
+
+    def test_errors_by_load(self):
+        entity = self.shotgun_model.Entity("Asset", ["code"], self._context, self._sg)
+        entity.entity_filter = [["code", "like", "Asset"]]
+        results = self.load_many(
+            [entity, self.new_model("Asset")], self.connection_factory, max_workers=1
+        )
+
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertTrue(results[1].ok)
+        self.assertEqual(len(self.connections), 1)
+
+    def test_invalid_arguments(self):
+        from python.shotgun_model import ConnectionPool
+
+        with self.assertRaises(ValueError):
+            self.load_many([self.new_model("Asset")], self.connection_factory, 0)
+        with self.assertRaises(ValueError):
+            self.load_many([self.new_model("Asset")])
+        self.assertEqual(self.connections, [])
+
+        model = self.shotgun_model.EntityIter(
+            "Asset", ["code"], self._context, ConnectionPool(self.connection_factory)
+        )
+        self.assertTrue(self.load_many([model])[0].ok)
+        self.assertEqual(len(model), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import json
+import logging
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class MetricsTests(OfflineBaseClass):
+    def setUp(self):
+        super(MetricsTests, self).setUp()
+        from python.shotgun_model import QueryCache, enable_metrics
+
+        self.QueryCache = QueryCache
+        self.registry = enable_metrics()
+        for i in range(3):
+            self._sg.add(
+                "Asset",
+                {"code": "Asset{}".format(i), "project": self._context.project},
+            )
+
+    def tearDown(self):
+        from python.shotgun_model import disable_metrics
+
+        disable_metrics()
+
+    def new_assets(self, cache=None):
+        return self.shotgun_model.EntityIter(
+            "Asset", ["code"], self._context, self._sg, cache=cache
+        )
+
+    def stats(self, operation):
+        return [s for s in self.registry.stats if s["operation"] == operation][0]
+
+    def test_load(self):
+        self.new_assets().load([])
+        stats = self.stats("find")
+        self.assertEqual(stats["entity_type"], "Asset")
+        self.assertEqual(stats["calls"], 1)
+        self.assertEqual(stats["rows"], 3)
+        self.assertGreater(stats["bytes"], 0)
+        self.assertEqual(stats["cache_hits"], 0)
+
+    def test_cache_hits(self):
+        cache = self.QueryCache()
+        events = []
+        self.registry.add_hook(events.append)
+        for _ in range(2):
+            self.new_assets(cache).load([])
+        self.assertEqual([e["cache_hit"] for e in events], [False, True])
+        self.assertEqual(self.stats("find")["cache_hits"], 1)
+
+    def test_writes(self):
+        assets = self.new_assets()
+        assets.load([])
+        for asset in assets:
+            asset.code += "_v2"
+        assets.update()
+        self.assertEqual(self.stats("batch")["calls"], 1)
+        self.assertEqual(self.stats("batch")["rows"], 3)
+
+    def test_errors(self):
+        self._sg.inject_fault("find", RuntimeError("down"))
+        with self.assertRaises(RuntimeError):
+            self.new_assets().load([])
+        self.assertEqual(self.stats("find")["errors"], 1)
+
+    def test_exports(self):
+        stream = io.StringIO()
+        self.registry.add_hook(self.registry.json_lines_writer(stream))
+        self.new_assets().load([])
+
+        event = json.loads(stream.getvalue().splitlines()[0])
+        self.assertEqual(event["operation"], "find")
+        self.assertEqual(json.loads(self.registry.json_lines())["rows"], 3)
+        self.assertIn("Asset", self.registry.summary().splitlines()[1])
+
+    def test_hook_errors_are_logged(self):
+        events = []
+
+        def failing_hook(event):
+            raise RuntimeError("hook")
+
+        self.registry.add_hook(failing_hook)
+        self.registry.add_hook(events.append)
+        self.registry.add_hook(events.append)
+        records = []
+        handler = logging.Handler(logging.ERROR)
+        handler.emit = records.append
+        logger = logging.getLogger("python.shotgun_model.metrics")
+        logger.addHandler(handler)
+        try:
+            assets = self.new_assets()
+            assets.load([])
+        finally:
+            logger.removeHandler(handler)
+
+        self.assertEqual(len(assets), 3)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].exc_info[0], RuntimeError)
+
+    def test_disabled(self):
+        from python.shotgun_model import disable_metrics, get_metrics
+
+        disable_metrics()
+        self.assertIsNone(get_metrics())
+        self.new_assets().load([])
+        self.assertEqual(self.registry.stats, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import time
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class QueryCacheTests(OfflineBaseClass):
+    def setUp(self):
+        super(QueryCacheTests, self).setUp()
+        from python.shotgun_model import QueryCache
+
+        self.cache = QueryCache(max_size=2, ttl=60, ttls={"Shot": 0})
+        for i in range(3):
+            self._sg.add("Asset", {"code": "Asset{}".format(i)})
+
+    def new_assets(self):
+        return self.shotgun_model.EntityIter(
+            "Asset", ["code", "id"], self._context, self._sg, cache=self.cache
+        )
+
+    def test_same_query_hits_cache(self):
+        self.new_assets().load([["code", "is", "Asset1"], ["id", "greater_than", 0]])
+        assets = self.new_assets()
+        assets.load([["id", "greater_than", 0], ["code", "is", "Asset1"]])
+
+        self.assertEqual([a.code for a in assets], ["Asset1"])
+        self.assertEqual(self._sg.count("find"), 1)
+        self.assertEqual(self.cache.stats["hits"], 1)
+        self.assertEqual(self.cache.stats["misses"], 1)
+
+    def test_key_keeps_the_order_of_values(self):
+        from python.shotgun_model import QueryCache
+
+        def key(filters, **kwargs):
+            return QueryCache.key("find", "Asset", filters, ["code"], **kwargs)
+
+        by_code = [{"field_name": "code", "direction": "asc"}]
+        by_id = [{"field_name": "id", "direction": "asc"}]
+        self.assertNotEqual(
+            key([], order=by_code + by_id), key([], order=by_id + by_code)
+        )
+        self.assertEqual(
+            key(
+                [
+                    {
+                        "filter_operator": "any",
+                        "filters": [["code", "is", "a"], ["id", "is", 1]],
+                    },
+                    ["id", "greater_than", 0],
+                ]
+            ),
+            key(
+                [
+                    ["id", "greater_than", 0],
+                    {
+                        "filter_operator": "any",
+                        "filters": [["id", "is", 1], ["code", "is", "a"]],
+                    },
+                ]
+            ),
+        )
+        self.assertNotEqual(
+            key([["id", "between", [1, 5]]]), key([["id", "between", [5, 1]]])
+        )
+
+    def test_cached_result_is_copied(self):
+        filters = [["code", "is", "Asset1"]]
+        self.cache.read(self._sg, "find", "Asset", filters, ["code"])[0]["code"] = "x"
+        result = self.cache.read(self._sg, "find", "Asset", filters, ["code"])
+        result[0]["code"] = "y"
+
+        result = self.cache.read(self._sg, "find", "Asset", filters, ["code"])
+        self.assertEqual(result[0]["code"], "Asset1")
+        self.assertEqual(self._sg.count("find"), 1)
+
+    def test_lru_eviction(self):
+        for code in ["Asset0", "Asset1", "Asset0", "Asset2", "Asset0"]:
+            self.new_assets().load([["code", "is", code]])
+
+        self.assertEqual(self._sg.count("find"), 3)
+        self.assertEqual(self.cache.stats["evictions"], 1)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_ttl(self):
+        shots = self.shotgun_model.EntityIter(
+            "Shot", ["code"], self._context, self._sg, cache=self.cache
+        )
+        shots.load([])
+        shots.load([])
+        self.assertEqual(self._sg.count("find"), 2)
+
+        self.cache.ttl = 0.01
+        self.new_assets().load([])
+        time.sleep(0.02)
+        self.new_assets().load([])
+        self.assertEqual(self._sg.count("find"), 4)
+
+    def test_write_invalidates_entity_type(self):
+        assets = self.new_assets()
+        assets.load([])
+        asset = list(assets)[0]
+        asset.code = "Renamed"
+        asset.update()
+
+        assets = self.new_assets()
+        assets.load([])
+        self.assertEqual(self._sg.count("find"), 2)
+        self.assertEqual(list(assets)[0].code, "Renamed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import time
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class RequestCoalescerTests(OfflineBaseClass):
+    def setUp(self):
+        super(RequestCoalescerTests, self).setUp()
+        from python.shotgun_model import QueryCache, RequestCoalescer
+
+        self.QueryCache = QueryCache
+        self.coalescer = RequestCoalescer(batch_window=0.05)
+        for i in range(5):
+            self._sg.add(
+                "Asset",
+                {"code": "Asset{}".format(i), "project": self._context.project},
+            )
+        self._sg.latency = 0.1
+
+    def run_threads(self, target, count):
+        results = [None] * count
+
+        def run(i):
+            results[i] = target(i)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_identical_loads_share_one_call(self):
+        def load(_):
+            assets = self.shotgun_model.EntityIter(
+                "Asset", ["code"], self._context, self._sg, cache=self.coalescer
+            )
+            assets.load([["code", "is_not", "Asset0"]])
+            return [a.code for a in assets]
+
+        results = self.run_threads(load, 4)
+        self.assertEqual(results, [["Asset1", "Asset2", "Asset3", "Asset4"]] * 4)
+        self.assertEqual(self._sg.count("find"), 1)
+        self.assertEqual(self.coalescer.stats["coalesced"], 3)
+
+    def test_find_one_by_id_batched(self):
+        def load(i):
+            asset = self.shotgun_model.Entity(
+                "Asset", ["code"], self._context, self._sg, cache=self.coalescer
+            )
+            asset.load([["id", "is", i + 1]])
+            return asset.code
+
+        results = self.run_threads(load, 5)
+        self.assertEqual(results, ["Asset{}".format(i) for i in range(5)])
+        self.assertEqual(self._sg.count("find_one"), 0)
+        # the first request is sent alone, the others wait for the batch window together
+        self.assertLessEqual(self._sg.count("find"), 2)
+        ids = sorted(i for call in self._sg.calls for i in call[2][-1][2])
+        self.assertEqual(ids, [1, 2, 3, 4, 5])
+
+    def test_find_one_by_id_alone_is_not_delayed(self):
+        self._sg.latency = 0
+        coalescer = type(self.coalescer)(batch_window=10)
+        asset = self.shotgun_model.Entity(
+            "Asset", ["code"], self._context, self._sg, cache=coalescer
+        )
+        start = time.time()
+        asset.load([["id", "is", 2]])
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(asset.code, "Asset1")
+
+    def test_missing_id(self):
+        self._sg.latency = 0
+        asset = self.shotgun_model.Entity(
+            "Asset", ["code"], self._context, self._sg, cache=self.coalescer
+        )
+        asset.load([["id", "is", 100]])
+        self.assertIsNone(asset.id)
+
+    def test_errors_are_shared(self):
+        def find(*args, **kwargs):
+            raise RuntimeError("Shotgun error")
+
+        self._sg.find = find
+        with self.assertRaises(RuntimeError):
+            self.coalescer.read(self._sg, "find", "Asset", [], ["code"])
+        self.assertEqual(self.coalescer._in_flight, {})
+
+    def test_inner_cache(self):
+        self._sg.latency = 0
+        coalescer = type(self.coalescer)(self.QueryCache())
+        for _ in range(2):
+            assets = self.shotgun_model.EntityIter(
+                "Asset", ["code"], self._context, self._sg, cache=coalescer
+            )
+            assets.load([])
+        self.assertEqual(self._sg.count("find"), 1)
+        self.assertEqual(coalescer.stats["cache"]["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class SchemaCacheTests(OfflineBaseClass):
+    def setUp(self):
+        super(SchemaCacheTests, self).setUp()
+        from python.shotgun_model import SchemaCache, SchemaError
+
+        self.SchemaCache = SchemaCache
+        self.SchemaError = SchemaError
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "schema.json")
+        self.schema = SchemaCache(self.path)
+
+        self._sg.add_field("Asset", "id", "number", editable=False)
+        self._sg.add_field("Asset", "code", "text")
+        self._sg.add_field("Asset", "project", "entity", valid_types=["Project"])
+        self._sg.add_field("Asset", "sg_frames", "number")
+        self._sg.add_field("Asset", "sg_start", "date")
+        self._sg.add_field(
+            "Asset", "sg_asset_type", "list", valid_values=["Character", "Prop"]
+        )
+        self._sg.add_field(
+            "Asset", "sg_namespace", "entity", valid_types=["CustomEntity03"]
+        )
+        self._sg.add_field("Asset", "created_at", "date_time", editable=False)
+        self._sg.add("Asset", {"code": "Hero", "project": self._context.project})
+
+    def tearDown(self):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def new_assets(self, fields=None):
+        return self.shotgun_model.EntityIter(
+            "Asset",
+            fields or ["code", "sg_frames", "sg_asset_type"],
+            self._context,
+            self._sg,
+            schema=self.schema,
+        )
+
+    def test_unknown_field(self):
+        with self.assertRaises(self.SchemaError):
+            self.new_assets(["code", "sg_typo"])
+        with self.assertRaises(self.SchemaError):
+            self.shotgun_model.Entity(
+                "Asset", ["sg_typo"], self._context, self._sg, schema=self.schema
+            )
+        # only the first part of the deep-link fields is checked
+        self.new_assets(["code", "sg_namespace.CustomEntity03.code"])
+
+    def test_schema_read_once_and_persisted(self):
+        self.new_assets()
+        self.new_assets()
+        self.assertEqual(self._sg.count("schema_field_read"), 1)
+
+        schema = self.SchemaCache(self.path)
+        schema.validate_fields(self._sg, "Asset", ["code"])
+        self.assertEqual(self._sg.count("schema_field_read"), 1)
+
+    def test_ttl(self):
+        schema = self.SchemaCache(ttl=0)
+        schema.fields(self._sg, "Asset")
+        schema.fields(self._sg, "Asset")
+        self.assertEqual(self._sg.count("schema_field_read"), 2)
+
+    def test_load_all(self):
+        schema = self.SchemaCache()
+        schema.load_all(self._sg)
+        self.assertIn("code", schema.fields(self._sg, "Asset"))
+        self.assertEqual(self._sg.count("schema_field_read"), 0)
+
+    def test_coerce(self):
+        data = self.schema.validate_data(
+            self._sg,
+            "Asset",
+            {
+                "sg_frames": "24",
+                "sg_start": datetime.date(2020, 1, 2),
+                "sg_asset_type": "Prop",
+                "code": None,
+            },
+        )
+        self.assertEqual(
+            data,
+            {
+                "sg_frames": 24,
+                "sg_start": "2020-01-02",
+                "sg_asset_type": "Prop",
+                "code": None,
+            },
+        )
+
+    def test_invalid_data(self):
+        invalid = [
+            {"sg_frames": "many"},
+            {"sg_asset_type": "Vehicle"},
+            {"sg_namespace": {"type": "Asset", "id": 1}},
+            {"created_at": datetime.datetime.now()},
+            {"code": 12},
+            {"sg_typo": 1},
+        ]
+        for data in invalid:
+            with self.assertRaises(self.SchemaError):
+                self.schema.validate_data(self._sg, "Asset", data)
+
+    def test_update_rejected_before_batch(self):
+        assets = self.new_assets()
+        assets.load([])
+        asset = list(assets)[0]
+        asset.sg_frames = "24"
+        asset.sg_asset_type = "Vehicle"
+        errors = assets.update()
+
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0][1], self.SchemaError)
+        self.assertEqual(self._sg.count("batch"), 0)
+
+    def test_values_coerced_before_update(self):
+        asset = self.shotgun_model.Entity(
+            "Asset", ["code", "sg_frames"], self._context, self._sg, schema=self.schema
+        )
+        asset.load([["code", "is", "Hero"]])
+        asset.sg_frames = 24.0
+        asset.update()
+        self.assertEqual(self._sg.calls[-1][3], {"sg_frames": 24})
+
+    def test_create(self):
+        assets = self.new_assets()
+        good = assets.add_new_entity()
+        good.code = "Tree"
+        bad = assets.add_new_entity()
+        bad.code = "Car"
+        bad.sg_asset_type = "Vehicle"
+        errors = assets.create()
+
+        self.assertEqual([e[0] for e in errors], [bad])
+        self.assertTrue(good.id)
+        self.assertIsNone(bad.id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import threading
+import time
+import unittest
+from tests.base_test_class import OfflineBaseClass
+
+
+class ProtocolError(Exception):
+    # like the xmlrpc ProtocolError raised by shotgun_api3
+    def __init__(self, errcode, errmsg=""):
+        super(ProtocolError, self).__init__(errcode, errmsg)
+        self.errcode = errcode
+        self.errmsg = errmsg
+
+
+class ShotgunTransportTests(OfflineBaseClass):
+    def setUp(self):
+        super(ShotgunTransportTests, self).setUp()
+        from python.shotgun_model import ShotgunTransport, Throttle
+
+        self.Throttle = Throttle
+        self.transport = ShotgunTransport(
+            self._sg, max_retries=3, backoff=0.1, throttle=Throttle()
+        )
+        self.delays = []
+        self.transport._sleep = self.delays.append
+        self._sg.add("Asset", {"code": "Hero", "project": self._context.project})
+
+    def new_assets(self):
+        return self.shotgun_model.EntityIter(
+            "Asset", ["code"], self._context, self.transport
+        )
+
+    def test_retry_transient_errors(self):
+        self._sg.inject_fault("find", ProtocolError(503, "Service Unavailable"), 2)
+        assets = self.new_assets()
+        assets.load([])
+
+        self.assertEqual([a.code for a in assets], ["Hero"])
+        self.assertEqual(self._sg.count("find"), 3)
+        self.assertEqual(self.transport.stats["retries"], 2)
+        # exponential backoff with full jitter
+        self.assertLessEqual(self.delays[0], 0.1)
+        self.assertLessEqual(self.delays[1], 0.2)
+
+    def test_give_up_after_max_retries(self):
+        self._sg.inject_fault("find", ProtocolError(503), 10)
+        with self.assertRaises(ProtocolError):
+            self.new_assets().load([])
+        self.assertEqual(self._sg.count("find"), 4)
+        self.assertEqual(self.transport.stats["failures"], 1)
+
+    def test_no_retry_of_other_status_codes(self):
+        self._sg.inject_fault("find", ProtocolError(403, "Forbidden"))
+        with self.assertRaises(ProtocolError):
+            self.new_assets().load([])
+        self.assertEqual(self._sg.count("find"), 1)
+        self.assertEqual(self.transport.stats["retries"], 0)
+
+    def test_no_retry_of_other_errors(self):
+        self._sg.inject_fault("find", ValueError("bad filter"))
+        with self.assertRaises(ValueError):
+            self.new_assets().load([])
+        self.assertEqual(self._sg.count("find"), 1)
+
+    def test_no_retry_of_create(self):
+        self._sg.inject_fault("create", ProtocolError(503))
+        with self.assertRaises(ProtocolError):
+            self.transport.create("Asset", {"code": "Tree"})
+        self.assertEqual(self.transport.stats["retries"], 0)
+
+    def test_rate_limit(self):
+        transport = type(self.transport)(
+            self._sg, throttle=self.Throttle(rate=50, burst=1)
+        )
+        start = time.time()
+        for _ in range(5):
+            transport.find("Asset", [], ["code"])
+        self.assertGreaterEqual(time.time() - start, 0.07)
+        self.assertEqual(transport.stats["throttle"]["throttled"], 4)
+
+    def test_concurrency_cap(self):
+        self._sg.latency = 0.05
+        transport = type(self.transport)(
+            self._sg, throttle=self.Throttle(max_concurrency=2)
+        )
+        threads = [
+            threading.Thread(target=transport.find, args=("Asset", [], ["code"]))
+            for _ in range(4)
+        ]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.time() - start, 0.1)
+        self.assertEqual(transport.stats["throttle"]["concurrency_waits"], 2)
+
+    def test_default_throttle(self):
+        from python.shotgun_model import get_default_throttle, set_default_throttle
+
+        previous = get_default_throttle()
+        throttle = self.Throttle(rate=1000)
+        set_default_throttle(throttle)
+        try:
+            transport = type(self.transport)(self._sg)
+            self.assertIs(transport.throttle, throttle)
+        finally:
+            set_default_throttle(previous)
+
+
+if __name__ == "__main__":
+    unittest.main()